@@ -1,92 +1,284 @@
 import os
 import sys
 import logging
-from logging.config import fileConfig
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from logging.config import dictConfig
 from pathlib import Path
 
 from alembic import context
-from sqlalchemy import create_engine, pool, text
+from sqlalchemy import String, bindparam, create_engine, pool, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
-from app.config import settings  # noqa: E402
-from app.db import Base  # noqa: E402
-from app import models  # noqa: E402,F401
-
 config = context.config
 
-# Get database URL and handle Render's postgres:// prefix
-database_url = str(settings.DATABASE_URL)
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
 
-config.set_main_option("sqlalchemy.url", database_url)
+@lru_cache(maxsize=1)
+def _get_db_url() -> str:
+    """
+    Resolve the database URL once per process.
+
+    DATABASE_URL from the environment is used directly so parallel migration
+    children skip building the full app Settings; the app config (which also
+    reads .env) is only loaded as a fallback. Render's postgres:// prefix is
+    normalized for SQLAlchemy.
+    """
+    raw = os.getenv("DATABASE_URL")
+    if not raw:
+        from app.config import settings
+
+        raw = str(settings.DATABASE_URL)
+    if raw.startswith("postgres://"):
+        return raw.replace("postgres://", "postgresql://", 1)
+    return raw
+
+
+config.set_main_option("sqlalchemy.url", _get_db_url())
+
+# Same levels and format as the [loggers]/[handlers] sections of alembic.ini
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "generic": {"format": "%(levelname)-5.5s [%(name)s] %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "stream": "ext://sys.stderr", "formatter": "generic"},
+    },
+    "root": {"level": "WARN", "handlers": ["console"]},
+    "loggers": {
+        "sqlalchemy.engine": {"level": "WARN"},
+        "alembic": {"level": "INFO"},
+    },
+}
+
+
+@lru_cache(maxsize=1)
+def setup_logging() -> None:
+    """Configure logging once per process instead of re-reading alembic.ini.
+
+    Skipped when ALEMBIC_QUIET=1 (e.g. CI) or when the caller already set up
+    logging and passed config.attributes["configure_logger"] = False.
+    """
+    if os.getenv("ALEMBIC_QUIET") == "1" or not config.attributes.get("configure_logger", True):
+        return
+    dictConfig(LOGGING_CONFIG)
 
-if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
 
-target_metadata = Base.metadata
 logger = logging.getLogger("alembic.env")
 
 
+# Built once so repeated runs reuse the same compiled statements
+SELECT_VERSIONS_STMT = text("SELECT version_num FROM alembic_version")
+DELETE_STALE_VERSIONS_STMT = text(
+    "DELETE FROM alembic_version WHERE version_num != :latest"
+).bindparams(bindparam("latest", type_=String()))
+
+
+def version_sort_key(version_num: str) -> tuple[int, str]:
+    """Natural sort key for revision ids: numeric prefix first, then the full id."""
+    prefix = version_num.split("_", 1)[0]
+    return (int(prefix) if prefix.isdigit() else -1, version_num)
+
+
+def pick_latest_version(versions: list[str]) -> str:
+    """Return the newest of versions, following the revision graph.
+
+    Revision ids aren't ordered as strings (0017 is '789cabcc7b4b'), so rank
+    them by their position in the script directory; ids it doesn't know fall
+    back to a natural sort.
+    """
+    from alembic.script import ScriptDirectory
+
+    # walk_revisions() goes from the head(s) down to the base
+    position = {
+        script.revision: index
+        for index, script in enumerate(ScriptDirectory.from_config(config).walk_revisions())
+    }
+    known = [version for version in versions if version in position]
+    if known:
+        return min(known, key=position.__getitem__)
+    return max(versions, key=version_sort_key)
+
+
 def cleanup_multiple_heads(connection):
-    """Fix corrupted alembic_version table with multiple entries."""
+    """Fix corrupted alembic_version table with multiple entries.
+
+    Expects an AUTOCOMMIT connection so the check never leaves an
+    idle-in-transaction backend behind (PgBouncer transaction pooling).
+    """
     try:
-        result = connection.execute(text("SELECT COUNT(*) FROM alembic_version"))
-        count = result.scalar()
-        
-        if count > 1:
-            logger.warning(f"Found {count} entries in alembic_version. Cleaning up...")
-            result = connection.execute(text("SELECT version_num FROM alembic_version"))
-            versions = [row[0] for row in result.fetchall()]
-            logger.warning(f"Versions found: {versions}")
-            
-            # Keep only the latest one (highest numbered)
-            sorted_versions = sorted(versions, key=lambda x: x.split('_')[0] if '_' in x else x, reverse=True)
-            latest = sorted_versions[0]
-            
-            connection.execute(text("DELETE FROM alembic_version WHERE version_num != :latest"), {"latest": latest})
-            connection.commit()
-            logger.info(f"Cleaned up. Kept version: {latest}")
-    except Exception as e:
+        versions = connection.execute(SELECT_VERSIONS_STMT).scalars().all()
+        if len(versions) > 1:
+            latest = pick_latest_version(versions)
+            result = connection.execute(DELETE_STALE_VERSIONS_STMT, {"latest": latest})
+            logger.warning(f"Removed {result.rowcount} stale entries from alembic_version, keeping {latest}")
+    except (ProgrammingError, OperationalError) as e:
         # Table might not exist yet, which is fine
         logger.debug(f"Cleanup check skipped: {e}")
-        connection.rollback()
+
+
+def load_target_metadata():
+    """Import the models only when a live database needs them (e.g. autogenerate)."""
+    from app.db import Base
+    from app import models
+
+    models.load_all()
+    return Base.metadata
 
 
 def run_migrations_offline() -> None:
+    setup_logging()
+
+    # --sql output only replays the revision scripts, so skip loading the models
     context.configure(
-        url=database_url, 
-        target_metadata=target_metadata, 
+        url=_get_db_url(), 
+        target_metadata=None, 
         literal_binds=True, 
         compare_type=True,
-        render_as_batch=True
+        # Batch mode only exists to emulate ALTER on SQLite
+        render_as_batch=make_url(_get_db_url()).get_backend_name() == "sqlite",
+        transaction_per_migration=False,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    connectable = create_engine(database_url, poolclass=pool.NullPool)
-
-    with connectable.connect() as connection:
-        # Clean up any duplicate head entries before running migrations
-        cleanup_multiple_heads(connection)
-        
-        context.configure(
-            connection=connection, 
-            target_metadata=target_metadata, 
-            compare_type=True,
-            render_as_batch=True
+# Stored generated columns (GENERATED ALWAYS AS (...) STORED, used by 0009, 0012
+# and 0041) need Postgres 12. Checked up front: the chain would otherwise fail
+# at 0009, after earlier autocommit blocks had already been committed.
+MIN_POSTGRES_VERSION_NUM = 120000
+
+
+def check_server_version(connection) -> None:
+    """Refuse to migrate Postgres servers older than the migrations need."""
+    if connection.dialect.name != "postgresql":
+        return
+
+    version_num = connection.execute(text("SELECT current_setting('server_version_num')::int")).scalar()
+    if version_num < MIN_POSTGRES_VERSION_NUM:
+        raise RuntimeError(
+            f"PostgreSQL 12+ is required to run migrations (server_version_num={version_num})"
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
 
+# Session-level advisory lock so only one runner (pod, build, app thread) migrates at a time
+MIGRATION_LOCK_KEY = "omnitrackiq_alembic"
+
+
+def try_migration_lock(connection) -> bool:
+    """Try to take the migration advisory lock; always succeeds on non-Postgres databases."""
+    if connection.dialect.name != "postgresql":
+        return True
+    return connection.execute(
+        text("SELECT pg_try_advisory_lock(hashtext(:key))"), {"key": MIGRATION_LOCK_KEY}
+    ).scalar()
+
+
+def release_migration_lock(connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": MIGRATION_LOCK_KEY})
+
+
+def create_migration_engine():
+    """
+    Build the engine used for online migrations.
+
+    Defaults to a small QueuePool so the cleanup check and the migration run
+    share one handshake. Set ALEMBIC_POOL=nullpool to opt out (e.g. in CI).
+    """
+    if os.getenv("ALEMBIC_POOL", "queuepool").lower() == "nullpool":
+        return create_engine(_get_db_url(), poolclass=pool.NullPool)
+
+    return create_engine(
+        _get_db_url(),
+        poolclass=pool.QueuePool,
+        pool_size=2,
+        max_overflow=2,
+        pool_pre_ping=False,
+        pool_recycle=60,
+        pool_timeout=30,
+    )
+
+
+def run_migrations_online() -> None:
+    setup_logging()
+    connectable = create_migration_engine()
+
+    try:
+        # The AUTOCOMMIT preflight connection holds the advisory lock for the whole run
+        with connectable.connect() as preflight_connection:
+            preflight_connection = preflight_connection.execution_options(isolation_level="AUTOCOMMIT")
+            if not try_migration_lock(preflight_connection):
+                logger.warning("Another runner holds the migration lock, skipping migrations")
+                # Lets an in-process caller (app.jobs.migrations) tell this apart from an upgrade
+                config.attributes["migrations_skipped"] = True
+                return
+
+            try:
+                # Check the server and clean up any duplicate head entries before running migrations
+                check_server_version(preflight_connection)
+                cleanup_multiple_heads(preflight_connection)
+
+                with connectable.connect() as connection:
+                    # Run the whole upgrade chain in a single transaction on one connection
+                    context.configure(
+                        connection=connection, 
+                        target_metadata=load_target_metadata(), 
+                        compare_type=True,
+                        render_as_batch=connection.dialect.name == "sqlite",
+                        transaction_per_migration=False,
+                        transactional_ddl=True,
+                    )
+
+                    with context.begin_transaction():
+                        context.run_migrations()
+            finally:
+                release_migration_lock(preflight_connection)
+    finally:
+        connectable.dispose()
+
+
+def run_migrations_parallel(database_urls: list[str]) -> None:
+    """Run this alembic command against several databases at once, one child process each.
+
+    Each child is a plain ``alembic`` invocation with DATABASE_URL pointing at a
+    single database, so it gets its own engine and migration context. The parent
+    never opens a connection of its own while the children run.
+    """
+    setup_logging()
+    argv = [sys.executable, "-m", "alembic", *sys.argv[1:]]
+
+    def migrate(url: str) -> int:
+        env = {**os.environ, "DATABASE_URL": url}
+        env.pop("ALEMBIC_DATABASE_URLS", None)
+        return subprocess.run(argv, env=env).returncode
+
+    max_workers = min(len(database_urls), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return_codes = list(executor.map(migrate, database_urls))
+
+    failed = [
+        make_url(url).render_as_string(hide_password=True)
+        for url, return_code in zip(database_urls, return_codes)
+        if return_code != 0
+    ]
+    if failed:
+        raise RuntimeError(f"Migrations failed for: {', '.join(failed)}")
+
+
+# Comma-separated list of databases to migrate in parallel (CLI runs only)
+database_urls = [url.strip() for url in os.getenv("ALEMBIC_DATABASE_URLS", "").split(",") if url.strip()]
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif database_urls and config.cmd_opts is not None:
+    run_migrations_parallel(database_urls)
 else:
     run_migrations_online()
@@ -6,6 +6,7 @@ Create Date: 2025-01-01 00:00:00
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 revision = "0001_initial"
@@ -17,20 +18,20 @@ depends_on = None
 def upgrade() -> None:
     op.create_table(
         "accounts",
-        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
         sa.Column("name", sa.String(), nullable=False),
         sa.Column("type", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.PrimaryKeyConstraint("id"),
     )
 
     op.create_table(
         "users",
-        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
         sa.Column("email", sa.String(), nullable=False),
         sa.Column("password_hash", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("account_id", sa.String(36), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
@@ -38,30 +39,32 @@ def upgrade() -> None:
 
     op.create_table(
         "integrations",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("platform", sa.String(), nullable=False),
         sa.Column("status", sa.String(), nullable=False, server_default="connected"),
         sa.Column("access_token", sa.Text(), nullable=True),
         sa.Column("refresh_token", sa.Text(), nullable=True),
         sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("config_json", sa.Text(), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("config_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.Column(
             "updated_at",
             sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
             onupdate=sa.func.now(),
             nullable=True,
         ),
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
+    # Tokens are rewritten on every refresh; leave room on each page for HOT updates
+    op.execute("ALTER TABLE integrations SET (fillfactor=80)")
 
     op.create_table(
         "ad_spend",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("platform", sa.String(), nullable=False),
         sa.Column("external_account_id", sa.String(), nullable=True),
         sa.Column("external_campaign_id", sa.String(), nullable=True),
@@ -74,15 +77,22 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("idx_ad_spend_date", "ad_spend", ["date"])
+    # Rows arrive roughly in date order, so a BRIN summary is enough for range scans
+    op.create_index(
+        "idx_ad_spend_date",
+        "ad_spend",
+        ["date"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
     op.create_index("idx_ad_spend_account", "ad_spend", ["account_id"])
     op.create_index("idx_ad_spend_platform", "ad_spend", ["platform"])
     op.create_index("idx_ad_spend_campaign", "ad_spend", ["external_campaign_id"])
 
     op.create_table(
         "orders",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("source_platform", sa.String(), nullable=False),
         sa.Column("external_order_id", sa.String(), nullable=False),
         sa.Column("date_time", sa.DateTime(timezone=True), nullable=False),
@@ -90,17 +100,23 @@ def upgrade() -> None:
         sa.Column("currency", sa.String(), nullable=False),
         sa.Column("utm_source", sa.String(), nullable=True),
         sa.Column("utm_campaign", sa.String(), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("idx_orders_date_time", "orders", ["date_time"])
+    op.create_index(
+        "idx_orders_date_time",
+        "orders",
+        ["date_time"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
     op.create_index("idx_orders_account", "orders", ["account_id"])
 
     op.create_table(
         "daily_metrics",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("date", sa.Date(), nullable=False),
         sa.Column("total_revenue", sa.Numeric(18, 4), nullable=False, server_default="0"),
         sa.Column("total_ad_spend", sa.Numeric(18, 4), nullable=False, server_default="0"),
@@ -113,17 +129,19 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint("id"),
     )
     op.create_unique_constraint("idx_daily_metrics_unique", "daily_metrics", ["account_id", "date"])
+    # Totals are updated in place on every ingestion cycle
+    op.execute("ALTER TABLE daily_metrics SET (fillfactor=90)")
 
     op.create_table(
         "subscriptions",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("stripe_customer_id", sa.String(), nullable=False),
         sa.Column("stripe_subscription_id", sa.String(), nullable=False),
         sa.Column("plan", sa.String(), nullable=False),
         sa.Column("status", sa.String(), nullable=False),
         sa.Column("current_period_end", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
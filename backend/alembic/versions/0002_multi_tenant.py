@@ -15,62 +15,59 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add new columns to accounts table
-    op.add_column(
-        "accounts",
-        sa.Column("plan", sa.String(), nullable=False, server_default="free")
-    )
-    op.add_column(
-        "accounts",
-        sa.Column("max_users", sa.Integer(), nullable=False, server_default="1")
-    )
-    op.add_column(
-        "accounts",
-        sa.Column("stripe_customer_id", sa.String(), nullable=True)
-    )
-    op.add_column(
-        "accounts",
-        sa.Column("stripe_subscription_id", sa.String(), nullable=True)
-    )
-    op.add_column(
-        "accounts",
-        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)
-    )
-    op.create_index("ix_accounts_stripe_customer_id", "accounts", ["stripe_customer_id"])
+    # Add new columns to accounts table (one ALTER = one lock acquisition)
+    op.execute("""
+        ALTER TABLE accounts
+            ADD COLUMN plan VARCHAR NOT NULL DEFAULT 'free',
+            ADD COLUMN max_users INTEGER NOT NULL DEFAULT 1,
+            ADD COLUMN stripe_customer_id VARCHAR,
+            ADD COLUMN stripe_subscription_id VARCHAR,
+            ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_accounts_stripe_customer_id",
+            "accounts",
+            ["stripe_customer_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
 
     # Add new columns to users table
-    op.add_column(
-        "users",
-        sa.Column("role", sa.String(), nullable=False, server_default="owner")
-    )
-    op.add_column(
-        "users",
-        sa.Column("name", sa.String(), nullable=True)
-    )
-    op.add_column(
-        "users",
-        sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True)
-    )
+    op.execute("""
+        ALTER TABLE users
+            ADD COLUMN role VARCHAR NOT NULL DEFAULT 'owner',
+            ADD COLUMN name VARCHAR,
+            ADD COLUMN last_login_at TIMESTAMP WITH TIME ZONE
+    """)
 
     # Create team_invites table
     op.create_table(
         "team_invites",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
         sa.Column("email", sa.String(), nullable=False),
         sa.Column("role", sa.String(), nullable=False),
         sa.Column("token", sa.String(), nullable=False),
         sa.Column("status", sa.String(), nullable=False, server_default="pending"),
-        sa.Column("invited_by_id", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("invited_by_id", sa.String(36), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
         sa.Column("accepted_at", sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
         sa.ForeignKeyConstraint(["invited_by_id"], ["users.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("ix_team_invites_email", "team_invites", ["email"])
-    op.create_index("ix_team_invites_token", "team_invites", ["token"], unique=True)
+    # Build indexes without blocking writes (CONCURRENTLY can't run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_team_invites_email", "team_invites", ["email"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_team_invites_token", "team_invites", ["token"], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -22,26 +23,35 @@ def upgrade() -> None:
     # Create saved_views table
     op.create_table(
         'saved_views',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('account_id', sa.String(), nullable=False),
-        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('account_id', sa.String(36), nullable=False),
+        sa.Column('user_id', sa.String(36), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
-        sa.Column('view_type', sa.Enum('EXECUTIVE', 'ACQUISITION', 'CAMPAIGNS', 'CUSTOM', name='viewtype'), nullable=False),
+        sa.Column('view_type', sa.String(32), nullable=False),
         sa.Column('description', sa.String(), nullable=True),
-        sa.Column('config_json', sa.Text(), nullable=False, server_default='{}'),
+        sa.Column('config_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default='{}'),
         sa.Column('is_shared', sa.String(), nullable=False, server_default='private'),
         sa.Column('is_default', sa.String(), nullable=False, server_default='false'),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "view_type IN ('EXECUTIVE', 'ACQUISITION', 'CAMPAIGNS', 'CUSTOM')",
+            name='ck_saved_views_view_type',
+        ),
     )
     
-    # Create indexes for faster lookups
-    op.create_index('ix_saved_views_account_id', 'saved_views', ['account_id'])
-    op.create_index('ix_saved_views_user_id', 'saved_views', ['user_id'])
-    op.create_index('ix_saved_views_view_type', 'saved_views', ['view_type'])
+    # Create indexes for faster lookups without blocking writes
+    # (CONCURRENTLY can't run inside a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_saved_views_account_id', 'saved_views', ['account_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_saved_views_user_id', 'saved_views', ['user_id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_saved_views_view_type', 'saved_views', ['view_type'],
+                        postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
@@ -49,6 +59,3 @@ def downgrade() -> None:
     op.drop_index('ix_saved_views_user_id', 'saved_views')
     op.drop_index('ix_saved_views_account_id', 'saved_views')
     op.drop_table('saved_views')
-    
-    # Drop enum type
-    op.execute('DROP TYPE IF EXISTS viewtype')
@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -21,16 +22,16 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     op.create_table(
         'scheduled_reports',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('account_id', sa.String(), nullable=False),
-        sa.Column('created_by', sa.String(), nullable=False),
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('account_id', sa.String(36), nullable=False),
+        sa.Column('created_by', sa.String(36), nullable=False),
         sa.Column('name', sa.String(length=255), nullable=False),
-        sa.Column('report_type', sa.Enum('OVERVIEW', 'CAMPAIGNS', 'REVENUE', 'ORDERS', 'CUSTOM', name='reporttype'), nullable=False),
-        sa.Column('frequency', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', name='reportfrequency'), nullable=False),
-        sa.Column('recipients', sa.JSON(), nullable=False),
+        sa.Column('report_type', sa.String(32), nullable=False),
+        sa.Column('frequency', sa.String(32), nullable=False),
+        sa.Column('recipients', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('date_range_days', sa.String(length=10), nullable=True),
-        sa.Column('platforms', sa.JSON(), nullable=True),
-        sa.Column('metrics', sa.JSON(), nullable=True),
+        sa.Column('platforms', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('metrics', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('is_active', sa.Boolean(), nullable=True, default=True),
         sa.Column('send_time', sa.String(length=5), nullable=True),
         sa.Column('timezone', sa.String(length=50), nullable=True),
@@ -39,17 +40,26 @@ def upgrade() -> None:
         sa.Column('last_sent_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('next_send_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('send_count', sa.String(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
         sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
         sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "report_type IN ('OVERVIEW', 'CAMPAIGNS', 'REVENUE', 'ORDERS', 'CUSTOM')",
+            name='ck_scheduled_reports_report_type',
+        ),
+        sa.CheckConstraint(
+            "frequency IN ('DAILY', 'WEEKLY', 'MONTHLY')",
+            name='ck_scheduled_reports_frequency',
+        ),
     )
-    op.create_index(op.f('ix_scheduled_reports_account_id'), 'scheduled_reports', ['account_id'], unique=False)
+    # Build the index without blocking writes (CONCURRENTLY can't run in a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_scheduled_reports_account_id'), 'scheduled_reports', ['account_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
     op.drop_index(op.f('ix_scheduled_reports_account_id'), table_name='scheduled_reports')
     op.drop_table('scheduled_reports')
-    op.execute("DROP TYPE IF EXISTS reporttype")
-    op.execute("DROP TYPE IF EXISTS reportfrequency")
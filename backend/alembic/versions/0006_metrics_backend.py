@@ -18,9 +18,9 @@ def upgrade() -> None:
     # Create ad_accounts table
     op.create_table(
         "ad_accounts",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("account_id", sa.String(), nullable=False),
-        sa.Column("integration_id", sa.String(), nullable=True),
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.String(36), nullable=False),
+        sa.Column("integration_id", sa.String(36), nullable=True),
         sa.Column("platform", sa.String(), nullable=False),
         sa.Column("external_id", sa.String(), nullable=False),
         sa.Column("external_name", sa.String(), nullable=True),
@@ -31,11 +31,11 @@ def upgrade() -> None:
         sa.Column("meta_data", sa.Text(), nullable=True),
         sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
         sa.Column("is_deleted", sa.Boolean(), nullable=False, server_default="false"),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.Column(
             "updated_at",
             sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
             onupdate=sa.func.now(),
             nullable=True,
         ),
@@ -43,19 +43,29 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["integration_id"], ["integrations.id"]),
         sa.PrimaryKeyConstraint("id"),
     )
+    # Sync status columns are updated in place; leave room for HOT updates
+    op.execute("ALTER TABLE ad_accounts SET (fillfactor=90)")
     
-    # Create indexes for ad_accounts
-    op.create_index("ix_ad_accounts_account_id", "ad_accounts", ["account_id"])
-    op.create_index("ix_ad_accounts_account_id_platform", "ad_accounts", ["account_id", "platform"])
-    op.create_index("ix_ad_accounts_account_id_external_id", "ad_accounts", ["account_id", "external_id"])
-    op.create_index("ix_ad_accounts_account_id_status", "ad_accounts", ["account_id", "status"])
+    # Create indexes for ad_accounts without blocking writes
+    # (CONCURRENTLY can't run inside a transaction)
+    with op.get_context().autocommit_block():
+        for name, columns in (
+            ("ix_ad_accounts_account_id", ["account_id"]),
+            ("ix_ad_accounts_account_id_platform", ["account_id", "platform"]),
+            ("ix_ad_accounts_account_id_external_id", ["account_id", "external_id"]),
+            ("ix_ad_accounts_account_id_status", ["account_id", "status"]),
+        ):
+            op.create_index(name, "ad_accounts", columns, postgresql_concurrently=True, if_not_exists=True)
     
-    # Add new columns to daily_metrics table
-    op.add_column("daily_metrics", sa.Column("channel", sa.String(), nullable=True))
-    op.add_column("daily_metrics", sa.Column("ad_account_id", sa.String(), nullable=True))
-    op.add_column("daily_metrics", sa.Column("campaign_id", sa.String(), nullable=True))
-    op.add_column("daily_metrics", sa.Column("campaign_name", sa.String(), nullable=True))
-    op.add_column("daily_metrics", sa.Column("total_conversions", sa.Integer(), nullable=False, server_default="0"))
+    # Add new columns to daily_metrics table in a single ALTER
+    op.execute("""
+        ALTER TABLE daily_metrics
+            ADD COLUMN channel VARCHAR,
+            ADD COLUMN ad_account_id VARCHAR(36),
+            ADD COLUMN campaign_id VARCHAR,
+            ADD COLUMN campaign_name VARCHAR,
+            ADD COLUMN total_conversions INTEGER NOT NULL DEFAULT 0
+    """)
     
     # Add foreign key for ad_account_id
     op.create_foreign_key(
@@ -66,13 +76,15 @@ def upgrade() -> None:
         ["id"],
     )
     
-    # Create indexes for daily_metrics
-    op.create_index("ix_daily_metrics_account_id", "daily_metrics", ["account_id"])
-    op.create_index("ix_daily_metrics_date", "daily_metrics", ["date"])
-    op.create_index("ix_daily_metrics_account_date", "daily_metrics", ["account_id", "date"])
-    op.create_index("ix_daily_metrics_account_date_channel", "daily_metrics", ["account_id", "date", "channel"])
-    op.create_index("ix_daily_metrics_account_channel_campaign", "daily_metrics", ["account_id", "channel", "campaign_id"])
-    op.create_index("ix_daily_metrics_account_ad_account", "daily_metrics", ["account_id", "ad_account_id"])
+    # Create indexes for daily_metrics without blocking writes
+    with op.get_context().autocommit_block():
+        for name, columns in (
+            ("ix_daily_metrics_account_date", ["account_id", "date"]),
+            ("ix_daily_metrics_account_date_channel", ["account_id", "date", "channel"]),
+            ("ix_daily_metrics_account_channel_campaign", ["account_id", "channel", "campaign_id"]),
+            ("ix_daily_metrics_account_ad_account", ["account_id", "ad_account_id"]),
+        ):
+            op.create_index(name, "daily_metrics", columns, postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
@@ -81,8 +93,6 @@ def downgrade() -> None:
     op.drop_index("ix_daily_metrics_account_channel_campaign", table_name="daily_metrics")
     op.drop_index("ix_daily_metrics_account_date_channel", table_name="daily_metrics")
     op.drop_index("ix_daily_metrics_account_date", table_name="daily_metrics")
-    op.drop_index("ix_daily_metrics_date", table_name="daily_metrics")
-    op.drop_index("ix_daily_metrics_account_id", table_name="daily_metrics")
     
     # Drop foreign key
     op.drop_constraint("fk_daily_metrics_ad_account_id", "daily_metrics", type_="foreignkey")
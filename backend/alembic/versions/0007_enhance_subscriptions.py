@@ -15,43 +15,42 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add new columns to subscriptions table
-    op.add_column(
-        "subscriptions",
-        sa.Column("stripe_price_id", sa.String(), nullable=True),
-    )
-    op.add_column(
-        "subscriptions",
-        sa.Column("current_period_start", sa.DateTime(timezone=True), nullable=True),
-    )
-    op.add_column(
-        "subscriptions",
-        sa.Column("trial_end", sa.DateTime(timezone=True), nullable=True),
-    )
-    op.add_column(
-        "subscriptions",
-        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
-    )
+    # Add new columns to subscriptions table in a single ALTER
+    op.execute("""
+        ALTER TABLE subscriptions
+            ADD COLUMN stripe_price_id VARCHAR,
+            ADD COLUMN current_period_start TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN trial_end TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE
+    """)
 
-    # Create indexes for faster lookups
-    op.create_index(
-        "ix_subscriptions_account_id",
-        "subscriptions",
-        ["account_id"],
-        unique=False,
-    )
-    op.create_index(
-        "ix_subscriptions_stripe_subscription_id",
-        "subscriptions",
-        ["stripe_subscription_id"],
-        unique=False,
-    )
-    op.create_index(
-        "ix_subscriptions_stripe_customer_id",
-        "subscriptions",
-        ["stripe_customer_id"],
-        unique=False,
-    )
+    # Create indexes for faster lookups without blocking writes
+    # (CONCURRENTLY can't run inside a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_subscriptions_account_id",
+            "subscriptions",
+            ["account_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_subscriptions_stripe_subscription_id",
+            "subscriptions",
+            ["stripe_subscription_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_subscriptions_stripe_customer_id",
+            "subscriptions",
+            ["stripe_customer_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
@@ -7,6 +7,7 @@ Create Date: 2024-12-08 12:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = '0008_notification_preferences'
@@ -14,8 +15,49 @@ down_revision = '0007_enhance_subscriptions'
 branch_labels = None
 depends_on = None
 
+# Low-cardinality columns are stored as native enums (4 bytes per value)
+ENUM_TYPES = {
+    'anomalysensitivity': ('low', 'medium', 'high'),
+    'alerttype': (
+        'anomaly_spike', 'anomaly_drop', 'spend_threshold', 'roas_threshold',
+        'budget_alert', 'weekly_report', 'monthly_report',
+    ),
+    'notificationchannel': ('email', 'in_app'),
+}
+
+# Keeps notification_unread_counts in step with notification_logs so the
+# unread badge is a primary-key lookup instead of a COUNT(*)
+UNREAD_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_notification_unread_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.read_at IS NULL THEN
+            INSERT INTO notification_unread_counts (user_id, unread) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET unread = notification_unread_counts.unread + 1;
+        END IF;
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF OLD.read_at IS NULL AND NEW.read_at IS NOT NULL THEN
+            UPDATE notification_unread_counts SET unread = unread - 1 WHERE user_id = NEW.user_id;
+        ELSIF OLD.read_at IS NOT NULL AND NEW.read_at IS NULL THEN
+            INSERT INTO notification_unread_counts (user_id, unread) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET unread = notification_unread_counts.unread + 1;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF OLD.read_at IS NULL THEN
+            UPDATE notification_unread_counts SET unread = unread - 1 WHERE user_id = OLD.user_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
 
 def upgrade() -> None:
+    for name, values in ENUM_TYPES.items():
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {name} AS ENUM ({labels})")
+
     # Create notification_preferences table
     op.create_table(
         'notification_preferences',
@@ -28,7 +70,12 @@ def upgrade() -> None:
         
         # Anomaly alert preferences
         sa.Column('anomaly_alerts_enabled', sa.Boolean(), default=True, nullable=False),
-        sa.Column('anomaly_sensitivity', sa.String(20), default='medium', nullable=False),
+        sa.Column(
+            'anomaly_sensitivity',
+            postgresql.ENUM(*ENUM_TYPES['anomalysensitivity'], name='anomalysensitivity', create_type=False),
+            nullable=False,
+            server_default='medium',
+        ),
         
         # Spend alert preferences
         sa.Column('spend_alerts_enabled', sa.Boolean(), default=False, nullable=False),
@@ -40,17 +87,17 @@ def upgrade() -> None:
         
         # Budget alert preferences
         sa.Column('budget_alerts_enabled', sa.Boolean(), default=True, nullable=False),
-        sa.Column('budget_alert_percentage', sa.Integer(), default=80, nullable=False),
+        sa.Column('budget_alert_percentage', sa.SmallInteger(), default=80, nullable=False),
         
         # Report preferences
         sa.Column('weekly_report_enabled', sa.Boolean(), default=True, nullable=False),
-        sa.Column('weekly_report_day', sa.Integer(), default=1, nullable=False),
+        sa.Column('weekly_report_day', sa.SmallInteger(), default=1, nullable=False),
         sa.Column('monthly_report_enabled', sa.Boolean(), default=False, nullable=False),
         
         # Quiet hours
         sa.Column('quiet_hours_enabled', sa.Boolean(), default=False, nullable=False),
-        sa.Column('quiet_hours_start', sa.Integer(), default=22, nullable=False),
-        sa.Column('quiet_hours_end', sa.Integer(), default=8, nullable=False),
+        sa.Column('quiet_hours_start', sa.SmallInteger(), default=22, nullable=False),
+        sa.Column('quiet_hours_end', sa.SmallInteger(), default=8, nullable=False),
         sa.Column('timezone', sa.String(50), default='UTC', nullable=False),
         
         # Timestamps
@@ -67,11 +114,11 @@ def upgrade() -> None:
         sa.Column('id', sa.String(36), primary_key=True),
         sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
         
-        sa.Column('alert_type', sa.String(50), nullable=False),
-        sa.Column('channel', sa.String(20), nullable=False),
+        sa.Column('alert_type', postgresql.ENUM(name='alerttype', create_type=False), nullable=False),
+        sa.Column('channel', postgresql.ENUM(name='notificationchannel', create_type=False), nullable=False),
         
         sa.Column('title', sa.String(255), nullable=False),
-        sa.Column('message', sa.String(2000), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
         
         sa.Column('reference_id', sa.String(100), nullable=True),
         
@@ -79,17 +126,52 @@ def upgrade() -> None:
         sa.Column('read_at', sa.DateTime(), nullable=True),
     )
     
+    # read_at is set once per row after insert
+    op.execute("ALTER TABLE notification_logs SET (fillfactor=90)")
+    
     # Create indexes for notification_logs
     op.create_index('ix_notification_logs_user_id', 'notification_logs', ['user_id'])
-    op.create_index('ix_notification_logs_sent_at', 'notification_logs', ['sent_at'])
-    op.create_index('ix_notification_logs_read_at', 'notification_logs', ['read_at'])
+    # Logs are append-only in sent_at order, so a BRIN summary is enough for range scans
+    op.create_index(
+        'ix_notification_logs_sent_at',
+        'notification_logs',
+        ['sent_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    # Only unread notifications are ever looked up, newest first
+    op.execute(
+        "CREATE INDEX ix_notification_logs_unread ON notification_logs (user_id, sent_at DESC) "
+        "WHERE read_at IS NULL"
+    )
+
+    # Per-user unread counter maintained by triggers
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(UNREAD_COUNT_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER notification_logs_unread_count "
+        "AFTER INSERT OR DELETE OR UPDATE OF read_at ON notification_logs "
+        "FOR EACH ROW EXECUTE FUNCTION bump_notification_unread_count()"
+    )
 
 
 def downgrade() -> None:
-    op.drop_index('ix_notification_logs_read_at', table_name='notification_logs')
+    op.execute("DROP TRIGGER IF EXISTS notification_logs_unread_count ON notification_logs")
+    op.execute("DROP FUNCTION IF EXISTS bump_notification_unread_count()")
+    op.drop_table('notification_unread_counts', if_exists=True)
+    
+    op.drop_index('ix_notification_logs_unread', table_name='notification_logs', if_exists=True)
+    op.drop_index('ix_notification_logs_read_at', table_name='notification_logs', if_exists=True)
     op.drop_index('ix_notification_logs_sent_at', table_name='notification_logs')
     op.drop_index('ix_notification_logs_user_id', table_name='notification_logs')
     op.drop_table('notification_logs')
     
     op.drop_index('ix_notification_preferences_user_id', table_name='notification_preferences')
     op.drop_table('notification_preferences')
+
+    for name in ENUM_TYPES:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
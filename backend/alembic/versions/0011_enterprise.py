@@ -15,31 +15,38 @@ down_revision = '0010_client_accounts'
 branch_labels = None
 depends_on = None
 
+ENUM_TYPES = {
+    'ssoprovider': ('saml', 'oidc', 'azure_ad', 'okta', 'google_workspace', 'onelogin'),
+    'ssoconfigstatus': ('draft', 'testing', 'active', 'disabled'),
+    'auditaction': (
+        'login', 'logout', 'login_failed', 'sso_login', 'password_changed', 'password_reset',
+        'user_created', 'user_updated', 'user_deleted', 'user_invited', 'user_role_changed',
+        'account_updated', 'plan_changed', 'billing_updated',
+        'integration_connected', 'integration_disconnected', 'integration_synced',
+        'report_viewed', 'report_exported', 'data_exported', 'sso_config_updated',
+        'api_key_created', 'api_key_revoked', 'permission_changed',
+        'client_created', 'client_updated', 'client_archived', 'client_access_granted', 'client_access_revoked',
+    ),
+    'auditlogseverity': ('info', 'warning', 'critical'),
+}
+
 
 def upgrade() -> None:
-    # Drop enum types if they exist (from partial previous migration)
-    op.execute("DROP TYPE IF EXISTS ssoprovider CASCADE")
-    op.execute("DROP TYPE IF EXISTS ssoconfigstatus CASCADE")
-    op.execute("DROP TYPE IF EXISTS auditaction CASCADE")
-    op.execute("DROP TYPE IF EXISTS auditlogseverity CASCADE")
-    
-    # Drop tables if they exist (from partial previous migration)
-    op.execute("DROP TABLE IF EXISTS api_keys CASCADE")
-    op.execute("DROP TABLE IF EXISTS data_retention_policies CASCADE")
-    op.execute("DROP TABLE IF EXISTS audit_logs CASCADE")
-    op.execute("DROP TABLE IF EXISTS sso_configs CASCADE")
-    
-    # Create enum types using raw SQL
-    op.execute("CREATE TYPE ssoprovider AS ENUM ('saml', 'oidc', 'azure_ad', 'okta', 'google_workspace', 'onelogin')")
-    op.execute("CREATE TYPE ssoconfigstatus AS ENUM ('draft', 'testing', 'active', 'disabled')")
-    op.execute("CREATE TYPE auditaction AS ENUM ('login', 'logout', 'login_failed', 'sso_login', 'password_changed', 'password_reset', 'user_created', 'user_updated', 'user_deleted', 'user_invited', 'user_role_changed', 'account_updated', 'plan_changed', 'billing_updated', 'integration_connected', 'integration_disconnected', 'integration_synced', 'report_viewed', 'report_exported', 'data_exported', 'sso_config_updated', 'api_key_created', 'api_key_revoked', 'permission_changed', 'client_created', 'client_updated', 'client_archived', 'client_access_granted', 'client_access_revoked')")
-    op.execute("CREATE TYPE auditlogseverity AS ENUM ('info', 'warning', 'critical')")
+    # Create enum types in one DO block; a type left behind by an earlier attempt is reused, not dropped
+    create_types = "\n".join(
+        "    BEGIN CREATE TYPE {name} AS ENUM ({labels}); EXCEPTION WHEN duplicate_object THEN NULL; END;".format(
+            name=name, labels=", ".join(f"'{value}'" for value in values)
+        )
+        for name, values in ENUM_TYPES.items()
+    )
+    op.execute(f"DO $$\nBEGIN\n{create_types}\nEND $$")
     
     # Create sso_configs table using VARCHAR and raw SQL for enum columns
+    # last_login_at is bumped on every SSO login; leave room on each page for HOT updates
     op.execute("""
         CREATE TABLE sso_configs (
-            id VARCHAR NOT NULL PRIMARY KEY,
-            account_id VARCHAR NOT NULL REFERENCES accounts(id),
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            account_id VARCHAR(36) NOT NULL REFERENCES accounts(id),
             
             -- Provider configuration (using created enum types)
             provider ssoprovider NOT NULL DEFAULT 'saml',
@@ -74,7 +81,7 @@ def upgrade() -> None:
             last_login_at TIMESTAMP WITH TIME ZONE,
             
             CONSTRAINT uq_sso_configs_account_id UNIQUE (account_id)
-        )
+        ) WITH (fillfactor=80)
     """)
     
     # Create indexes for sso_configs
@@ -84,11 +91,11 @@ def upgrade() -> None:
     # Create audit_logs table using raw SQL
     op.execute("""
         CREATE TABLE audit_logs (
-            id VARCHAR NOT NULL PRIMARY KEY,
-            account_id VARCHAR NOT NULL REFERENCES accounts(id),
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            account_id VARCHAR(36) NOT NULL REFERENCES accounts(id),
             
             -- Actor information
-            user_id VARCHAR REFERENCES users(id),
+            user_id VARCHAR(36) REFERENCES users(id),
             user_email VARCHAR,
             
             -- Action details (using created enum types)
@@ -101,17 +108,17 @@ def upgrade() -> None:
             resource_name VARCHAR,
             
             -- Context
-            description VARCHAR,
+            description TEXT,
             extra_data JSONB,
             
             -- Request information
-            ip_address VARCHAR,
+            ip_address INET,
             user_agent VARCHAR,
             request_id VARCHAR,
             
             -- Status
             success BOOLEAN NOT NULL DEFAULT true,
-            error_message VARCHAR,
+            error_message TEXT,
             
             -- Timestamp
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -119,17 +126,35 @@ def upgrade() -> None:
     """)
     
     # Create indexes for audit_logs
-    op.create_index('ix_audit_logs_account_id', 'audit_logs', ['account_id'])
     op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'])
     op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
-    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'])
-    op.create_index('ix_audit_logs_account_created', 'audit_logs', ['account_id', 'created_at'])
+    # Account-wide time ranges (cleanup, exports) only need a BRIN summary of the append-only log
+    op.create_index(
+        'ix_audit_logs_created_at_brin',
+        'audit_logs',
+        ['created_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    # jsonb_path_ops supports @> containment lookups with a smaller index than the default opclass
+    op.execute("CREATE INDEX ix_audit_logs_extra_data_gin ON audit_logs USING GIN (extra_data jsonb_path_ops)")
+    # Listing is "newest events for an account", optionally filtered by action or user.
+    # These lead with account_id, so no separate account_id/created_at indexes are needed.
+    op.execute("""
+        CREATE INDEX ix_audit_logs_account_created_desc ON audit_logs (account_id, created_at DESC)
+        INCLUDE (action, severity, user_id, resource_type, resource_id, success)
+    """)
+    op.execute("CREATE INDEX ix_audit_logs_account_action_created ON audit_logs (account_id, action, created_at DESC)")
+    op.execute(
+        "CREATE INDEX ix_audit_logs_account_user_created ON audit_logs (account_id, user_id, created_at DESC) "
+        "WHERE user_id IS NOT NULL"
+    )
     
     # Create data_retention_policies table using raw SQL
     op.execute("""
         CREATE TABLE data_retention_policies (
-            id VARCHAR NOT NULL PRIMARY KEY,
-            account_id VARCHAR NOT NULL REFERENCES accounts(id),
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            account_id VARCHAR(36) NOT NULL REFERENCES accounts(id),
             
             -- Retention periods (in days)
             metrics_retention_days INTEGER NOT NULL DEFAULT 730,
@@ -153,11 +178,12 @@ def upgrade() -> None:
     """)
     
     # Create api_keys table using raw SQL
+    # usage_count/last_used_at are bumped on every API request; leave room on each page for HOT updates
     op.execute("""
         CREATE TABLE api_keys (
-            id VARCHAR NOT NULL PRIMARY KEY,
-            account_id VARCHAR NOT NULL REFERENCES accounts(id),
-            created_by_user_id VARCHAR NOT NULL REFERENCES users(id),
+            id VARCHAR(36) NOT NULL PRIMARY KEY,
+            account_id VARCHAR(36) NOT NULL REFERENCES accounts(id),
+            created_by_user_id VARCHAR(36) NOT NULL REFERENCES users(id),
             
             -- Key details
             name VARCHAR NOT NULL,
@@ -181,29 +207,39 @@ def upgrade() -> None:
             -- Status
             is_active BOOLEAN NOT NULL DEFAULT true,
             revoked_at TIMESTAMP WITH TIME ZONE,
-            revoked_by_user_id VARCHAR REFERENCES users(id),
+            revoked_by_user_id VARCHAR(36) REFERENCES users(id),
             
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        )
+        ) WITH (fillfactor=80)
     """)
     
     # Create indexes for api_keys
     op.create_index('ix_api_keys_account_id', 'api_keys', ['account_id'])
     op.create_index('ix_api_keys_key_prefix', 'api_keys', ['key_prefix'])
-    op.create_index('ix_api_keys_is_active', 'api_keys', ['is_active'])
+    # Key validation is an equality lookup on the hash on every API request
+    op.create_index('ix_api_keys_key_hash', 'api_keys', ['key_hash'], postgresql_using='hash')
+    # Key listings only show active keys; revoked ones are rarely read
+    op.execute("CREATE INDEX ix_api_keys_active ON api_keys (account_id, key_prefix) WHERE is_active = true")
+    op.execute("CREATE INDEX ix_api_keys_scopes_gin ON api_keys USING GIN (scopes jsonb_path_ops)")
 
 
 def downgrade() -> None:
     # Drop indexes
-    op.drop_index('ix_api_keys_is_active', table_name='api_keys')
+    op.drop_index('ix_api_keys_scopes_gin', table_name='api_keys')
+    op.drop_index('ix_api_keys_active', table_name='api_keys', if_exists=True)
+    op.drop_index('ix_api_keys_is_active', table_name='api_keys', if_exists=True)
+    op.drop_index('ix_api_keys_key_hash', table_name='api_keys', if_exists=True)
     op.drop_index('ix_api_keys_key_prefix', table_name='api_keys')
     op.drop_index('ix_api_keys_account_id', table_name='api_keys')
     
-    op.drop_index('ix_audit_logs_account_created', table_name='audit_logs')
-    op.drop_index('ix_audit_logs_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_extra_data_gin', table_name='audit_logs')
+    # 0027's downgrade swaps these back to the single-column indexes; drop_table removes those
+    op.drop_index('ix_audit_logs_account_user_created', table_name='audit_logs', if_exists=True)
+    op.drop_index('ix_audit_logs_account_action_created', table_name='audit_logs', if_exists=True)
+    op.drop_index('ix_audit_logs_account_created_desc', table_name='audit_logs', if_exists=True)
+    op.drop_index('ix_audit_logs_created_at_brin', table_name='audit_logs', if_exists=True)
     op.drop_index('ix_audit_logs_action', table_name='audit_logs')
     op.drop_index('ix_audit_logs_user_id', table_name='audit_logs')
-    op.drop_index('ix_audit_logs_account_id', table_name='audit_logs')
     
     op.drop_index('ix_sso_configs_domain', table_name='sso_configs')
     op.drop_index('ix_sso_configs_account_id', table_name='sso_configs')
@@ -215,7 +251,4 @@ def downgrade() -> None:
     op.drop_table('sso_configs')
     
     # Drop enum types
-    op.execute('DROP TYPE IF EXISTS auditlogseverity')
-    op.execute('DROP TYPE IF EXISTS auditaction')
-    op.execute('DROP TYPE IF EXISTS ssoconfigstatus')
-    op.execute('DROP TYPE IF EXISTS ssoprovider')
+    op.execute(f"DROP TYPE IF EXISTS {', '.join(reversed(list(ENUM_TYPES)))}")
@@ -5,6 +5,8 @@ Revises: 0011_enterprise
 Create Date: 2024-12-10 02:40:00.000000
 
 """
+from functools import lru_cache
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy import inspect
@@ -15,28 +17,39 @@ down_revision = '0011_enterprise'
 branch_labels = None
 depends_on = None
 
+# Must match 0009_onboarding_fields
+ONBOARDING_STEP_COLUMNS = ('onboarded_workspace', 'onboarded_integration', 'onboarded_dashboard')
+
+
+@lru_cache(maxsize=None)
+def _get_columns(table_name: str) -> frozenset:
+    """Column names of a table, read from the catalog once per upgrade."""
+    inspector = inspect(op.get_bind())
+    return frozenset(col['name'] for col in inspector.get_columns(table_name))
+
 
 def column_exists(table_name: str, column_name: str) -> bool:
     """Check if a column exists in a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
+    return column_name in _get_columns(table_name)
 
 
 def upgrade() -> None:
+    # Earlier revisions in the same run may have changed the table
+    _get_columns.cache_clear()
+    
+    # Add the onboarding step columns if they don't exist
+    for column in ONBOARDING_STEP_COLUMNS:
+        if not column_exists('accounts', column):
+            op.add_column(
+                'accounts',
+                sa.Column(column, sa.Boolean(), nullable=False, server_default=sa.text('false'))
+            )
+    
     # Add onboarding_completed column if it doesn't exist
     if not column_exists('accounts', 'onboarding_completed'):
-        op.add_column(
-            'accounts',
-            sa.Column('onboarding_completed', sa.Boolean(), nullable=False, server_default='false')
-        )
-    
-    # Add onboarding_steps column if it doesn't exist
-    if not column_exists('accounts', 'onboarding_steps'):
-        op.add_column(
-            'accounts',
-            sa.Column('onboarding_steps', sa.JSON(), nullable=False, server_default='{}')
+        op.execute(
+            "ALTER TABLE accounts ADD COLUMN onboarding_completed BOOLEAN "
+            f"GENERATED ALWAYS AS ({' AND '.join(ONBOARDING_STEP_COLUMNS)}) STORED"
         )
 
 
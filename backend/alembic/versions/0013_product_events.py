@@ -14,27 +14,49 @@ down_revision = '0012_fix_onboarding_columns'
 branch_labels = None
 depends_on = None
 
+# Indexes for efficient querying
+PRODUCT_EVENT_INDEXES = {
+    "ix_product_events_workspace_id": "(workspace_id)",
+    "ix_product_events_user_id": "(user_id)",
+    "ix_product_events_event_name": "(event_name)",
+    "ix_product_events_created_at": "(created_at)",
+    # Composites carry the other filter columns so event counts are index-only scans
+    "ix_product_events_workspace_event": "(workspace_id, event_name) INCLUDE (created_at, user_id)",
+    "ix_product_events_created_event": "(created_at, event_name) INCLUDE (workspace_id)",
+    # Containment filters on properties (properties @> '{"plan": "pro"}')
+    "ix_product_events_properties_gin": "USING GIN (properties jsonb_path_ops)",
+}
+
 
 def upgrade() -> None:
-    # Create product_events table using raw SQL for consistency
-    op.execute("""
-        CREATE TABLE IF NOT EXISTS product_events (
-            id VARCHAR NOT NULL PRIMARY KEY,
-            workspace_id VARCHAR,
-            user_id VARCHAR,
-            event_name VARCHAR NOT NULL,
-            properties JSONB NOT NULL DEFAULT '{}',
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    exists = op.get_bind().execute(sa.text("SELECT to_regclass('product_events')")).scalar()
+    
+    if exists is None:
+        # Fresh table: nothing writes to it yet, so create it and its indexes
+        # in a single batch instead of one round trip per statement
+        index_ddl = "".join(
+            f"CREATE INDEX IF NOT EXISTS {name} ON product_events {definition};\n"
+            for name, definition in PRODUCT_EVENT_INDEXES.items()
         )
-    """)
+        op.execute(f"""
+            CREATE TABLE IF NOT EXISTS product_events (
+                id VARCHAR NOT NULL PRIMARY KEY,
+                workspace_id VARCHAR,
+                user_id VARCHAR,
+                event_name VARCHAR NOT NULL,
+                properties JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            );
+            {index_ddl}
+        """)
+        return
     
-    # Create indexes for efficient querying
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_workspace_id ON product_events (workspace_id)")
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_user_id ON product_events (user_id)")
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_event_name ON product_events (event_name)")
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_created_at ON product_events (created_at)")
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_workspace_event ON product_events (workspace_id, event_name)")
-    op.execute("CREATE INDEX IF NOT EXISTS ix_product_events_created_event ON product_events (created_at, event_name)")
+    # product_events already exists and may be receiving events, so build any
+    # missing indexes without blocking writes; CONCURRENTLY can't run inside a
+    # transaction, or in a multi-statement batch
+    with op.get_context().autocommit_block():
+        for name, definition in PRODUCT_EVENT_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON product_events {definition}")
 
 
 def downgrade() -> None:
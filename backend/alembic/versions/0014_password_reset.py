@@ -5,7 +5,6 @@ Revises: 0013_product_events
 Create Date: 2025-12-11
 """
 from alembic import op
-import sqlalchemy as sa
 
 
 revision = "0014_password_reset"
@@ -15,18 +14,22 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add password reset token column
-    op.add_column(
-        "users",
-        sa.Column("password_reset_token", sa.String(), nullable=True)
-    )
-    # Add password reset expiry column
-    op.add_column(
-        "users",
-        sa.Column("password_reset_expires", sa.DateTime(timezone=True), nullable=True)
+    # Add password reset token and expiry columns in one ALTER (one lock on users).
+    # The profile columns from 0016 ride along, so a fresh database alters users
+    # once; 0016 skips them when they are already there.
+    op.execute(
+        "ALTER TABLE users "
+        "ADD COLUMN password_reset_token VARCHAR, "
+        "ADD COLUMN password_reset_expires TIMESTAMP WITH TIME ZONE, "
+        "ADD COLUMN IF NOT EXISTS avatar_url VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS timezone VARCHAR"
     )
 
 
 def downgrade() -> None:
-    op.drop_column("users", "password_reset_expires")
-    op.drop_column("users", "password_reset_token")
+    # The profile columns are gone already if 0016 was downgraded first
+    op.execute(
+        "ALTER TABLE users "
+        "DROP COLUMN IF EXISTS timezone, DROP COLUMN IF EXISTS avatar_url, "
+        "DROP COLUMN password_reset_expires, DROP COLUMN password_reset_token"
+    )
@@ -6,7 +6,7 @@ Create Date: 2025-12-12 22:55:00.000000
 
 """
 from alembic import op
-import sqlalchemy as sa
+from sqlalchemy import inspect
 
 
 # revision identifiers, used by Alembic.
@@ -17,26 +17,15 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add columns to users table
-    op.add_column('users', sa.Column('avatar_url', sa.String(), nullable=True))
-    op.add_column('users', sa.Column('timezone', sa.String(), nullable=True))
-
-    # Add columns to accounts table
-    op.add_column('accounts', sa.Column('industry', sa.String(), nullable=True))
-    op.add_column('accounts', sa.Column('currency', sa.String(), nullable=True))
-    # accounts table already has timezone column?
-    # Checked models/account.py: it was added. Check existing schema.
-    # 0006 added timezone to ad_accounts, not accounts?
-    # 0001 initial accounts: id, name, type, created_at. No timezone.
-    op.add_column('accounts', sa.Column('timezone', sa.String(), nullable=True))
+    # One ALTER per table, so each table is locked once. Databases that ran the
+    # current 0014 already have the users columns.
+    user_columns = {col['name'] for col in inspect(op.get_bind()).get_columns('users')}
+    if not {'avatar_url', 'timezone'} <= user_columns:
+        op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS avatar_url VARCHAR, ADD COLUMN IF NOT EXISTS timezone VARCHAR")
+    # 0001 created accounts without a timezone column (0006 added it to ad_accounts)
+    op.execute("ALTER TABLE accounts ADD COLUMN industry VARCHAR, ADD COLUMN currency VARCHAR, ADD COLUMN timezone VARCHAR")
 
 
 def downgrade() -> None:
-    # Drop columns from accounts table
-    op.drop_column('accounts', 'timezone')
-    op.drop_column('accounts', 'currency')
-    op.drop_column('accounts', 'industry')
-
-    # Drop columns from users table
-    op.drop_column('users', 'timezone')
-    op.drop_column('users', 'avatar_url')
+    op.execute("ALTER TABLE accounts DROP COLUMN timezone, DROP COLUMN currency, DROP COLUMN industry")
+    op.execute("ALTER TABLE users DROP COLUMN timezone, DROP COLUMN avatar_url")
@@ -0,0 +1,49 @@
+"""Narrow id and foreign key columns to VARCHAR(36)
+
+Revision ID: 0018_narrow_id_columns
+Revises: 789cabcc7b4b
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0018_narrow_id_columns'
+down_revision = '789cabcc7b4b'
+branch_labels = None
+depends_on = None
+
+
+# Every id is a str(uuid4()), so 36 characters is enough.
+ID_COLUMNS = {
+    "accounts": ["id"],
+    "users": ["id", "account_id"],
+    "integrations": ["id", "account_id"],
+    "ad_spend": ["id", "account_id"],
+    "orders": ["id", "account_id"],
+    "daily_metrics": ["id", "account_id", "ad_account_id"],
+    "subscriptions": ["id", "account_id"],
+    "team_invites": ["id", "account_id", "invited_by_id"],
+    "saved_views": ["id", "account_id", "user_id"],
+    "scheduled_reports": ["id", "account_id", "created_by"],
+    "custom_reports": ["id", "account_id", "user_id"],
+    "ad_accounts": ["id", "account_id", "integration_id"],
+}
+
+
+def _alter_id_columns(type_: str) -> None:
+    # One ALTER per table so each table is scanned once
+    for table, columns in ID_COLUMNS.items():
+        clauses = ",\n".join(
+            f"ALTER COLUMN {column} TYPE {type_} USING {column}::{type_}" for column in columns
+        )
+        op.execute(f"ALTER TABLE {table}\n{clauses}")
+
+
+def upgrade() -> None:
+    _alter_id_columns("VARCHAR(36)")
+
+
+def downgrade() -> None:
+    _alter_id_columns("VARCHAR")
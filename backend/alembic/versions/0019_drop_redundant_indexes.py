@@ -0,0 +1,41 @@
+"""Drop single-column indexes covered by composites
+
+Revision ID: 0019_drop_redundant_indexes
+Revises: 0018_narrow_id_columns
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0019_drop_redundant_indexes'
+down_revision = '0018_narrow_id_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        # ix_daily_metrics_account_date leads with account_id
+        op.drop_index("ix_daily_metrics_account_id", table_name="daily_metrics", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_daily_metrics_date", table_name="daily_metrics", postgresql_concurrently=True, if_exists=True)
+
+        # Build the (account_id, date) composite before dropping the account_id index it replaces
+        op.create_index(
+            "ix_ad_spend_account_date",
+            "ad_spend",
+            ["account_id", "date"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("idx_ad_spend_account", table_name="ad_spend", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("idx_ad_spend_account", "ad_spend", ["account_id"], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index("ix_ad_spend_account_date", table_name="ad_spend", postgresql_concurrently=True, if_exists=True)
+        op.create_index("ix_daily_metrics_date", "daily_metrics", ["date"], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("ix_daily_metrics_account_id", "daily_metrics", ["account_id"], postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,67 @@
+"""Use BRIN indexes for time-series date columns
+
+Revision ID: 0020_brin_date_indexes
+Revises: 0019_drop_redundant_indexes
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0020_brin_date_indexes'
+down_revision = '0019_drop_redundant_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, column) for append-ordered date columns
+DATE_INDEXES = (
+    ("idx_ad_spend_date", "ad_spend", "date"),
+    ("idx_orders_date_time", "orders", "date_time"),
+    ("ix_daily_metrics_date", "daily_metrics", "date"),
+)
+
+
+def index_method(index_name: str):
+    """Return the access method of an index (e.g. 'btree', 'brin'), or None if it doesn't exist."""
+    return op.get_bind().execute(
+        text(
+            "SELECT am.amname FROM pg_class c JOIN pg_am am ON am.oid = c.relam "
+            "WHERE c.relkind = 'i' AND c.relname = :name"
+        ),
+        {"name": index_name},
+    ).scalar()
+
+
+def _rebuild(indexes, using: str) -> None:
+    methods = {name: index_method(name) for name, _, _ in indexes}
+
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, column in indexes:
+            if methods[name] == using:
+                continue
+            if methods[name] is not None:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            options = {"postgresql_with": {"pages_per_range": 32}} if using == "brin" else {}
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                **options,
+            )
+
+
+def upgrade() -> None:
+    _rebuild(DATE_INDEXES, "brin")
+
+
+def downgrade() -> None:
+    # 0019 left daily_metrics without a date index
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_daily_metrics_date", table_name="daily_metrics", postgresql_concurrently=True, if_exists=True)
+    _rebuild(DATE_INDEXES[:2], "btree")
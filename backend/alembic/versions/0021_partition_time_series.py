@@ -0,0 +1,115 @@
+"""Partition ad_spend and daily_metrics by month
+
+Revision ID: 0021_partition_time_series
+Revises: 0020_brin_date_indexes
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+from sqlalchemy import text
+
+from app.partitions import add_months
+
+
+# revision identifiers, used by Alembic.
+revision = '0021_partition_time_series'
+down_revision = '0020_brin_date_indexes'
+branch_labels = None
+depends_on = None
+
+
+# table -> partition column. orders stays unpartitioned: order_items
+# references orders.id, which can't be unique on its own once partitioned.
+PARTITIONED_TABLES = {
+    "ad_spend": "date",
+    "daily_metrics": "date",
+}
+
+# Monthly partitions are created this far back and ahead of the current month;
+# older rows land in the default partition, newer months are added by the scheduler.
+MONTHS_BACK = 12
+MONTHS_AHEAD = 12
+
+
+def _is_partitioned(table: str) -> bool:
+    return bool(op.get_bind().execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar())
+
+
+def _rebuild(table: str, column: str, partitioned: bool) -> None:
+    """Recreate a table with (or without) monthly range partitioning, keeping its data, constraints and indexes."""
+    bind = op.get_bind()
+
+    # Capture constraint and index definitions before the old table goes away
+    constraints = bind.execute(
+        text(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype IN ('p', 'u', 'f') "
+            "ORDER BY contype DESC"
+        ),
+        {"table": table},
+    ).all()
+    indexes = bind.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes i WHERE schemaname = current_schema() AND tablename = :table "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+            "WHERE c.conrelid = to_regclass(:table) AND c.conname = i.indexname)"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+    old_table = f"{table}_old"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({column})"
+        )
+
+        current = date.today().replace(day=1)
+        oldest = bind.execute(text(f"SELECT min({column}) FROM {old_table}")).scalar()
+        month = add_months(current, -MONTHS_BACK)
+        if oldest is not None:
+            month = min(month, oldest.replace(day=1))
+        while month <= add_months(current, MONTHS_AHEAD):
+            next_month = add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            )
+            month = next_month
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old_table}")
+    op.execute(f"DROP TABLE {old_table}")
+
+    # The primary key of a partitioned table has to include the partition column
+    primary_key = f"PRIMARY KEY (id, {column})" if partitioned else "PRIMARY KEY (id)"
+    for name, contype, definition in constraints:
+        if contype == "p":
+            definition = primary_key
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for indexdef in indexes:
+        op.execute(indexdef)
+
+    # The copy leaves the new table without statistics, and autovacuum never analyzes a partitioned parent
+    op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    for table, column in PARTITIONED_TABLES.items():
+        if not _is_partitioned(table):
+            _rebuild(table, column, partitioned=True)
+
+
+def downgrade() -> None:
+    for table, column in PARTITIONED_TABLES.items():
+        if _is_partitioned(table):
+            _rebuild(table, column, partitioned=False)
@@ -0,0 +1,65 @@
+"""Replace native enum types with VARCHAR(32) and CHECK constraints
+
+Revision ID: 0022_enum_check_constraints
+Revises: 0021_partition_time_series
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0022_enum_check_constraints'
+down_revision = '0021_partition_time_series'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, enum type, allowed values, server default)
+ENUM_COLUMNS = (
+    ("saved_views", "view_type", "viewtype", ("EXECUTIVE", "ACQUISITION", "CAMPAIGNS", "CUSTOM"), None),
+    ("scheduled_reports", "report_type", "reporttype", ("OVERVIEW", "CAMPAIGNS", "REVENUE", "ORDERS", "CUSTOM"), None),
+    ("scheduled_reports", "frequency", "reportfrequency", ("DAILY", "WEEKLY", "MONTHLY"), None),
+    (
+        "custom_reports",
+        "visualization_type",
+        "visualizationtype",
+        ("table", "line_chart", "bar_chart", "pie_chart", "area_chart", "metric_cards"),
+        "table",
+    ),
+)
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'varchar' or an enum type name)."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def _quoted(values) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+def upgrade() -> None:
+    # Databases created before 0003-0005 switched to VARCHAR still have the native types
+    for table, column, type_name, values, default in ENUM_COLUMNS:
+        if column_udt(table, column) != type_name:
+            continue
+        clauses = [f"ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text"]
+        if default is not None:
+            clauses.insert(0, f"ALTER COLUMN {column} DROP DEFAULT")
+            clauses.append(f"ALTER COLUMN {column} SET DEFAULT '{default}'")
+        clauses.append(f"ADD CONSTRAINT ck_{table}_{column} CHECK ({column} IN ({_quoted(values)}))")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    # Fresh databases never had the native types, so there is nothing to restore
+    pass
@@ -0,0 +1,70 @@
+"""Store structured JSON columns as JSONB
+
+Revision ID: 0023_jsonb_columns
+Revises: 0022_enum_check_constraints
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0023_jsonb_columns'
+down_revision = '0022_enum_check_constraints'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, server default)
+JSON_COLUMNS = (
+    ("integrations", "config_json", None),
+    ("saved_views", "config_json", "'{}'"),
+    ("scheduled_reports", "recipients", None),
+    ("scheduled_reports", "platforms", None),
+    ("scheduled_reports", "metrics", None),
+    ("custom_reports", "config_json", "'{}'"),
+)
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'text', 'json', 'jsonb')."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def _using(column: str, udt: str) -> str:
+    if udt == "json":
+        return f"{column}::jsonb"
+    # Text columns may hold bare values (e.g. a Shopify shop domain) rather than JSON documents
+    return (
+        f"CASE WHEN {column} ~ '^\\s*[\\[{{]' THEN {column}::jsonb "
+        f"ELSE to_jsonb({column}) END"
+    )
+
+
+def _alter(table: str, column: str, type_: str, using: str, default) -> None:
+    clauses = [f"ALTER COLUMN {column} TYPE {type_} USING {using}"]
+    if default is not None:
+        clauses.insert(0, f"ALTER COLUMN {column} DROP DEFAULT")
+        clauses.append(f"ALTER COLUMN {column} SET DEFAULT {default}")
+    op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def upgrade() -> None:
+    # Databases created before 0001-0005 switched to JSONB still have text/json columns
+    for table, column, default in JSON_COLUMNS:
+        udt = column_udt(table, column)
+        if udt is None or udt == "jsonb":
+            continue
+        _alter(table, column, "JSONB", _using(column, udt), default)
+
+
+def downgrade() -> None:
+    # Fresh databases created these columns as JSONB, so there is nothing to restore
+    pass
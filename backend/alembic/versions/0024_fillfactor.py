@@ -0,0 +1,47 @@
+"""Lower fillfactor on update-heavy tables
+
+Revision ID: 0024_fillfactor
+Revises: 0023_jsonb_columns
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0024_fillfactor'
+down_revision = '0023_jsonb_columns'
+branch_labels = None
+depends_on = None
+
+
+# Free space per page lets updates stay on the same page (HOT) without touching indexes.
+# Append-only tables (ad_spend, orders) keep the default of 100.
+FILLFACTORS = {
+    "integrations": 80,
+    "ad_accounts": 90,
+    "daily_metrics": 90,
+}
+
+
+def _storage_targets(table: str) -> list:
+    """Partitioned tables take storage parameters per partition, not on the parent."""
+    partitions = op.get_bind().execute(
+        text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(:table)"),
+        {"table": table},
+    ).scalars().all()
+    return partitions or [table]
+
+
+def upgrade() -> None:
+    # Only affects newly written pages; existing rows are not rewritten
+    for table, fillfactor in FILLFACTORS.items():
+        for target in _storage_targets(table):
+            op.execute(f"ALTER TABLE {target} SET (fillfactor={fillfactor})")
+
+
+def downgrade() -> None:
+    for table in FILLFACTORS:
+        for target in _storage_targets(table):
+            op.execute(f"ALTER TABLE {target} RESET (fillfactor)")
@@ -0,0 +1,64 @@
+"""Store money columns as BIGINT hundred-thousandths
+
+Revision ID: 0025_money_as_bigint
+Revises: 0024_fillfactor
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0025_money_as_bigint'
+down_revision = '0024_fillfactor'
+branch_labels = None
+depends_on = None
+
+
+# Must match app.db.Money.SCALE
+SCALE = 100000
+
+MONEY_COLUMNS = {
+    "ad_spend": ["cost"],
+    "orders": ["total_amount"],
+    "daily_metrics": ["total_revenue", "total_ad_spend", "roas", "profit"],
+}
+
+# Tables whose money columns carry a server default of 0
+DEFAULT_ZERO_TABLES = {"daily_metrics"}
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'numeric' or 'int8')."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # One ALTER per table so each table is rewritten once
+    for table, columns in MONEY_COLUMNS.items():
+        columns = [column for column in columns if column_udt(table, column) == "numeric"]
+        if not columns:
+            continue
+        clauses = []
+        for column in columns:
+            clauses.append(f"ALTER COLUMN {column} TYPE BIGINT USING round({column} * {SCALE})::bigint")
+            if table in DEFAULT_ZERO_TABLES:
+                clauses.append(f"ALTER COLUMN {column} SET DEFAULT 0")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def downgrade() -> None:
+    for table, columns in MONEY_COLUMNS.items():
+        clauses = []
+        for column in columns:
+            clauses.append(f"ALTER COLUMN {column} TYPE NUMERIC(18, 4) USING {column}::numeric / {SCALE}")
+            if table in DEFAULT_ZERO_TABLES:
+                clauses.append(f"ALTER COLUMN {column} SET DEFAULT 0")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
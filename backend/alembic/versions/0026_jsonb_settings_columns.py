@@ -0,0 +1,62 @@
+"""Store onboarding, client and enterprise JSON columns as JSONB
+
+Revision ID: 0026_jsonb_settings_columns
+Revises: 0025_money_as_bigint
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0026_jsonb_settings_columns'
+down_revision = '0025_money_as_bigint'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, server default)
+JSON_COLUMNS = (
+    ("accounts", "onboarding_steps", "'{}'::jsonb"),
+    ("client_accounts", "settings", "'{}'::jsonb"),
+    ("client_accounts", "branding", "'{}'::jsonb"),
+)
+
+# Containment (@>) lookups only need jsonb_path_ops
+GIN_INDEXES = {
+    "ix_audit_logs_extra_data_gin": ("audit_logs", "extra_data"),
+    "ix_api_keys_scopes_gin": ("api_keys", "scopes"),
+}
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'json' or 'jsonb')."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # Databases created before 0009/0010/0012 switched to JSONB still have json columns
+    for table, column, default in JSON_COLUMNS:
+        if column_udt(table, column) != "json":
+            continue
+        op.execute(
+            f"ALTER TABLE {table} "
+            f"ALTER COLUMN {column} DROP DEFAULT, "
+            f"ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb, "
+            f"ALTER COLUMN {column} SET DEFAULT {default}"
+        )
+
+    for name, (table, column) in GIN_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING GIN ({column} jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    # Fresh databases created these columns and indexes in 0009-0012, so there is nothing to restore
+    pass
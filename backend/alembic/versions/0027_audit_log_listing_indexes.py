@@ -0,0 +1,55 @@
+"""Replace audit_logs single-column indexes with listing composites
+
+Revision ID: 0027_audit_log_listing_indexes
+Revises: 0026_jsonb_settings_columns
+Create Date: 2026-10-17 13:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0027_audit_log_listing_indexes'
+down_revision = '0026_jsonb_settings_columns'
+branch_labels = None
+depends_on = None
+
+
+LISTING_INDEXES = {
+    "ix_audit_logs_account_created_desc": (
+        "(account_id, created_at DESC) "
+        "INCLUDE (action, severity, user_id, resource_type, resource_id, success)"
+    ),
+    "ix_audit_logs_account_action_created": "(account_id, action, created_at DESC)",
+    "ix_audit_logs_account_user_created": "(account_id, user_id, created_at DESC) WHERE user_id IS NOT NULL",
+}
+
+# Covered by the composites above, which all lead with account_id
+REPLACED_INDEXES = {
+    "ix_audit_logs_account_id": "(account_id)",
+    "ix_audit_logs_created_at": "(created_at)",
+    "ix_audit_logs_account_created": "(account_id, created_at)",
+}
+
+
+def _create(indexes: dict) -> None:
+    for name, definition in indexes.items():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON audit_logs {definition}")
+
+
+def _drop(indexes: dict) -> None:
+    for name in indexes:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; build the replacements before dropping
+    with op.get_context().autocommit_block():
+        _create(LISTING_INDEXES)
+        _drop(REPLACED_INDEXES)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _create(REPLACED_INDEXES)
+        _drop(LISTING_INDEXES)
@@ -0,0 +1,107 @@
+"""Partition audit_logs by month on created_at
+
+Revision ID: 0028_partition_audit_logs
+Revises: 0027_audit_log_listing_indexes
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+from sqlalchemy import text
+
+from app.partitions import add_months
+
+
+# revision identifiers, used by Alembic.
+revision = '0028_partition_audit_logs'
+down_revision = '0027_audit_log_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Monthly partitions are created this far back and ahead of the current month,
+# reaching further back to cover the oldest existing row; only rows past the last
+# month land in the default partition, and create_upcoming_partitions adds new
+# months. Retention can then drop whole monthly partitions instead of DELETEing.
+MONTHS_BACK = 3
+MONTHS_AHEAD = 12
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')")
+    ).scalar())
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Recreate audit_logs with (or without) monthly partitioning, keeping its data, constraints and indexes."""
+    bind = op.get_bind()
+
+    # Capture constraint and index definitions before the old table goes away
+    constraints = bind.execute(
+        text(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass('audit_logs') AND contype IN ('p', 'u', 'f') "
+            "ORDER BY contype DESC"
+        )
+    ).all()
+    indexes = bind.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes i WHERE schemaname = current_schema() AND tablename = 'audit_logs' "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+            "WHERE c.conrelid = to_regclass('audit_logs') AND c.conname = i.indexname)"
+        )
+    ).scalars().all()
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old")
+
+    if partitioned:
+        # The partition key is part of the primary key, so it can't be NULL
+        op.execute("UPDATE audit_logs_old SET created_at = now() WHERE created_at IS NULL")
+        op.execute("ALTER TABLE audit_logs_old ALTER COLUMN created_at SET NOT NULL")
+        op.execute(
+            "CREATE TABLE audit_logs (LIKE audit_logs_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+
+        current = date.today().replace(day=1)
+        oldest = bind.execute(text("SELECT min(created_at) FROM audit_logs_old")).scalar()
+        month = add_months(current, -MONTHS_BACK)
+        if oldest is not None:
+            month = min(month, oldest.date().replace(day=1))
+        while month <= add_months(current, MONTHS_AHEAD):
+            next_month = add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            )
+            month = next_month
+        op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    else:
+        op.execute("CREATE TABLE audit_logs (LIKE audit_logs_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_old")
+    op.execute("DROP TABLE audit_logs_old")
+
+    # The primary key of a partitioned table has to include the partition column
+    primary_key = "PRIMARY KEY (id, created_at)" if partitioned else "PRIMARY KEY (id)"
+    for name, contype, definition in constraints:
+        if contype == "p":
+            definition = primary_key
+        op.execute(f"ALTER TABLE audit_logs ADD CONSTRAINT {name} {definition}")
+    for indexdef in indexes:
+        op.execute(indexdef)
+
+    # The copy leaves the new table without statistics, and autovacuum never analyzes a partitioned parent
+    op.execute("ANALYZE audit_logs")
+
+
+def upgrade() -> None:
+    if not _is_partitioned():
+        _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        _rebuild(partitioned=False)
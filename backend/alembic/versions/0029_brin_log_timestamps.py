@@ -0,0 +1,66 @@
+"""Use BRIN indexes for notification and audit log timestamps
+
+Revision ID: 0029_brin_log_timestamps
+Revises: 0028_partition_audit_logs
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0029_brin_log_timestamps'
+down_revision = '0028_partition_audit_logs'
+branch_labels = None
+depends_on = None
+
+
+def index_method(index_name: str):
+    """Return the access method of an index (e.g. 'btree', 'brin'), or None if it doesn't exist."""
+    return op.get_bind().execute(
+        text(
+            "SELECT am.amname FROM pg_class c JOIN pg_am am ON am.oid = c.relam "
+            "WHERE c.relkind IN ('i', 'I') AND c.relname = :name"
+        ),
+        {"name": index_name},
+    ).scalar()
+
+
+def _rebuild_sent_at(using: str) -> None:
+    method = index_method("ix_notification_logs_sent_at")
+    if method == using:
+        return
+
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        if method is not None:
+            op.drop_index("ix_notification_logs_sent_at", table_name="notification_logs", postgresql_concurrently=True)
+        options = {"postgresql_with": {"pages_per_range": 32}} if using == "brin" else {}
+        op.create_index(
+            "ix_notification_logs_sent_at",
+            "notification_logs",
+            ["sent_at"],
+            postgresql_using=using,
+            postgresql_concurrently=True,
+            **options,
+        )
+
+
+def upgrade() -> None:
+    _rebuild_sent_at("brin")
+
+    # audit_logs is partitioned, which rules out CONCURRENTLY; a BRIN build only reads the table once
+    if index_method("ix_audit_logs_created_at_brin") is None:
+        op.create_index(
+            "ix_audit_logs_created_at_brin",
+            "audit_logs",
+            ["created_at"],
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_created_at_brin", table_name="audit_logs", if_exists=True)
+    _rebuild_sent_at("btree")
@@ -0,0 +1,53 @@
+"""Replace low-selectivity status indexes with partial indexes
+
+Revision ID: 0030_partial_status_indexes
+Revises: 0029_brin_log_timestamps
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0030_partial_status_indexes'
+down_revision = '0029_brin_log_timestamps'
+branch_labels = None
+depends_on = None
+
+
+# name -> (table, definition)
+PARTIAL_INDEXES = {
+    "ix_notification_logs_unread": ("notification_logs", "(user_id, sent_at DESC) WHERE read_at IS NULL"),
+    "ix_client_accounts_agency_active": ("client_accounts", "(agency_account_id) WHERE status = 'active'"),
+    "ix_api_keys_active": ("api_keys", "(account_id, key_prefix) WHERE is_active = true"),
+}
+
+# Full-column indexes on read_at, status and is_active that the partial ones replace
+REPLACED_INDEXES = {
+    "ix_notification_logs_read_at": ("notification_logs", "(read_at)"),
+    "ix_client_accounts_status": ("client_accounts", "(status)"),
+    "ix_api_keys_is_active": ("api_keys", "(is_active)"),
+}
+
+
+def _create(indexes: dict) -> None:
+    for name, (table, definition) in indexes.items():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def _drop(indexes: dict) -> None:
+    for name in indexes:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; build the replacements before dropping
+    with op.get_context().autocommit_block():
+        _create(PARTIAL_INDEXES)
+        _drop(REPLACED_INDEXES)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _create(REPLACED_INDEXES)
+        _drop(PARTIAL_INDEXES)
@@ -0,0 +1,33 @@
+"""Add a hash index on api_keys.key_hash
+
+Revision ID: 0031_api_key_hash_index
+Revises: 0030_partial_status_indexes
+Create Date: 2026-10-17 15:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0031_api_key_hash_index'
+down_revision = '0030_partial_status_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_api_keys_key_hash",
+            "api_keys",
+            ["key_hash"],
+            postgresql_using="hash",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_api_keys_key_hash", table_name="api_keys", postgresql_concurrently=True, if_exists=True)
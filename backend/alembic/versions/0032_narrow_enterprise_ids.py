@@ -0,0 +1,43 @@
+"""Narrow client and enterprise id columns to VARCHAR(36)
+
+Revision ID: 0032_narrow_enterprise_ids
+Revises: 0031_api_key_hash_index
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0032_narrow_enterprise_ids'
+down_revision = '0031_api_key_hash_index'
+branch_labels = None
+depends_on = None
+
+
+# Same treatment as 0018 for the tables added in 0010 and 0011
+ID_COLUMNS = {
+    "client_accounts": ["id", "agency_account_id"],
+    "client_user_access": ["id", "user_id", "client_account_id"],
+    "sso_configs": ["id", "account_id"],
+    "audit_logs": ["id", "account_id", "user_id"],
+    "data_retention_policies": ["id", "account_id"],
+    "api_keys": ["id", "account_id", "created_by_user_id", "revoked_by_user_id"],
+}
+
+
+def _alter_id_columns(type_: str) -> None:
+    # One ALTER per table so each table is scanned once
+    for table, columns in ID_COLUMNS.items():
+        clauses = ",\n".join(
+            f"ALTER COLUMN {column} TYPE {type_} USING {column}::{type_}" for column in columns
+        )
+        op.execute(f"ALTER TABLE {table}\n{clauses}")
+
+
+def upgrade() -> None:
+    _alter_id_columns("VARCHAR(36)")
+
+
+def downgrade() -> None:
+    _alter_id_columns("VARCHAR")
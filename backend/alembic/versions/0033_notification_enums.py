@@ -0,0 +1,75 @@
+"""Store notification sensitivity, alert type and channel as native enums
+
+Revision ID: 0033_notification_enums
+Revises: 0032_narrow_enterprise_ids
+Create Date: 2026-10-17 16:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0033_notification_enums'
+down_revision = '0032_narrow_enterprise_ids'
+branch_labels = None
+depends_on = None
+
+
+ENUM_TYPES = {
+    "anomalysensitivity": ("low", "medium", "high"),
+    "alerttype": (
+        "anomaly_spike", "anomaly_drop", "spend_threshold", "roas_threshold",
+        "budget_alert", "weekly_report", "monthly_report",
+    ),
+    "notificationchannel": ("email", "in_app"),
+}
+
+# (table, column, enum type, previous VARCHAR length, server default)
+ENUM_COLUMNS = (
+    ("notification_preferences", "anomaly_sensitivity", "anomalysensitivity", 20, "medium"),
+    ("notification_logs", "alert_type", "alerttype", 50, None),
+    ("notification_logs", "channel", "notificationchannel", 20, None),
+)
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'varchar' or 'alerttype')."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    for name, values in ENUM_TYPES.items():
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(
+            f"DO $$ BEGIN CREATE TYPE {name} AS ENUM ({labels}); "
+            f"EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+        )
+
+    # Databases created before 0008 used native enums hold VARCHARs; older rows
+    # stored enum names ('ANOMALY_SPIKE'), hence the lower()
+    for table, column, enum_type, _, default in ENUM_COLUMNS:
+        if column_udt(table, column) != "varchar":
+            continue
+        clauses = [f"ALTER COLUMN {column} TYPE {enum_type} USING lower({column})::{enum_type}"]
+        if default is not None:
+            clauses.insert(0, f"ALTER COLUMN {column} DROP DEFAULT")
+            clauses.append(f"ALTER COLUMN {column} SET DEFAULT '{default}'")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def downgrade() -> None:
+    for table, column, _, length, default in ENUM_COLUMNS:
+        clauses = [f"ALTER COLUMN {column} TYPE VARCHAR({length}) USING {column}::text"]
+        if default is not None:
+            clauses.insert(0, f"ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+    for name in ENUM_TYPES:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
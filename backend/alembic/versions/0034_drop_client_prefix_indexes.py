@@ -0,0 +1,30 @@
+"""Drop client indexes covered by unique composites
+
+Revision ID: 0034_drop_client_prefix_indexes
+Revises: 0033_notification_enums
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0034_drop_client_prefix_indexes'
+down_revision = '0033_notification_enums'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        # ix_client_accounts_slug (agency_account_id, slug) leads with agency_account_id
+        op.drop_index("ix_client_accounts_agency_id", table_name="client_accounts", postgresql_concurrently=True, if_exists=True)
+        # ix_client_user_access_unique (user_id, client_account_id) leads with user_id
+        op.drop_index("ix_client_user_access_user_id", table_name="client_user_access", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_client_user_access_user_id", "client_user_access", ["user_id"], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("ix_client_accounts_agency_id", "client_accounts", ["agency_account_id"], postgresql_concurrently=True, if_not_exists=True)
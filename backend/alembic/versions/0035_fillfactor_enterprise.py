@@ -0,0 +1,36 @@
+"""Lower fillfactor on frequently touched client and enterprise tables
+
+Revision ID: 0035_fillfactor_enterprise
+Revises: 0034_drop_client_prefix_indexes
+Create Date: 2026-10-17 17:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0035_fillfactor_enterprise'
+down_revision = '0034_drop_client_prefix_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Same reasoning as 0024: the bumped columns (usage_count, last_login_at,
+# last_accessed_at, read_at) aren't indexed, so free space allows HOT updates.
+FILLFACTORS = {
+    "api_keys": 80,
+    "sso_configs": 80,
+    "client_accounts": 80,
+    "notification_logs": 90,
+}
+
+
+def upgrade() -> None:
+    # Only affects newly written pages; existing rows are not rewritten
+    for table, fillfactor in FILLFACTORS.items():
+        op.execute(f"ALTER TABLE {table} SET (fillfactor={fillfactor})")
+
+
+def downgrade() -> None:
+    for table in FILLFACTORS:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
@@ -0,0 +1,48 @@
+"""Store audit_logs.ip_address as INET
+
+Revision ID: 0036_audit_log_inet
+Revises: 0035_fillfactor_enterprise
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0036_audit_log_inet'
+down_revision = '0035_fillfactor_enterprise'
+branch_labels = None
+depends_on = None
+
+
+def column_udt(table_name: str, column_name: str):
+    """Return the column's underlying type name (e.g. 'varchar' or 'inet')."""
+    return op.get_bind().execute(
+        text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    if column_udt("audit_logs", "ip_address") != "varchar":
+        return
+
+    # Older rows may hold values that aren't addresses; those become NULL instead of failing the cast
+    op.execute("""
+        CREATE FUNCTION pg_temp.try_inet(value text) RETURNS inet AS $$
+        BEGIN
+            RETURN value::inet;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN ip_address TYPE INET USING pg_temp.try_inet(ip_address)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN ip_address TYPE VARCHAR USING host(ip_address)")
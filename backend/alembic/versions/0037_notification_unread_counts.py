@@ -0,0 +1,72 @@
+"""Maintain per-user unread notification counts with a trigger
+
+Revision ID: 0037_notification_unread_counts
+Revises: 0036_audit_log_inet
+Create Date: 2026-10-17 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0037_notification_unread_counts'
+down_revision = '0036_audit_log_inet'
+branch_labels = None
+depends_on = None
+
+
+# Same function 0008 creates on fresh databases
+UNREAD_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_notification_unread_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.read_at IS NULL THEN
+            INSERT INTO notification_unread_counts (user_id, unread) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET unread = notification_unread_counts.unread + 1;
+        END IF;
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF OLD.read_at IS NULL AND NEW.read_at IS NOT NULL THEN
+            UPDATE notification_unread_counts SET unread = unread - 1 WHERE user_id = NEW.user_id;
+        ELSIF OLD.read_at IS NOT NULL AND NEW.read_at IS NULL THEN
+            INSERT INTO notification_unread_counts (user_id, unread) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET unread = notification_unread_counts.unread + 1;
+        END IF;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF OLD.read_at IS NULL THEN
+            UPDATE notification_unread_counts SET unread = unread - 1 WHERE user_id = OLD.user_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+        if_not_exists=True,
+    )
+    op.execute(UNREAD_COUNT_FUNCTION)
+    op.execute("DROP TRIGGER IF EXISTS notification_logs_unread_count ON notification_logs")
+    op.execute(
+        "CREATE TRIGGER notification_logs_unread_count "
+        "AFTER INSERT OR DELETE OR UPDATE OF read_at ON notification_logs "
+        "FOR EACH ROW EXECUTE FUNCTION bump_notification_unread_count()"
+    )
+
+    # Seed counts for notifications written before the trigger existed
+    op.execute("""
+        INSERT INTO notification_unread_counts (user_id, unread)
+        SELECT user_id, count(*) FROM notification_logs WHERE read_at IS NULL GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET unread = EXCLUDED.unread
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS notification_logs_unread_count ON notification_logs")
+    op.execute("DROP FUNCTION IF EXISTS bump_notification_unread_count()")
+    op.drop_table('notification_unread_counts', if_exists=True)
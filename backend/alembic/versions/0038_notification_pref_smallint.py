@@ -0,0 +1,35 @@
+"""Store small-range notification preference columns as SMALLINT
+
+Revision ID: 0038_notification_pref_smallint
+Revises: 0037_notification_unread_counts
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0038_notification_pref_smallint'
+down_revision = '0037_notification_unread_counts'
+branch_labels = None
+depends_on = None
+
+
+# Percentages, weekdays and hours of the day; the spend/ROAS thresholds are unbounded and stay INTEGER
+SMALL_COLUMNS = ["budget_alert_percentage", "weekly_report_day", "quiet_hours_start", "quiet_hours_end"]
+
+
+def _alter(type_: str) -> None:
+    # One ALTER so the table is rewritten once
+    op.execute(
+        "ALTER TABLE notification_preferences "
+        + ", ".join(f"ALTER COLUMN {column} TYPE {type_}" for column in SMALL_COLUMNS)
+    )
+
+
+def upgrade() -> None:
+    _alter("SMALLINT")
+
+
+def downgrade() -> None:
+    _alter("INTEGER")
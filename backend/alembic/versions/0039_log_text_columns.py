@@ -0,0 +1,27 @@
+"""Store notification and audit log free-text columns as TEXT
+
+Revision ID: 0039_log_text_columns
+Revises: 0038_notification_pref_smallint
+Create Date: 2026-10-17 19:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0039_log_text_columns'
+down_revision = '0038_notification_pref_smallint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # VARCHAR -> TEXT is binary compatible, so neither table is rewritten.
+    # TEXT keeps the default EXTENDED storage: long values are compressed and moved out of line.
+    op.execute("ALTER TABLE notification_logs ALTER COLUMN message TYPE TEXT")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN description TYPE TEXT, ALTER COLUMN error_message TYPE TEXT")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN description TYPE VARCHAR, ALTER COLUMN error_message TYPE VARCHAR")
+    op.execute("ALTER TABLE notification_logs ALTER COLUMN message TYPE VARCHAR(2000)")
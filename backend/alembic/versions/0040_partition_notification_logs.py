@@ -0,0 +1,104 @@
+"""Hash-partition notification_logs on user_id
+
+Revision ID: 0040_partition_notification_logs
+Revises: 0039_log_text_columns
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0040_partition_notification_logs'
+down_revision = '0039_log_text_columns'
+branch_labels = None
+depends_on = None
+
+
+# Every alert insert and every per-user listing is keyed by user_id; spreading
+# rows over hash partitions spreads index writes and keeps per-user indexes small.
+PARTITIONS = 16
+
+# Set by 0035; storage parameters live on each partition, not on the parent
+FILLFACTOR = 90
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('notification_logs')")
+    ).scalar())
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Recreate notification_logs with (or without) hash partitioning, keeping its data, constraints, indexes and triggers."""
+    bind = op.get_bind()
+
+    # Capture constraint, index and trigger definitions before the old table goes away
+    constraints = bind.execute(
+        text(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass('notification_logs') AND contype IN ('p', 'u', 'f') "
+            "ORDER BY contype DESC"
+        )
+    ).all()
+    indexes = bind.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes i WHERE schemaname = current_schema() AND tablename = 'notification_logs' "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+            "WHERE c.conrelid = to_regclass('notification_logs') AND c.conname = i.indexname)"
+        )
+    ).scalars().all()
+    triggers = bind.execute(
+        text(
+            "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+            "WHERE tgrelid = to_regclass('notification_logs') AND NOT tgisinternal"
+        )
+    ).scalars().all()
+
+    op.execute("ALTER TABLE notification_logs RENAME TO notification_logs_old")
+
+    if partitioned:
+        op.execute(
+            "CREATE TABLE notification_logs (LIKE notification_logs_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY HASH (user_id)"
+        )
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE notification_logs_p{remainder} PARTITION OF notification_logs "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder}) "
+                f"WITH (fillfactor={FILLFACTOR})"
+            )
+    else:
+        op.execute(
+            "CREATE TABLE notification_logs (LIKE notification_logs_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"WITH (fillfactor={FILLFACTOR})"
+        )
+
+    # Triggers are recreated after the copy, so the unread counters aren't bumped twice
+    op.execute("INSERT INTO notification_logs SELECT * FROM notification_logs_old")
+    op.execute("DROP TABLE notification_logs_old")
+
+    # The primary key of a partitioned table has to include the partition column
+    primary_key = "PRIMARY KEY (id, user_id)" if partitioned else "PRIMARY KEY (id)"
+    for name, contype, definition in constraints:
+        if contype == "p":
+            definition = primary_key
+        op.execute(f"ALTER TABLE notification_logs ADD CONSTRAINT {name} {definition}")
+    for indexdef in indexes:
+        op.execute(indexdef)
+    for triggerdef in triggers:
+        op.execute(triggerdef)
+
+    # The copy leaves the new table without statistics, and autovacuum never analyzes a partitioned parent
+    op.execute("ANALYZE notification_logs")
+
+
+def upgrade() -> None:
+    if not _is_partitioned():
+        _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        _rebuild(partitioned=False)
@@ -0,0 +1,68 @@
+"""Replace accounts.onboarding_steps JSON with typed step columns
+
+Revision ID: 0041_onboarding_step_columns
+Revises: 0040_partition_notification_logs
+Create Date: 2026-10-17 20:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0041_onboarding_step_columns'
+down_revision = '0040_partition_notification_logs'
+branch_labels = None
+depends_on = None
+
+
+# onboarding_steps key -> boolean column; must match 0009_onboarding_fields
+ONBOARDING_STEP_COLUMNS = {
+    "created_workspace": "onboarded_workspace",
+    "connected_integration": "onboarded_integration",
+    "viewed_dashboard": "onboarded_dashboard",
+}
+ONBOARDING_COMPLETED_EXPRESSION = " AND ".join(ONBOARDING_STEP_COLUMNS.values())
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    return bool(op.get_bind().execute(
+        text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table_name, "column": column_name},
+    ).scalar())
+
+
+def upgrade() -> None:
+    # Databases created before 0009/0012 switched to typed columns still keep the steps as JSON
+    if not column_exists("accounts", "onboarding_steps"):
+        return
+
+    op.execute(
+        "ALTER TABLE accounts "
+        + ", ".join(
+            f"ADD COLUMN IF NOT EXISTS {column} BOOLEAN NOT NULL DEFAULT false"
+            for column in ONBOARDING_STEP_COLUMNS.values()
+        )
+    )
+    # Accounts already marked complete keep that status even if a step key is missing
+    op.execute(
+        "UPDATE accounts SET "
+        + ", ".join(
+            f"{column} = COALESCE((onboarding_steps ->> '{step}')::boolean, false) OR COALESCE(onboarding_completed, false)"
+            for step, column in ONBOARDING_STEP_COLUMNS.items()
+        )
+    )
+    op.execute(
+        "ALTER TABLE accounts "
+        "DROP COLUMN onboarding_completed, "
+        "DROP COLUMN onboarding_steps, "
+        f"ADD COLUMN onboarding_completed BOOLEAN GENERATED ALWAYS AS ({ONBOARDING_COMPLETED_EXPRESSION}) STORED"
+    )
+
+
+def downgrade() -> None:
+    # 0009/0012 now create the typed columns, so they are already the schema of the previous revision
+    pass
@@ -0,0 +1,60 @@
+"""Add INCLUDE columns to the product_events composite indexes
+
+Revision ID: 0042_product_event_include
+Revises: 0041_onboarding_step_columns
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0042_product_event_include'
+down_revision = '0041_onboarding_step_columns'
+branch_labels = None
+depends_on = None
+
+
+# name -> (covering definition, plain definition)
+COVERING_INDEXES = {
+    "ix_product_events_workspace_event": (
+        "(workspace_id, event_name) INCLUDE (created_at, user_id)",
+        "(workspace_id, event_name)",
+    ),
+    "ix_product_events_created_event": (
+        "(created_at, event_name) INCLUDE (workspace_id)",
+        "(created_at, event_name)",
+    ),
+}
+
+
+def has_include(name: str) -> bool:
+    """Whether the index carries non-key (INCLUDE) columns."""
+    return bool(op.get_bind().execute(
+        text("SELECT indnatts > indnkeyatts FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar())
+
+
+def _swap(name: str, definition: str) -> None:
+    """Build the new definition under a temporary name, then replace the old index with it."""
+    op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}_new")
+    op.execute(f"CREATE INDEX CONCURRENTLY {name}_new ON product_events {definition}")
+    op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    # Databases indexed before 0013 added the INCLUDE columns; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, (covering, _) in COVERING_INDEXES.items():
+            if not has_include(name):
+                _swap(name, covering)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (_, plain) in COVERING_INDEXES.items():
+            if has_include(name):
+                _swap(name, plain)
@@ -0,0 +1,64 @@
+"""Make ix_subscriptions_account_id unique for webhook upserts
+
+Revision ID: 0043_unique_subscription_account
+Revises: 0042_product_event_include
+Create Date: 2026-10-17 21:30:00.000000
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0043_unique_subscription_account'
+down_revision = '0042_product_event_include'
+branch_labels = None
+depends_on = None
+
+
+def is_unique(name: str) -> bool:
+    return bool(op.get_bind().execute(
+        text("SELECT indisunique FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar())
+
+
+def _swap(unique: bool) -> None:
+    """Build the replacement under a temporary name, then swap it in for ix_subscriptions_account_id."""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_subscriptions_account_id_new")
+    op.execute(f"CREATE {kind} CONCURRENTLY ix_subscriptions_account_id_new ON subscriptions (account_id)")
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_subscriptions_account_id")
+    op.execute("ALTER INDEX ix_subscriptions_account_id_new RENAME TO ix_subscriptions_account_id")
+
+
+def upgrade() -> None:
+    if is_unique("ix_subscriptions_account_id"):
+        return
+
+    # Only the latest row per account was ever read back; drop the older duplicates
+    op.execute("""
+        DELETE FROM subscriptions
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY account_id
+                    ORDER BY COALESCE(updated_at, created_at) DESC NULLS LAST, id DESC
+                ) AS position
+                FROM subscriptions
+            ) ranked
+            WHERE position > 1
+        )
+    """)
+
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        _swap(unique=True)
+
+
+def downgrade() -> None:
+    if not is_unique("ix_subscriptions_account_id"):
+        return
+
+    with op.get_context().autocommit_block():
+        _swap(unique=False)
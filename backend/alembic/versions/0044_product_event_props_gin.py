@@ -0,0 +1,29 @@
+"""Add a GIN index on product_events.properties
+
+Revision ID: 0044_product_event_props_gin
+Revises: 0043_unique_subscription_account
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0044_product_event_props_gin'
+down_revision = '0043_unique_subscription_account'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created before 0013 defined this index; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_events_properties_gin "
+            "ON product_events USING GIN (properties jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    # 0013 creates the index on fresh databases, so it stays
+    pass
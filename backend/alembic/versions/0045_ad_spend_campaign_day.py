@@ -0,0 +1,104 @@
+"""Unique (account_id, platform, external_campaign_id, date) index on ad_spend
+
+Revision ID: 0045_ad_spend_campaign_day
+Revises: 0044_product_event_props_gin
+Create Date: 2026-10-17 22:30:00.000000
+
+"""
+from typing import Optional
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0045_ad_spend_campaign_day'
+down_revision = '0044_product_event_props_gin'
+branch_labels = None
+depends_on = None
+
+
+INDEX = "ix_ad_spend_campaign_day"
+COLUMNS = "(account_id, platform, external_campaign_id, date)"
+
+
+def _partitions() -> list:
+    """Partitions of ad_spend; empty when the table isn't partitioned (see 0021)."""
+    return op.get_bind().execute(
+        text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass('ad_spend')")
+    ).scalars().all()
+
+
+def _index_valid() -> Optional[bool]:
+    """None if the index doesn't exist yet, else whether Postgres considers it valid."""
+    return op.get_bind().execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index)"), {"index": INDEX}
+    ).scalar()
+
+
+def _attached_partitions() -> set:
+    """Partitions whose index is already attached to the parent index."""
+    return set(op.get_bind().execute(
+        text(
+            "SELECT i.indrelid::regclass::text FROM pg_inherits h "
+            "JOIN pg_index i ON i.indexrelid = h.inhrelid WHERE h.inhparent = to_regclass(:index)"
+        ),
+        {"index": INDEX},
+    ).scalars().all())
+
+
+def upgrade() -> None:
+    # An interrupted run can leave the index behind invalid: a failed concurrent
+    # build, or a partitioned parent with only some partition indexes attached.
+    # ON CONFLICT can't infer an invalid index, so finish the job instead of returning.
+    valid = _index_valid()
+    if valid:
+        return
+
+    # Syncs used to append a row per run; keep the latest row per campaign and
+    # day. ad_spend has no write timestamp and ids are random uuid4s, so
+    # recency comes from the row version: age(xmin) is smallest for the row
+    # written last. Rows copied by one statement (0021, 0025's rewrite) share
+    # an xmin; among those a higher ctid was written later. Duplicates share a
+    # date and so a partition, which makes their ctids comparable.
+    op.execute("""
+        DELETE FROM ad_spend
+        WHERE (id, date) IN (
+            SELECT id, date FROM (
+                SELECT id, date, row_number() OVER (
+                    PARTITION BY account_id, platform, external_campaign_id, date
+                    ORDER BY age(xmin), ctid DESC
+                ) AS position
+                FROM ad_spend
+                WHERE external_campaign_id IS NOT NULL
+            ) ranked
+            WHERE position > 1
+        )
+    """)
+
+    partitions = _partitions()
+    # CONCURRENTLY can't run inside a transaction, or on a partitioned parent:
+    # there the parent index is created empty (ON ONLY) and each partition's
+    # index is built concurrently and attached, which makes the parent valid
+    with op.get_context().autocommit_block():
+        if not partitions:
+            if valid is not None:
+                op.execute(f"DROP INDEX CONCURRENTLY {INDEX}")
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {INDEX} ON ad_spend {COLUMNS}")
+            return
+
+        if valid is None:
+            op.execute(f"CREATE UNIQUE INDEX {INDEX} ON ONLY ad_spend {COLUMNS}")
+        attached = _attached_partitions()
+        for partition in partitions:
+            if partition in attached:
+                continue
+            partition_index = f"{partition}_campaign_day_key"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {partition_index}")
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {partition_index} ON {partition} {COLUMNS}")
+            op.execute(f"ALTER INDEX {INDEX} ATTACH PARTITION {partition_index}")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes with it
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
@@ -0,0 +1,46 @@
+"""Unique (account_id, source_platform, external_order_id) index on orders
+
+Revision ID: 0046_orders_external_order
+Revises: 0045_ad_spend_campaign_day
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0046_orders_external_order'
+down_revision = '0045_ad_spend_campaign_day'
+branch_labels = None
+depends_on = None
+
+
+INDEX = "ix_orders_external_order"
+
+
+def upgrade() -> None:
+    # A sync racing another could store an order twice; keep the first copy
+    op.execute("""
+        DELETE FROM orders
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY account_id, source_platform, external_order_id
+                    ORDER BY created_at, id
+                ) AS position
+                FROM orders
+            ) ranked
+            WHERE position > 1
+        )
+    """)
+
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX} "
+            "ON orders (account_id, source_platform, external_order_id)"
+        )
+
+
+def downgrade() -> None:
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
@@ -0,0 +1,79 @@
+"""(account_id, platform, date) index on ad_spend
+
+Revision ID: 0047_ad_spend_platform_date
+Revises: 0046_orders_external_order
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from typing import Optional
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0047_ad_spend_platform_date'
+down_revision = '0046_orders_external_order'
+branch_labels = None
+depends_on = None
+
+
+INDEX = "ix_ad_spend_account_platform_date"
+COLUMNS = "(account_id, platform, date)"
+
+
+def _partitions() -> list:
+    """Partitions of ad_spend; empty when the table isn't partitioned (see 0021)."""
+    return op.get_bind().execute(
+        text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass('ad_spend')")
+    ).scalars().all()
+
+
+def _index_valid() -> Optional[bool]:
+    """None if the index doesn't exist yet, else whether Postgres considers it valid."""
+    return op.get_bind().execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index)"), {"index": INDEX}
+    ).scalar()
+
+
+def _attached_partitions() -> set:
+    """Partitions whose index is already attached to the parent index."""
+    return set(op.get_bind().execute(
+        text(
+            "SELECT i.indrelid::regclass::text FROM pg_inherits h "
+            "JOIN pg_index i ON i.indexrelid = h.inhrelid WHERE h.inhparent = to_regclass(:index)"
+        ),
+        {"index": INDEX},
+    ).scalars().all())
+
+
+def upgrade() -> None:
+    # As in 0045, an interrupted run is finished rather than skipped
+    valid = _index_valid()
+    if valid:
+        return
+
+    partitions = _partitions()
+    # Same build as 0045: concurrently per partition, attached to an ON ONLY parent
+    with op.get_context().autocommit_block():
+        if not partitions:
+            if valid is not None:
+                op.execute(f"DROP INDEX CONCURRENTLY {INDEX}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {INDEX} ON ad_spend {COLUMNS}")
+            return
+
+        if valid is None:
+            op.execute(f"CREATE INDEX {INDEX} ON ONLY ad_spend {COLUMNS}")
+        attached = _attached_partitions()
+        for partition in partitions:
+            if partition in attached:
+                continue
+            partition_index = f"{partition}_platform_date_idx"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {partition_index}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {partition_index} ON {partition} {COLUMNS}")
+            op.execute(f"ALTER INDEX {INDEX} ATTACH PARTITION {partition_index}")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes with it
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_account_user, get_db
 from app.models.integration import Integration
 from app.schemas.integrations import IntegrationItem
+from app.services.cache_service import cache
 
 router = APIRouter()
 
@@ -71,4 +72,5 @@ def disconnect(platform: str, db: Session = Depends(get_db), user=Depends(get_cu
     row.status = "disconnected"
     row.updated_at = datetime.utcnow()
     db.commit()
+    cache.invalidate_integrations()
     return {"status": "disconnected", "platform": platform}
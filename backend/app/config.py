@@ -1,22 +1,45 @@
+import re
+from functools import lru_cache
 from typing import Optional
 
-from pydantic import field_validator
-from pydantic_settings import BaseSettings
+from pydantic import SecretStr, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Comma-separated env lists, splitting and trimming in one pass
+_COMMA_SPLIT = re.compile(r"\s*,\s*")
 
 
 class Settings(BaseSettings):
+    # Read once at startup and never reassigned; names are matched exactly
+    model_config = SettingsConfigDict(frozen=True, case_sensitive=True)
+
     # Core app config - use str instead of AnyUrl to avoid SQLAlchemy issues
     DATABASE_URL: str
+    # Optional read replica for read-only endpoints; falls back to DATABASE_URL
+    DATABASE_READ_URL: Optional[str] = None
 
-    JWT_SECRET_KEY: str
+    # Connection pool (Postgres)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Server-side cap on any single statement from the app (migrations use their own engine)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
+    JWT_SECRET_KEY: SecretStr
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
 
+    # Migrations at startup: skip (run at build time), sync or async
+    MIGRATION_MODE: str = "skip"
+
+    # Worker threads for sync (def) endpoints; Starlette's default is 40
+    THREADPOOL_SIZE: int = 100
+
     # Redis cache (optional)
     REDIS_URL: Optional[str] = None
 
     # Stripe
-    STRIPE_SECRET_KEY: Optional[str] = None
+    STRIPE_SECRET_KEY: Optional[SecretStr] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
     STRIPE_PRICE_PRO: Optional[str] = None  # Price ID for Pro plan
     STRIPE_PRICE_ENTERPRISE: Optional[str] = None  # Price ID for Enterprise plan
@@ -38,22 +61,22 @@ class Settings(BaseSettings):
 
     # Integrations (all optional)
     FACEBOOK_CLIENT_ID: Optional[str] = None
-    FACEBOOK_CLIENT_SECRET: Optional[str] = None
+    FACEBOOK_CLIENT_SECRET: Optional[SecretStr] = None
 
     GOOGLE_ADS_CLIENT_ID: Optional[str] = None
-    GOOGLE_ADS_CLIENT_SECRET: Optional[str] = None
+    GOOGLE_ADS_CLIENT_SECRET: Optional[SecretStr] = None
 
     TIKTOK_CLIENT_ID: Optional[str] = None
-    TIKTOK_CLIENT_SECRET: Optional[str] = None
+    TIKTOK_CLIENT_SECRET: Optional[SecretStr] = None
 
     GITHUB_CLIENT_ID: Optional[str] = None
-    GITHUB_CLIENT_SECRET: Optional[str] = None
+    GITHUB_CLIENT_SECRET: Optional[SecretStr] = None
 
     APPLE_CLIENT_ID: Optional[str] = None
-    APPLE_CLIENT_SECRET: Optional[str] = None
+    APPLE_CLIENT_SECRET: Optional[SecretStr] = None
 
     SHOPIFY_CLIENT_ID: Optional[str] = None
-    SHOPIFY_CLIENT_SECRET: Optional[str] = None
+    SHOPIFY_CLIENT_SECRET: Optional[SecretStr] = None
 
     GA4_CLIENT_EMAIL: Optional[str] = None
     GA4_PRIVATE_KEY: Optional[str] = None
@@ -63,8 +86,14 @@ class Settings(BaseSettings):
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     def assemble_cors_origins(cls, v):
         if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",") if origin.strip()]
+            return [origin for origin in _COMMA_SPLIT.split(v.strip()) if origin]
         return v
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """The process-wide settings, read from the environment once."""
+    return Settings()
+
+
+settings = get_settings()
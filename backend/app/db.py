@@ -1,10 +1,120 @@
-from sqlalchemy import create_engine
+import secrets
+import threading
+import time
+import uuid
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from sqlalchemy import JSON, BigInteger, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.config import settings
 
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True, future=True)
+
+def _engine_options(url: str) -> dict:
+    """Pool settings for a database URL.
+
+    Connections are not pinged on checkout; recycling plus TCP keepalives keep
+    idle connections from going stale instead of a SELECT 1 per request.
+    Checkout is LIFO, so a small set of connections stays warm and the surplus
+    left over from a burst sits idle until it is recycled.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": False,
+        "pool_use_lifo": True,
+        # INSERT executemany is already batched into multi-row VALUES
+        # (insertmanyvalues); this batches UPDATE/DELETE executemany too
+        "executemany_mode": "values_plus_batch",
+        "connect_args": {
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 5,
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
+        },
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, future=True, **_engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Reads that tolerate replica lag (dashboards, listings) go here
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(settings.DATABASE_READ_URL, future=True, **_engine_options(settings.DATABASE_READ_URL))
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+
+
+def dispose_engines() -> None:
+    """Close pooled connections on shutdown instead of leaving them to time out server-side."""
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+
 Base = declarative_base()
+
+# Structured JSON columns: JSONB on Postgres, plain JSON elsewhere (SQLite in tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class Money(TypeDecorator):
+    """Decimal amounts stored as BIGINT hundred-thousandths (1e-5 units).
+
+    Fixed-width integers keep rows small and SUM() fast; values are scaled on
+    the way in and out, so the app keeps working with Decimals. Aggregates such
+    as func.sum() inherit the column type and are scaled back too.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    SCALE = Decimal(100000)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * self.SCALE).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value) / self.SCALE
+
+
+# Last (millisecond, counter) handed out by new_id()
+_id_clock = [0, 0]
+_id_lock = threading.Lock()
+
+
+def new_id() -> str:
+    """Time-ordered UUIDv7 string for primary keys.
+
+    Random v4 ids scatter inserts across the primary key index; a v7 id starts
+    with its creation time in milliseconds, so new rows land at the right edge.
+    Within a millisecond the 12-bit rand_a field counts up (RFC 9562, method 1),
+    so ids from one process are strictly increasing. Same 36-char text as v4.
+    """
+    with _id_lock:
+        now_ms = time.time_ns() // 1_000_000
+        last_ms, counter = _id_clock
+        if now_ms > last_ms:
+            # Random start, leaving half the counter space for this millisecond
+            last_ms, counter = now_ms, secrets.randbits(11)
+        elif counter < 0xFFF:
+            counter += 1
+        else:
+            # Counter exhausted (or the clock went back): borrow the next millisecond
+            last_ms, counter = last_ms + 1, 0
+        _id_clock[:] = [last_ms, counter]
+
+    value = (last_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+    return str(uuid.UUID(int=value))
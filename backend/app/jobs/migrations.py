@@ -0,0 +1,64 @@
+"""
+Optional database migrations at application startup.
+
+MIGRATION_MODE controls what happens when the API starts:
+- skip (default): migrations run at build time (`alembic upgrade head`)
+- sync: run `alembic upgrade head` before serving requests
+- async: run it in a background thread and start serving immediately
+
+Concurrent runners are serialized by the advisory lock taken in alembic/env.py.
+While another runner holds it the state is "waiting", and the upgrade is retried
+until this process gets the lock and has seen the database reach head.
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Surfaced by the health endpoints
+MIGRATION_STATUS = {"state": "skipped", "error": None}
+
+# How often to retry while another runner holds the migration lock
+MIGRATION_LOCK_RETRY_SECONDS = 5
+
+
+def run_migrations():
+    """Upgrade the database to head, recording progress in MIGRATION_STATUS."""
+    MIGRATION_STATUS.update(state="running", error=None)
+    try:
+        config = Config(str(ALEMBIC_INI))
+        config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+        # Keep the app's logging configuration
+        config.attributes["configure_logger"] = False
+        while True:
+            config.attributes["migrations_skipped"] = False
+            command.upgrade(config, "head")
+            if not config.attributes["migrations_skipped"]:
+                break
+            # Another instance is changing the schema; not ready until it's at head
+            MIGRATION_STATUS["state"] = "waiting"
+            time.sleep(MIGRATION_LOCK_RETRY_SECONDS)
+        MIGRATION_STATUS["state"] = "succeeded"
+        logger.info("Database migrations complete")
+    except Exception as e:
+        MIGRATION_STATUS.update(state="failed", error=str(e))
+        logger.error(f"Database migrations failed: {e}")
+
+
+def start_migrations(mode: str):
+    """Run migrations according to MIGRATION_MODE (sync, async or skip)."""
+    mode = mode.lower()
+    if mode == "sync":
+        run_migrations()
+    elif mode == "async":
+        MIGRATION_STATUS.update(state="pending", error=None)
+        threading.Thread(target=run_migrations, name="alembic-upgrade", daemon=True).start()
+    elif mode != "skip":
+        logger.warning(f"Unknown MIGRATION_MODE '{mode}', skipping migrations")
@@ -2,25 +2,46 @@
 APScheduler-based background job scheduler.
 Handles periodic data sync from connected integrations.
 """
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 scheduler: Optional[AsyncIOScheduler] = None
 
+# Threads for jobs that only do blocking database work
+DB_JOB_THREADS = 4
+
+# Token refreshes in flight at once during the daily cleanup; bounded for provider rate limits
+TOKEN_REFRESH_CONCURRENCY = 10
+
 
 def create_scheduler() -> AsyncIOScheduler:
     """Create and configure the job scheduler."""
+    from app.db import engine
+    
+    # Jobs live in the database (through the app's pooled engine) so they
+    # survive restarts; due jobs are picked via the indexed next_run_time column
     jobstores = {
-        "default": MemoryJobStore(),
+        "default": SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs"),
+    }
+    
+    # Coroutine jobs (the platform syncs) run on the event loop; jobs that are
+    # plain database work go to a thread pool so their blocking queries and
+    # commits don't stall the loop
+    executors = {
+        "default": AsyncIOExecutor(),
+        "threadpool": ThreadPoolExecutor(max_workers=DB_JOB_THREADS),
     }
     
     job_defaults = {
@@ -31,6 +52,7 @@ def create_scheduler() -> AsyncIOScheduler:
     
     return AsyncIOScheduler(
         jobstores=jobstores,
+        executors=executors,
         job_defaults=job_defaults,
         timezone="UTC",
     )
@@ -51,6 +73,7 @@ def start_scheduler():
         sync_all_integrations,
         check_pending_scheduled_reports,
         check_trial_expirations,
+        create_upcoming_partitions,
     )
     
     # Sync all integrations every hour
@@ -68,6 +91,7 @@ def start_scheduler():
         trigger=IntervalTrigger(minutes=15),
         id="check_scheduled_reports",
         name="Check Scheduled Reports",
+        executor="threadpool",
         replace_existing=True,
     )
     
@@ -77,6 +101,7 @@ def start_scheduler():
         trigger=IntervalTrigger(hours=1),
         id="check_trial_expirations",
         name="Check Trial Expirations",
+        executor="threadpool",
         replace_existing=True,
     )
     
@@ -89,6 +114,16 @@ def start_scheduler():
         replace_existing=True,
     )
     
+    # Create next months' time-series partitions on the 1st of each month
+    scheduler.add_job(
+        create_upcoming_partitions,
+        trigger=CronTrigger(day=1, hour=2, minute=0),
+        id="create_upcoming_partitions",
+        name="Create Upcoming Partitions",
+        executor="threadpool",
+        replace_existing=True,
+    )
+    
     scheduler.start()
     logger.info("Background job scheduler started with %d jobs", len(scheduler.get_jobs()))
 
@@ -105,47 +140,82 @@ def shutdown_scheduler():
 
 async def _daily_cleanup():
     """Daily maintenance tasks: clean old data, refresh stale tokens, etc."""
-    logger.info("Running daily cleanup at %s", datetime.utcnow().isoformat())
+    logger.info("Running daily cleanup at %s", datetime.now(timezone.utc).isoformat())
     
     # Import here to avoid circular imports
+    from sqlalchemy import select, update
     from app.db import SessionLocal
     from app.models.integration import Integration
     from app.services.integrations_service import refresh_access_token
     
+    semaphore = asyncio.Semaphore(TOKEN_REFRESH_CONCURRENCY)
+    
+    async def bounded_refresh(integration) -> dict:
+        async with semaphore:
+            return await refresh_access_token(
+                platform=integration.platform,
+                refresh_token=integration.refresh_token,
+            )
+    
     db = SessionLocal()
+    # Refreshed tokens are committed through a second session: committing on
+    # the reading session would close its streaming cursor
+    writer = SessionLocal()
     try:
-        # Find integrations with tokens expiring in the next 24 hours
-        expiring_soon = db.query(Integration).filter(
-            Integration.status == "connected",
-            Integration.refresh_token.isnot(None),
-            Integration.token_expires_at.isnot(None),
-            Integration.token_expires_at < datetime.utcnow() + timedelta(hours=24),
-        ).all()
+        # Find integrations with tokens expiring in the next 24 hours, streamed
+        # in batches as plain rows of the columns the refresh needs
+        expiring_soon = db.execute(
+            select(Integration.id, Integration.platform, Integration.account_id, Integration.refresh_token)
+            .where(
+                Integration.status == "connected",
+                Integration.refresh_token.isnot(None),
+                Integration.token_expires_at.isnot(None),
+                Integration.token_expires_at < datetime.now(timezone.utc) + timedelta(hours=24),
+            )
+            .execution_options(yield_per=200)
+        )
         
-        for integration in expiring_soon:
-            try:
-                logger.info(f"Refreshing expiring token for {integration.platform} (account {integration.account_id})")
-                token_data = await refresh_access_token(
-                    platform=integration.platform,
-                    refresh_token=integration.refresh_token,
-                )
-                
-                integration.access_token = token_data.get("access_token")
-                if token_data.get("refresh_token"):
-                    integration.refresh_token = token_data["refresh_token"]
+        # Each batch is refreshed concurrently and its new tokens saved in one commit
+        for batch in expiring_soon.partitions():
+            logger.info(f"Refreshing {len(batch)} expiring tokens")
+            results = await asyncio.gather(
+                *(bounded_refresh(integration) for integration in batch),
+                return_exceptions=True,
+            )
+            
+            now = datetime.now(timezone.utc)
+            updates = []
+            for integration, token_data in zip(batch, results):
+                if isinstance(token_data, Exception):
+                    logger.error(
+                        f"Failed to refresh token for {integration.platform} (account {integration.account_id}): {token_data}"
+                    )
+                    continue
                 
                 expires_in = token_data.get("expires_in", 3600)
-                integration.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
-                integration.updated_at = datetime.utcnow()
-                
-                db.commit()
-                logger.info(f"Successfully refreshed token for {integration.platform}")
-                
+                values = {
+                    "id": integration.id,
+                    "access_token": token_data.get("access_token"),
+                    "token_expires_at": now + timedelta(seconds=expires_in),
+                    "updated_at": now,
+                }
+                if token_data.get("refresh_token"):
+                    values["refresh_token"] = token_data["refresh_token"]
+                updates.append(values)
+            
+            if not updates:
+                continue
+            try:
+                # Bulk UPDATE by primary key, one executemany per set of columns
+                writer.execute(update(Integration), updates)
+                writer.commit()
+                logger.info(f"Successfully refreshed {len(updates)} tokens")
             except Exception as e:
-                logger.error(f"Failed to refresh token for {integration.platform}: {e}")
-                db.rollback()
+                logger.error(f"Failed to save refreshed tokens: {e}")
+                writer.rollback()
                 
     finally:
+        writer.close()
         db.close()
 
 
@@ -164,7 +234,3 @@ def get_job_status() -> list[dict]:
         })
     
     return jobs
-
-
-# Need to import timedelta
-from datetime import timedelta
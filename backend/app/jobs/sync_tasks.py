@@ -2,74 +2,163 @@
 Data sync tasks for pulling data from connected platforms.
 These tasks run in the background via APScheduler.
 """
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, List
 import httpx
+import orjson
 
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
+from app.partitions import add_months
 from app.models.integration import Integration
 from app.models.ad_spend import AdSpend
 from app.models.order import Order
 from app.models.daily_metrics import DailyMetrics
 from app.config import settings
+from app.services.cache_service import ACTIVE_INTEGRATIONS_KEY, CACHE_TTL, cache
 
 logger = logging.getLogger(__name__)
 
 
+# Integrations synced at the same time; each hits a different account's API quota
+SYNC_CONCURRENCY = 8
+# Ad accounts of one Facebook integration synced at the same time; they share a token's rate limit
+FACEBOOK_ACCOUNT_CONCURRENCY = 5
+
+FACEBOOK_GRAPH_URL = "https://graph.facebook.com/v18.0"
+# Insights are requested as async report runs, polled until Facebook has built them
+FACEBOOK_REPORT_POLL_SECONDS = 2
+FACEBOOK_REPORT_TIMEOUT_SECONDS = 10 * 60
+FACEBOOK_REPORT_PAGE_SIZE = 500
+# A new ad account is backfilled this far; after that only days that may still
+# change are re-read. config_json maps each ad account to the last day synced.
+FACEBOOK_BACKFILL_DAYS = 30
+FACEBOOK_RESYNC_DAYS = 2
+FACEBOOK_CURSOR_KEY = "insights_synced_through"
+
+SHOPIFY_PAGE_SIZE = 250
+# config_json key holding the newest order updated_at seen, where the next sync resumes
+SHOPIFY_CURSOR_KEY = "orders_updated_at_min"
+
+# One pooled client for every platform call, so syncs reuse TLS connections
+# (multiplexed over HTTP/2 where the platform supports it) instead of
+# handshaking per sync. Created lazily: an AsyncClient belongs to the event
+# loop it was first used on. Failed connection attempts are retried; requests
+# that reached the platform are not. Response bodies are parsed with orjson
+# straight from bytes, since insights and order pages can be large.
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_CONNECT_RETRIES = 2
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client for platform API calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES),
+            timeout=HTTP_TIMEOUT,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared client's pooled connections on shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def sync_all_integrations():
     """
     Master sync job that triggers sync for all connected integrations.
     Called periodically by the scheduler.
+    
+    Integrations sync concurrently (up to SYNC_CONCURRENCY at a time), each in
+    its own session, so one slow platform doesn't hold up the others.
     """
     logger.info("Starting sync for all integrations")
     
+    integrations = _get_active_integrations()
+    
+    logger.info(f"Found {len(integrations)} active integrations to sync")
+    
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+    
+    async def bounded_sync(integration_id: str):
+        async with semaphore:
+            await sync_integration(integration_id)
+    
+    results = await asyncio.gather(
+        *(bounded_sync(integration["id"]) for integration in integrations),
+        return_exceptions=True,
+    )
+    for integration, result in zip(integrations, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error syncing {integration['platform']} for account {integration['account_id']}: {result}")
+    
+    logger.info("Completed sync for all integrations")
+
+
+def _get_active_integrations() -> List[dict]:
+    """Connected integrations (id, platform, account_id), shared through the cache when Redis is configured."""
+    integrations = cache.get(ACTIVE_INTEGRATIONS_KEY)
+    if integrations is not None:
+        return integrations
+    
     db = SessionLocal()
     try:
-        # Get all active integrations
-        integrations = db.query(Integration).filter(
-            Integration.status == "connected",
-            Integration.access_token.isnot(None),
-        ).all()
-        
-        logger.info(f"Found {len(integrations)} active integrations to sync")
-        
-        for integration in integrations:
-            try:
-                await sync_integration(db, integration)
-            except Exception as e:
-                logger.error(f"Error syncing {integration.platform} for account {integration.account_id}: {e}")
-                
+        integrations = [
+            row._asdict()
+            for row in db.execute(
+                select(Integration.id, Integration.platform, Integration.account_id).where(
+                    Integration.status == "connected",
+                    Integration.access_token.isnot(None),
+                )
+            )
+        ]
     finally:
         db.close()
     
-    logger.info("Completed sync for all integrations")
+    cache.set(ACTIVE_INTEGRATIONS_KEY, integrations, CACHE_TTL["integrations"])
+    return integrations
 
 
-async def sync_integration(db: Session, integration: Integration):
-    """Sync data for a single integration."""
-    platform = integration.platform
-    
-    if platform == "facebook":
-        await sync_facebook_ads(db, integration)
-    elif platform == "google_ads":
-        await sync_google_ads(db, integration)
-    elif platform == "tiktok":
-        await sync_tiktok_ads(db, integration)
-    elif platform == "shopify":
-        await sync_shopify_orders(db, integration)
-    elif platform == "ga4":
-        await sync_ga4_metrics(db, integration)
-    else:
-        logger.warning(f"Unknown platform: {platform}")
+async def sync_integration(integration_id: str):
+    """Sync data for a single integration, in a session of its own."""
+    db = SessionLocal()
+    try:
+        integration = db.get(Integration, integration_id)
+        if integration is None:
+            logger.warning(f"Integration {integration_id} no longer exists")
+            return
+        
+        sync = _SYNC_DISPATCH.get(integration.platform)
+        if sync is None:
+            logger.warning(f"Unknown platform: {integration.platform}")
+            return
+        
+        await sync(db, integration)
+    finally:
+        db.close()
 
 
-async def sync_facebook_ads(db: Session, integration: Integration):
+async def sync_facebook_ads(db: Session, integration: Integration, client: Optional[httpx.AsyncClient] = None):
     """
     Sync Facebook Ads data (campaigns, ad sets, spend).
     Uses the Facebook Marketing API.
+    
+    Each ad account is read from the day it was last synced (at most
+    FACEBOOK_RESYNC_DAYS back), or FACEBOOK_BACKFILL_DAYS back the first time.
     """
     logger.info(f"Syncing Facebook Ads for account {integration.account_id}")
     
@@ -78,112 +167,213 @@ async def sync_facebook_ads(db: Session, integration: Integration):
         logger.warning("No access token for Facebook integration")
         return
     
-    # Get ad accounts
-    async with httpx.AsyncClient() as client:
-        try:
-            # Get user's ad accounts
-            accounts_response = await client.get(
-                "https://graph.facebook.com/v18.0/me/adaccounts",
-                params={
-                    "access_token": access_token,
-                    "fields": "id,name,account_status",
-                }
+    account_id = integration.account_id
+    config = integration.config_json if isinstance(integration.config_json, dict) else {}
+    # Report runs can be polled for minutes; end the read transaction so the
+    # session doesn't hold a pooled connection meanwhile
+    db.commit()
+    
+    client = client or get_http_client()
+    
+    try:
+        # Get user's ad accounts
+        accounts_response = await client.get(
+            f"{FACEBOOK_GRAPH_URL}/me/adaccounts",
+            params={
+                "access_token": access_token,
+                "fields": "id,name,account_status",
+            }
+        )
+        
+        if accounts_response.status_code != 200:
+            logger.error(f"Failed to fetch Facebook ad accounts: {accounts_response.text}")
+            return
+        
+        ad_accounts = orjson.loads(accounts_response.content).get("data", [])
+        
+    except Exception as e:
+        logger.error(f"Facebook sync error: {e}")
+        raise
+    
+    synced_through = dict(config.get(FACEBOOK_CURSOR_KEY) or {})
+    today = datetime.utcnow().date()
+    
+    def start_date_for(ad_account: dict) -> date:
+        last_synced = synced_through.get(ad_account["id"])
+        if not last_synced:
+            return today - timedelta(days=FACEBOOK_BACKFILL_DAYS)
+        start = min(date.fromisoformat(last_synced), today - timedelta(days=FACEBOOK_RESYNC_DAYS))
+        return max(start, today - timedelta(days=FACEBOOK_BACKFILL_DAYS))
+    
+    # Insights requests dominate the sync, so ad accounts are fetched concurrently
+    semaphore = asyncio.Semaphore(FACEBOOK_ACCOUNT_CONCURRENCY)
+    
+    async def bounded_sync(ad_account: dict) -> bool:
+        async with semaphore:
+            return await _sync_facebook_ad_account(
+                client, account_id, ad_account, access_token,
+                start_date=start_date_for(ad_account), end_date=today,
             )
-            
-            if accounts_response.status_code != 200:
-                logger.error(f"Failed to fetch Facebook ad accounts: {accounts_response.text}")
-                return
-            
-            ad_accounts = accounts_response.json().get("data", [])
-            
-            for ad_account in ad_accounts:
-                await _sync_facebook_ad_account(db, client, integration, ad_account, access_token)
-                
-        except Exception as e:
-            logger.error(f"Facebook sync error: {e}")
-            raise
+    
+    results = await asyncio.gather(
+        *(bounded_sync(ad_account) for ad_account in ad_accounts),
+        return_exceptions=True,
+    )
+    for ad_account, result in zip(ad_accounts, results):
+        if isinstance(result, Exception):
+            logger.error(f"Facebook sync error for ad account {ad_account.get('id')}: {result}")
+        elif result:
+            synced_through[ad_account["id"]] = today.isoformat()
+    
+    # Written once here rather than by each account's task, which would race on the
+    # column; merged into the current config in case it changed during the sync
+    current = integration.config_json if isinstance(integration.config_json, dict) else {}
+    integration.config_json = {**current, FACEBOOK_CURSOR_KEY: synced_through}
+    db.commit()
 
 
 async def _sync_facebook_ad_account(
-    db: Session,
     client: httpx.AsyncClient,
-    integration: Integration,
+    account_id: str,
     ad_account: dict,
     access_token: str,
-):
-    """Sync campaigns and spend for a single Facebook ad account."""
-    account_id = ad_account["id"]
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> bool:
+    """
+    Sync campaigns and spend for a single Facebook ad account of account_id.
+    Defaults to the last FACEBOOK_BACKFILL_DAYS; returns whether the range was stored.
+    The rows are written through a session of their own, opened once the report is in.
+    """
+    ad_account_id = ad_account["id"]
     
-    # Date range: last 30 days
-    end_date = datetime.utcnow().date()
-    start_date = end_date - timedelta(days=30)
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=FACEBOOK_BACKFILL_DAYS)
     
     # Fetch insights (aggregated metrics)
-    insights_response = await client.get(
-        f"https://graph.facebook.com/v18.0/{account_id}/insights",
-        params={
+    insights = await _fetch_facebook_insights(
+        client,
+        ad_account_id,
+        {
             "access_token": access_token,
             "fields": "campaign_id,campaign_name,spend,impressions,clicks,actions,date_start,date_stop",
             "level": "campaign",
             "time_range": f'{{"since":"{start_date}","until":"{end_date}"}}',
             "time_increment": 1,  # Daily breakdown
-        }
+        },
     )
+    if insights is None:
+        return False
     
-    if insights_response.status_code != 200:
-        logger.error(f"Failed to fetch Facebook insights: {insights_response.text}")
-        return
-    
-    insights = insights_response.json().get("data", [])
-    
+    rows = []
     for insight in insights:
         try:
-            spend = float(insight.get("spend", 0))
-            impressions = int(insight.get("impressions", 0))
-            clicks = int(insight.get("clicks", 0))
-            
             # Parse conversions from actions
             conversions = 0
-            conversion_value = 0.0
             for action in insight.get("actions", []):
                 if action.get("action_type") == "purchase":
                     conversions += int(action.get("value", 0))
-                if action.get("action_type") == "omni_purchase":
-                    conversion_value += float(action.get("value", 0))
-            
-            date = datetime.strptime(insight["date_start"], "%Y-%m-%d").date()
-            
-            # Upsert ad spend record
-            ad_spend = db.query(AdSpend).filter(
-                AdSpend.account_id == integration.account_id,
-                AdSpend.platform == "facebook",
-                AdSpend.campaign_id == insight.get("campaign_id"),
-                AdSpend.date == date,
-            ).first()
-            
-            if not ad_spend:
-                ad_spend = AdSpend(
-                    account_id=integration.account_id,
-                    platform="facebook",
-                    campaign_id=insight.get("campaign_id"),
-                    campaign_name=insight.get("campaign_name"),
-                    date=date,
-                )
-                db.add(ad_spend)
-            
-            ad_spend.spend = spend
-            ad_spend.impressions = impressions
-            ad_spend.clicks = clicks
-            ad_spend.conversions = conversions
-            ad_spend.conversion_value = conversion_value
-            
-            db.commit()
             
+            rows.append({
+                "account_id": account_id,
+                "platform": "facebook",
+                "external_account_id": ad_account_id,
+                "external_campaign_id": insight.get("campaign_id"),
+                "campaign_name": insight.get("campaign_name"),
+                "date": date.fromisoformat(insight["date_start"]),
+                "cost": float(insight.get("spend", 0)),
+                "impressions": int(insight.get("impressions", 0)),
+                "clicks": int(insight.get("clicks", 0)),
+                "conversions": conversions,
+            })
         except Exception as e:
             logger.error(f"Error processing Facebook insight: {e}")
-            db.rollback()
     
-    logger.info(f"Synced {len(insights)} Facebook insights for account {integration.account_id}")
+    db = SessionLocal()
+    try:
+        _upsert_ad_spend(db, rows)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error saving Facebook insights: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+    
+    logger.info(f"Synced {len(rows)} Facebook insights for account {account_id}")
+    return True
+
+
+async def _fetch_facebook_insights(client: httpx.AsyncClient, account_id: str, params: dict) -> Optional[List[dict]]:
+    """
+    Run an insights query as an async report job and collect every result page.
+    A synchronous insights GET holds the request open while Facebook builds the
+    whole report (and times out on large accounts); a report run is built in the
+    background and its results are read back page by page.
+    Returns None, after logging, if the job can't be started or doesn't finish.
+    """
+    access_token = params["access_token"]
+    
+    job_response = await client.post(f"{FACEBOOK_GRAPH_URL}/{account_id}/insights", params=params)
+    if job_response.status_code != 200:
+        logger.error(f"Failed to start Facebook insights job: {job_response.text}")
+        return None
+    report_run_id = orjson.loads(job_response.content)["report_run_id"]
+    
+    waited = 0.0
+    while True:
+        status_response = await client.get(
+            f"{FACEBOOK_GRAPH_URL}/{report_run_id}",
+            params={"access_token": access_token, "fields": "async_status,async_percent_completion"},
+        )
+        if status_response.status_code != 200:
+            logger.error(f"Failed to poll Facebook insights job {report_run_id}: {status_response.text}")
+            return None
+        job_status = orjson.loads(status_response.content).get("async_status")
+        if job_status == "Job Completed":
+            break
+        if job_status in ("Job Failed", "Job Skipped") or waited >= FACEBOOK_REPORT_TIMEOUT_SECONDS:
+            logger.error(f"Facebook insights job {report_run_id} for {account_id} did not complete: {job_status}")
+            return None
+        await asyncio.sleep(FACEBOOK_REPORT_POLL_SECONDS)
+        waited += FACEBOOK_REPORT_POLL_SECONDS
+    
+    insights: List[dict] = []
+    url: Optional[str] = f"{FACEBOOK_GRAPH_URL}/{report_run_id}/insights"
+    page_params: Optional[dict] = {"access_token": access_token, "limit": FACEBOOK_REPORT_PAGE_SIZE}
+    while url:
+        page_response = await client.get(url, params=page_params)
+        if page_response.status_code != 200:
+            logger.error(f"Failed to fetch Facebook insights: {page_response.text}")
+            return None
+        page = orjson.loads(page_response.content)
+        insights.extend(page.get("data", []))
+        # The next link already carries the token and cursor
+        url = page.get("paging", {}).get("next")
+        page_params = None
+    
+    return insights
+
+
+def _upsert_ad_spend(db: Session, rows: List[dict]) -> None:
+    """
+    Insert or update daily campaign spend rows in one statement.
+    Rows are keyed by (account_id, platform, external_campaign_id, date),
+    the unique ix_ad_spend_campaign_day index; the caller commits.
+    """
+    if not rows:
+        return
+    
+    insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(AdSpend)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AdSpend.account_id, AdSpend.platform, AdSpend.external_campaign_id, AdSpend.date],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("external_account_id", "campaign_name", "cost", "impressions", "clicks", "conversions")
+        },
+    )
+    db.execute(stmt, rows)
 
 
 async def sync_google_ads(db: Session, integration: Integration):
@@ -207,7 +397,7 @@ async def sync_google_ads(db: Session, integration: Integration):
     db.commit()
 
 
-async def sync_tiktok_ads(db: Session, integration: Integration):
+async def sync_tiktok_ads(db: Session, integration: Integration, client: Optional[httpx.AsyncClient] = None):
     """
     Sync TikTok Ads data.
     Uses the TikTok Marketing API.
@@ -219,92 +409,117 @@ async def sync_tiktok_ads(db: Session, integration: Integration):
         logger.warning("No access token for TikTok integration")
         return
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # Get advertiser info
-            response = await client.get(
-                "https://business-api.tiktok.com/open_api/v1.3/advertiser/info/",
-                headers={
-                    "Access-Token": access_token,
-                },
-                params={
-                    "advertiser_ids": [],  # Would need to be populated from OAuth data
-                }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"TikTok API error: {response.text}")
-                return
-                
-            # Process response and store data
-            # This is a placeholder - actual implementation depends on TikTok API structure
+    client = client or get_http_client()
+    
+    try:
+        # Get advertiser info
+        response = await client.get(
+            "https://business-api.tiktok.com/open_api/v1.3/advertiser/info/",
+            headers={
+                "Access-Token": access_token,
+            },
+            params={
+                "advertiser_ids": [],  # Would need to be populated from OAuth data
+            }
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"TikTok API error: {response.text}")
+            return
             
-        except Exception as e:
-            logger.error(f"TikTok sync error: {e}")
+        # Process response and store data
+        # This is a placeholder - actual implementation depends on TikTok API structure
+        
+    except Exception as e:
+        logger.error(f"TikTok sync error: {e}")
     
     integration.updated_at = datetime.utcnow()
     db.commit()
 
 
-async def sync_shopify_orders(db: Session, integration: Integration):
+async def sync_shopify_orders(db: Session, integration: Integration, client: Optional[httpx.AsyncClient] = None):
     """
     Sync Shopify orders.
     Uses the Shopify Admin API.
+    
+    Pages are followed through the Link header and upserted one at a time. The
+    newest updated_at seen is kept in config_json, so the next run only asks
+    for orders changed since then instead of re-reading the last 30 days; an
+    order that comes back (refunded, cancelled, edited) overwrites its row.
     """
     logger.info(f"Syncing Shopify orders for account {integration.account_id}")
     
     access_token = integration.access_token
-    shop_domain = integration.config_json  # Store shop domain in config
+    # config_json holds {"shop_domain": ...}, or just the domain on older rows
+    config = integration.config_json or {}
+    if not isinstance(config, dict):
+        config = {"shop_domain": config}
+    shop_domain = config.get("shop_domain")
     
     if not access_token or not shop_domain:
         logger.warning("Missing Shopify credentials")
         return
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # Fetch recent orders
+    client = client or get_http_client()
+    
+    params = {"status": "any", "limit": SHOPIFY_PAGE_SIZE}
+    last_updated_at = config.get(SHOPIFY_CURSOR_KEY)
+    if last_updated_at:
+        params["updated_at_min"] = last_updated_at
+    else:
+        params["created_at_min"] = (datetime.utcnow() - timedelta(days=30)).isoformat()
+    
+    url: Optional[str] = f"https://{shop_domain}/admin/api/2024-01/orders.json"
+    newest: Optional[datetime] = datetime.fromisoformat(last_updated_at) if last_updated_at else None
+    fetched = stored = 0
+    
+    try:
+        while url:
             response = await client.get(
-                f"https://{shop_domain}/admin/api/2024-01/orders.json",
+                url,
                 headers={
                     "X-Shopify-Access-Token": access_token,
                 },
-                params={
-                    "status": "any",
-                    "created_at_min": (datetime.utcnow() - timedelta(days=30)).isoformat(),
-                    "limit": 250,
-                }
+                params=params,
             )
             
             if response.status_code != 200:
                 logger.error(f"Shopify API error: {response.text}")
                 return
             
-            orders_data = response.json().get("orders", [])
+            orders_data = orjson.loads(response.content).get("orders", [])
+            fetched += len(orders_data)
             
+            # Keyed by order id: one statement can't upsert the same row twice
+            rows = {}
             for order_data in orders_data:
-                _process_shopify_order(db, integration.account_id, order_data)
-                
+                row = _process_shopify_order(integration.account_id, order_data)
+                rows[row["external_order_id"]] = row
+                if order_data.get("updated_at"):
+                    updated_at = datetime.fromisoformat(order_data["updated_at"])
+                    if newest is None or updated_at > newest:
+                        newest = updated_at
+            
+            stored += _upsert_orders(db, list(rows.values()))
             db.commit()
-            logger.info(f"Synced {len(orders_data)} Shopify orders")
             
-        except Exception as e:
-            logger.error(f"Shopify sync error: {e}")
-            db.rollback()
+            # The next link carries its own page_info cursor; filters may not be repeated
+            url = response.links.get("next", {}).get("url")
+            params = None
+        
+        # Only advanced once every page is in, so an interrupted run is retried in full
+        if newest is not None:
+            integration.config_json = {**config, SHOPIFY_CURSOR_KEY: newest.isoformat()}
+            db.commit()
+        logger.info(f"Synced {fetched} Shopify orders ({stored} stored)")
+        
+    except Exception as e:
+        logger.error(f"Shopify sync error: {e}")
+        db.rollback()
 
 
-def _process_shopify_order(db: Session, account_id: str, order_data: dict):
-    """Process and store a single Shopify order."""
-    order_id = str(order_data["id"])
-    
-    # Check if order exists
-    existing = db.query(Order).filter(
-        Order.account_id == account_id,
-        Order.source_order_id == order_id,
-    ).first()
-    
-    if existing:
-        return  # Skip existing orders
-    
+def _process_shopify_order(account_id: str, order_data: dict) -> dict:
+    """Build the orders row for a Shopify order."""
     # Parse attribution from order attributes/notes
     utm_source = None
     utm_campaign = None
@@ -314,27 +529,41 @@ def _process_shopify_order(db: Session, account_id: str, order_data: dict):
         if attr.get("name") == "utm_campaign":
             utm_campaign = attr.get("value")
     
-    # Create order record
-    order = Order(
-        account_id=account_id,
-        source_order_id=order_id,
-        order_number=order_data.get("order_number"),
-        platform="shopify",
-        status=order_data.get("financial_status", "unknown"),
-        total_price=float(order_data.get("total_price", 0)),
-        subtotal=float(order_data.get("subtotal_price", 0)),
-        tax=float(order_data.get("total_tax", 0)),
-        shipping=float(order_data.get("total_shipping_price_set", {}).get("shop_money", {}).get("amount", 0)),
-        discount=float(order_data.get("total_discounts", 0)),
-        currency=order_data.get("currency", "USD"),
-        customer_email=order_data.get("email"),
-        utm_source=utm_source,
-        utm_campaign=utm_campaign,
-        attributed_channel=utm_source or "direct",
-        order_date=datetime.fromisoformat(order_data["created_at"].replace("Z", "+00:00")),
-    )
+    return {
+        "account_id": account_id,
+        "source_platform": "shopify",
+        "external_order_id": str(order_data["id"]),
+        # fromisoformat reads Shopify's "Z" suffix directly on Python 3.11+
+        "date_time": datetime.fromisoformat(order_data["created_at"]),
+        # current_total_price reflects edits and refunds; total_price is the original
+        "total_amount": float(order_data.get("current_total_price", order_data.get("total_price", 0))),
+        "currency": order_data.get("currency", "USD"),
+        "utm_source": utm_source,
+        "utm_campaign": utm_campaign,
+    }
+
+
+def _upsert_orders(db: Session, rows: List[dict]) -> int:
+    """
+    Insert or update orders in one statement.
+    Orders are keyed by (account_id, source_platform, external_order_id), the
+    unique ix_orders_external_order index; an order already stored takes the
+    new amount and attribution. Returns how many rows were written.
+    The caller commits.
+    """
+    if not rows:
+        return 0
     
-    db.add(order)
+    insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Order).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Order.account_id, Order.source_platform, Order.external_order_id],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("date_time", "total_amount", "currency", "utm_source", "utm_campaign")
+        },
+    )
+    return db.execute(stmt).rowcount
 
 
 async def sync_ga4_metrics(db: Session, integration: Integration):
@@ -349,7 +578,17 @@ async def sync_ga4_metrics(db: Session, integration: Integration):
     db.commit()
 
 
-async def check_pending_scheduled_reports():
+# Sync job per platform; a new platform is supported by adding its entry here
+_SYNC_DISPATCH = {
+    "facebook": sync_facebook_ads,
+    "google_ads": sync_google_ads,
+    "tiktok": sync_tiktok_ads,
+    "shopify": sync_shopify_orders,
+    "ga4": sync_ga4_metrics,
+}
+
+
+def check_pending_scheduled_reports():
     """
     Check for scheduled reports that need to be sent.
     Called periodically by the scheduler.
@@ -377,7 +616,7 @@ async def check_pending_scheduled_reports():
         db.close()
 
 
-async def check_trial_expirations():
+def check_trial_expirations():
     """
     Check for expired trials and fire trial_expired events.
     Called periodically by the scheduler.
@@ -435,3 +674,88 @@ async def check_trial_expirations():
         logger.error(f"Error in check_trial_expirations: {e}")
     finally:
         db.close()
+
+
+# Tables range-partitioned by month on Postgres, with their partition column
+# (see migrations 0021_partition_time_series and 0028_partition_audit_logs)
+PARTITIONED_TABLES = {
+    "ad_spend": "date",
+    "daily_metrics": "date",
+    "audit_logs": "created_at",
+}
+PARTITION_MONTHS_AHEAD = 3
+# Storage parameters can't be set on a partitioned parent, only on each partition
+PARTITION_FILLFACTOR = {"daily_metrics": 90}
+
+
+def create_upcoming_partitions():
+    """
+    Make sure monthly partitions exist for the next few months.
+    Called monthly by the scheduler; a no-op on databases without partitioning.
+    
+    Each partition is created in a transaction of its own, so one that fails
+    (a lock timeout, say) doesn't undo the others.
+    """
+    db = SessionLocal()
+    try:
+        if db.bind.dialect.name != "postgresql":
+            return
+        
+        current = datetime.utcnow().date().replace(day=1)
+        for table, column in PARTITIONED_TABLES.items():
+            is_partitioned = db.execute(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+                {"table": table},
+            ).scalar()
+            if not is_partitioned:
+                continue
+            
+            for offset in range(PARTITION_MONTHS_AHEAD + 1):
+                start = add_months(current, offset)
+                try:
+                    _create_month_partition(db, table, column, start)
+                    db.commit()
+                except Exception:
+                    logger.exception(f"Error creating {table} partition for {start:%Y-%m}")
+                    db.rollback()
+        
+        logger.info("Ensured monthly partitions for %s", ", ".join(PARTITIONED_TABLES))
+    finally:
+        db.close()
+
+
+def _create_month_partition(db: Session, table: str, column: str, start: date) -> None:
+    """
+    Create the partition of table for the month starting at start, if missing.
+    Postgres refuses a new partition while the default partition holds rows in
+    its range, so those rows are moved over: the default is detached, the
+    partition created, the rows moved and the default reattached, all in the
+    caller's transaction. The caller commits.
+    """
+    partition = f"{table}_{start:%Y_%m}"
+    if db.execute(text("SELECT to_regclass(:partition)"), {"partition": partition}).scalar():
+        return
+    
+    end = add_months(start, 1)
+    default = f"{table}_default"
+    in_month = f"{column} >= :start AND {column} < :end"
+    bounds = {"start": start, "end": end}
+    has_default_rows = bool(
+        db.execute(text("SELECT to_regclass(:default)"), {"default": default}).scalar()
+        and db.execute(text(f"SELECT 1 FROM {default} WHERE {in_month} LIMIT 1"), bounds).scalar()
+    )
+    
+    if has_default_rows:
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    with_clause = f" WITH (fillfactor={PARTITION_FILLFACTOR[table]})" if table in PARTITION_FILLFACTOR else ""
+    db.execute(text(
+        f"CREATE TABLE {partition} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}'){with_clause}"
+    ))
+    if has_default_rows:
+        moved = db.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {table} SELECT * FROM moved"
+        ), bounds).rowcount
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        logger.info(f"Moved {moved} {table} rows from the default partition into {partition}")
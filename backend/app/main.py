@@ -1,17 +1,17 @@
+import importlib
 import logging
 import os
 import time
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
-from app.routers import routes_auth, routes_billing, routes_health, routes_integrations, routes_metrics, routes_team, routes_saved_views, routes_sample_data, routes_scheduled_reports, routes_jobs, routes_custom_reports, routes_funnel, routes_anomaly, routes_notifications, routes_onboarding, routes_insights, routes_agency, routes_enterprise, routes_events, routes_chat, routes_products, routes_analytics_mgmt
-from app.routers import routes_websocket
 from app.security.rate_limit import limiter
 
 # Configure structured logging
@@ -31,6 +31,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'production')}")
     logger.info(f"Log level: {LOG_LEVEL}")
     
+    # Sync endpoints run on this threadpool and park a thread for each DB round trip
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    
+    # Run database migrations if MIGRATION_MODE asks for it
+    from app.jobs.migrations import start_migrations
+    start_migrations(settings.MIGRATION_MODE)
+    
     # Start background job scheduler
     from app.jobs.scheduler import start_scheduler, shutdown_scheduler
     try:
@@ -48,6 +55,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
     
+    # Close the platform API client pooled across syncs
+    from app.jobs.sync_tasks import close_http_client
+    await close_http_client()
+    
+    # Release pooled database connections
+    from app.db import dispose_engines
+    dispose_engines()
+    
     logger.info("OmniTrackIQ API shutting down...")
 
 
@@ -89,6 +104,8 @@ For API support, contact: api-support@omnitrackiq.com
 """,
     version=os.getenv("APP_VERSION", "1.0.0"),
     lifespan=lifespan,
+    # Dashboards return large numeric payloads; orjson encodes them much faster
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "Health",
@@ -198,34 +215,56 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
 # Request timing and logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests with timing information."""
-    start_time = time.time()
-    
-    # Process request
-    try:
-        response = await call_next(request)
-    except Exception as e:
-        logger.error(
-            f"Request failed | {request.method} {request.url.path} | Error: {str(e)}"
-        )
-        raise
-    
-    # Calculate duration
-    duration_ms = (time.time() - start_time) * 1000
-    
-    # Log request (skip health checks to reduce noise)
-    if not request.url.path.startswith("/health"):
-        log_level = logging.WARNING if response.status_code >= 400 else logging.INFO
-        logger.log(
-            log_level,
-            f"{request.method} {request.url.path} | {response.status_code} | {duration_ms:.1f}ms"
-        )
-    
-    # Add timing header
-    response.headers["X-Response-Time"] = f"{duration_ms:.1f}ms"
-    return response
+class TimingLoggingMiddleware:
+    """Log all requests with timing information.
+
+    Plain ASGI rather than @app.middleware("http"): that wraps every request
+    in BaseHTTPMiddleware, which builds a Request, runs the endpoint in an
+    extra task and re-streams the response body. Here only the response start
+    message is touched, to read the status and add the timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Health checks are polled by load balancers; skip timing and logging
+        if scope["type"] != "http" or scope["path"].startswith("/health"):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        duration_ms = 0.0
+
+        async def send_wrapper(message):
+            nonlocal status_code, duration_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Calculate duration once; the header and the log line share it
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                # Add timing header
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-response-time", f"{duration_ms:.1f}ms".encode()),
+                ]
+            await send(message)
+
+        # Process request
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(
+                f"Request failed | {scope['method']} {scope['path']} | Error: {str(e)}"
+            )
+            raise
+
+        # Log request
+        log = logger.warning if status_code >= 400 else logger.info
+        log("%s %s | %d | %.1fms", scope["method"], scope["path"], status_code, duration_ms)
+
+
+app.add_middleware(TimingLoggingMiddleware)
 
 
 # Global exception handler
@@ -233,7 +272,7 @@ async def log_requests(request: Request, call_next):
 async def global_exception_handler(request: Request, exc: Exception):
     """Catch unhandled exceptions and return a clean error response."""
     logger.exception(f"Unhandled exception on {request.method} {request.url.path}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "An unexpected error occurred. Please try again later."},
     )
@@ -246,7 +285,7 @@ def norm(o: str) -> str:
 
 # Get origins from environment variable
 raw_origins = os.getenv("CORS_ORIGINS", "")
-origins = [norm(o) for o in raw_origins.split(",") if norm(o)]
+env_origins = [norm(o) for o in raw_origins.split(",") if norm(o)]
 
 # Fallback origins - ALWAYS include these
 fallback_origins = [
@@ -259,54 +298,64 @@ fallback_origins = [
     "https://www.omnitrackiq.com",               # Future custom domain with www
 ]
 
-# Add fallback origins if not already in list
-for o in fallback_origins:
-    if o not in origins:
-        origins.append(o)
-
 # Add FRONTEND_URL to origins if set
-if settings.FRONTEND_URL and norm(settings.FRONTEND_URL) not in origins:
-    origins.append(norm(settings.FRONTEND_URL))
+frontend_origins = [norm(settings.FRONTEND_URL)] if settings.FRONTEND_URL else []
+
+# Env origins first, then fallbacks and FRONTEND_URL, deduped in order
+origins = tuple(dict.fromkeys([*env_origins, *fallback_origins, *frontend_origins]))
 
 # Log the effective CORS allowlist on startup
 logger.info("CORS allow_origins=%s", origins)
 
+# The middleware checks each request's Origin with `in`; a frozenset makes that a hash lookup
+ALLOWED_ORIGINS = frozenset(origins)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origins=ALLOWED_ORIGINS,
     allow_origin_regex=r"^https://.*\.vercel\.app$",  # Allow all Vercel preview deployments
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers cache preflights instead of sending an OPTIONS before most
+    # mutating calls; Firefox honours up to 24h, Chromium caps it at 2h
+    max_age=86400,
 )
 
 # Base URL for frontend redirects
 BASE_URL = settings.FRONTEND_URL
 
+# Routers as (module, prefix, tags); each module is imported only here, so
+# nothing else pays for every router, schema and service at import time
+ROUTER_SPECS = (
+    ("app.routers.routes_health", "/health", ["Health"]),
+    ("app.routers.routes_auth", "/auth", ["Authentication"]),
+    ("app.routers.routes_billing", "/billing", ["Billing"]),
+    ("app.routers.routes_integrations", "/integrations", ["Integrations"]),
+    ("app.routers.routes_metrics", "/metrics", ["Metrics"]),
+    ("app.routers.routes_team", "/team", ["Team"]),
+    ("app.routers.routes_saved_views", "/saved-views", ["Saved Views"]),
+    ("app.routers.routes_sample_data", "/sample-data", ["Sample Data"]),
+    ("app.routers.routes_scheduled_reports", "/scheduled-reports", ["Scheduled Reports"]),
+    ("app.routers.routes_jobs", "/jobs", ["Jobs"]),
+    ("app.routers.routes_custom_reports", "/custom-reports", ["Custom Reports"]),
+    ("app.routers.routes_funnel", "/funnel", ["Funnel"]),
+    ("app.routers.routes_anomaly", "/anomalies", ["Anomalies"]),
+    ("app.routers.routes_insights", "/analytics", None),
+    ("app.routers.routes_notifications", "/notifications", ["Notifications"]),
+    ("app.routers.routes_onboarding", "/onboarding", ["Onboarding"]),
+    ("app.routers.routes_agency", "/agency", ["Agency"]),
+    ("app.routers.routes_enterprise", "/enterprise", ["Enterprise"]),
+    ("app.routers.routes_events", "/events", ["Events"]),
+    ("app.routers.routes_chat", "/chat", ["Chat"]),
+    ("app.routers.routes_products", "/products", ["Products"]),
+    ("app.routers.routes_analytics_mgmt", "/analytics", None),  # Shared prefix with insights
+    ("app.routers.routes_websocket", "", ["WebSocket"]),
+)
+
 # Include routers
-app.include_router(routes_health.router, prefix="/health", tags=["Health"])
-app.include_router(routes_auth.router, prefix="/auth", tags=["Authentication"])
-app.include_router(routes_billing.router, prefix="/billing", tags=["Billing"])
-app.include_router(routes_integrations.router, prefix="/integrations", tags=["Integrations"])
-app.include_router(routes_metrics.router, prefix="/metrics", tags=["Metrics"])
-app.include_router(routes_team.router, prefix="/team", tags=["Team"])
-app.include_router(routes_saved_views.router, prefix="/saved-views", tags=["Saved Views"])
-app.include_router(routes_sample_data.router, prefix="/sample-data", tags=["Sample Data"])
-app.include_router(routes_scheduled_reports.router, prefix="/scheduled-reports", tags=["Scheduled Reports"])
-app.include_router(routes_jobs.router, prefix="/jobs", tags=["Jobs"])
-app.include_router(routes_custom_reports.router, prefix="/custom-reports", tags=["Custom Reports"])
-app.include_router(routes_funnel.router, prefix="/funnel", tags=["Funnel"])
-app.include_router(routes_anomaly.router, prefix="/anomalies", tags=["Anomalies"])
-app.include_router(routes_insights.router, prefix="/analytics")
-app.include_router(routes_notifications.router, prefix="/notifications", tags=["Notifications"])
-app.include_router(routes_onboarding.router, prefix="/onboarding", tags=["Onboarding"])
-app.include_router(routes_agency.router, prefix="/agency", tags=["Agency"])
-app.include_router(routes_enterprise.router, prefix="/enterprise", tags=["Enterprise"])
-app.include_router(routes_events.router, prefix="/events", tags=["Events"])
-app.include_router(routes_chat.router, prefix="/chat", tags=["Chat"])
-app.include_router(routes_products.router, prefix="/products", tags=["Products"])
-app.include_router(routes_analytics_mgmt.router, prefix="/analytics")  # Shared prefix with insights
-app.include_router(routes_websocket.router, tags=["WebSocket"])
+for module_name, prefix, tags in ROUTER_SPECS:
+    app.include_router(importlib.import_module(module_name).router, prefix=prefix, tags=tags)
 
 
 # Root endpoint
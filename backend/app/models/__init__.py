@@ -1,78 +1,84 @@
-from app.models.user import User, UserRole
-from app.models.report_template import ReportTemplate
-from app.models.custom_metric import CustomMetric
-from app.models.account import Account, AccountPlan
-from app.models.integration import Integration
-from app.models.ad_account import AdAccount, AdAccountStatus
-from app.models.ad_spend import AdSpend
-from app.models.order import Order
-from app.models.order_item import OrderItem
-from app.models.daily_metrics import DailyMetrics, Channel
-from app.models.subscription import Subscription
-from app.models.team_invite import TeamInvite, InviteStatus
-from app.models.saved_view import SavedView, ViewType
-from app.models.scheduled_report import ScheduledReport, ReportFrequency, ReportType
-from app.models.custom_report import CustomReport, VisualizationType
-from app.models.notification_preference import (
-    NotificationPreference,
-    NotificationLog,
-    NotificationChannel,
-    AlertType,
-)
-from app.models.client_account import ClientAccount, ClientUserAccess, ClientStatus
-from app.models.enterprise import (
-    SSOConfig,
-    SSOProvider,
-    SSOConfigStatus,
-    AuditLog,
-    AuditAction,
-    AuditLogSeverity,
-    DataRetentionPolicy,
-    APIKey,
-)
-from app.models.product_event import ProductEvent, ProductEventName, ALLOWED_EVENT_NAMES
+"""SQLAlchemy models.
 
-__all__ = [
-    "User",
-    "UserRole",
-    "Account",
-    "AccountPlan",
-    "Integration",
-    "AdAccount",
-    "AdAccountStatus",
-    "AdSpend",
-    "Order",
-    "OrderItem",
-    "DailyMetrics",
-    "Channel",
-    "Subscription",
-    "TeamInvite",
-    "InviteStatus",
-    "SavedView",
-    "ViewType",
-    "ScheduledReport",
-    "ReportFrequency",
-    "ReportType",
-    "CustomReport",
-    "VisualizationType",
-    "NotificationPreference",
-    "NotificationLog",
-    "NotificationChannel",
-    "AlertType",
-    "ClientAccount",
-    "ClientUserAccess",
-    "ClientStatus",
+Names are loaded on first access (PEP 562), so importing one model doesn't
+import them all. Relationships refer to each other by class name, so every
+model module is imported before the mappers are first configured, and code
+that needs the full Base.metadata calls load_all().
+"""
+import importlib
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+# Public name -> module that defines it
+_LAZY = {
+    "User": "app.models.user",
+    "UserRole": "app.models.user",
+    "ReportTemplate": "app.models.report_template",
+    "CustomMetric": "app.models.custom_metric",
+    "Account": "app.models.account",
+    "AccountPlan": "app.models.account",
+    "Integration": "app.models.integration",
+    "AdAccount": "app.models.ad_account",
+    "AdAccountStatus": "app.models.ad_account",
+    "AdSpend": "app.models.ad_spend",
+    "Order": "app.models.order",
+    "OrderItem": "app.models.order_item",
+    "DailyMetrics": "app.models.daily_metrics",
+    "Channel": "app.models.daily_metrics",
+    "Subscription": "app.models.subscription",
+    "TeamInvite": "app.models.team_invite",
+    "InviteStatus": "app.models.team_invite",
+    "SavedView": "app.models.saved_view",
+    "ViewType": "app.models.saved_view",
+    "ScheduledReport": "app.models.scheduled_report",
+    "ReportFrequency": "app.models.scheduled_report",
+    "ReportType": "app.models.scheduled_report",
+    "CustomReport": "app.models.custom_report",
+    "VisualizationType": "app.models.custom_report",
+    "NotificationPreference": "app.models.notification_preference",
+    "NotificationLog": "app.models.notification_preference",
+    "NotificationUnreadCount": "app.models.notification_preference",
+    "NotificationChannel": "app.models.notification_preference",
+    "AlertType": "app.models.notification_preference",
+    "ClientAccount": "app.models.client_account",
+    "ClientUserAccess": "app.models.client_account",
+    "ClientStatus": "app.models.client_account",
     # Enterprise
-    "SSOConfig",
-    "SSOProvider",
-    "SSOConfigStatus",
-    "AuditLog",
-    "AuditAction",
-    "AuditLogSeverity",
-    "DataRetentionPolicy",
-    "APIKey",
+    "SSOConfig": "app.models.enterprise",
+    "SSOProvider": "app.models.enterprise",
+    "SSOConfigStatus": "app.models.enterprise",
+    "AuditLog": "app.models.enterprise",
+    "AuditAction": "app.models.enterprise",
+    "AuditLogSeverity": "app.models.enterprise",
+    "DataRetentionPolicy": "app.models.enterprise",
+    "APIKey": "app.models.enterprise",
     # Product Analytics
-    "ProductEvent",
-    "ProductEventName",
-    "ALLOWED_EVENT_NAMES",
-]
+    "ProductEvent": "app.models.product_event",
+    "ProductEventName": "app.models.product_event",
+    "ALLOWED_EVENT_NAMES": "app.models.product_event",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def __dir__():
+    return list(_LAZY)
+
+
+def load_all() -> None:
+    """Import every model module, registering all tables and mappers."""
+    for module in dict.fromkeys(_LAZY.values()):
+        importlib.import_module(module)
+
+
+# Runs before the mappers are first configured (first query or instance);
+# string relationship targets like "ReportTemplate" need their module imported
+event.listen(Mapper, "before_configured", load_all)
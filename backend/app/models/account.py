@@ -1,11 +1,10 @@
-import uuid
 from enum import Enum
 
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, Enum as SQLEnum, Float, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, Computed, Enum as SQLEnum, Float, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class AccountPlan(str, Enum):
@@ -17,6 +16,10 @@ class AccountPlan(str, Enum):
     ENTERPRISE = "enterprise"
 
 
+# Shared column type for plans; accounts.plan is a VARCHAR (0002_multi_tenant),
+# not a Postgres enum type, so the enum is checked on the Python side only
+ACCOUNT_PLAN_TYPE = SQLEnum(AccountPlan, native_enum=False)
+
 # Default onboarding steps structure
 DEFAULT_ONBOARDING_STEPS = {
     "created_workspace": False,
@@ -24,14 +27,21 @@ DEFAULT_ONBOARDING_STEPS = {
     "viewed_dashboard": False,
 }
 
+# Onboarding step -> boolean column on accounts
+ONBOARDING_STEP_COLUMNS = {
+    "created_workspace": "onboarded_workspace",
+    "connected_integration": "onboarded_integration",
+    "viewed_dashboard": "onboarded_dashboard",
+}
+
 
 class Account(Base):
     __tablename__ = "accounts"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     name = Column(String, nullable=False)
     type = Column(String, nullable=False, default="business")  # business | agency
-    plan = Column(SQLEnum(AccountPlan), nullable=False, default=AccountPlan.FREE)
+    plan = Column(ACCOUNT_PLAN_TYPE, nullable=False, default=AccountPlan.FREE)
     max_users = Column(Integer, nullable=False, default=1)  # Determined by plan
     stripe_customer_id = Column(String, nullable=True, index=True)
     stripe_subscription_id = Column(String, nullable=True)
@@ -45,9 +55,19 @@ class Account(Base):
     currency = Column(String, nullable=True, default="USD")
     timezone = Column(String, nullable=True, default="UTC")
     
-    # Onboarding tracking - nullable to support databases without these columns yet
-    onboarding_completed = Column(Boolean, nullable=True, default=False)
-    onboarding_steps = Column(JSON, nullable=True, default=lambda: DEFAULT_ONBOARDING_STEPS.copy())
+    # Onboarding tracking: one flag per step; completion is derived by the database
+    onboarded_workspace = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    onboarded_integration = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    onboarded_dashboard = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    onboarding_completed = Column(
+        Boolean,
+        Computed("onboarded_workspace AND onboarded_integration AND onboarded_dashboard", persisted=True),
+    )
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    @property
+    def onboarding_steps(self) -> dict:
+        """Step name -> completed flag, in the shape the onboarding API returns."""
+        return {step: bool(getattr(self, column)) for step, column in ONBOARDING_STEP_COLUMNS.items()}
@@ -2,14 +2,13 @@
 AdAccount (DataSource) model for tracking connected ad platform accounts.
 Each AdAccount represents a specific account within a platform (e.g., a Facebook Ad Account).
 """
-import uuid
 from enum import Enum as PyEnum
 
 from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class AdAccountStatus(str, PyEnum):
@@ -30,13 +29,13 @@ class AdAccount(Base):
     __tablename__ = "ad_accounts"
     
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     
     # Multi-tenancy: workspace/account scope
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False, index=True)
     
     # Link to the parent integration (OAuth connection) - nullable for demo/manual accounts
-    integration_id = Column(String, ForeignKey("integrations.id"), nullable=True, index=True)
+    integration_id = Column(String(36), ForeignKey("integrations.id"), nullable=True, index=True)
     
     # Platform type (denormalized for efficient queries)
     platform = Column(String, nullable=False)  # facebook, google_ads, tiktok, etc.
@@ -1,15 +1,14 @@
-import uuid
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, String
-
-from app.db import Base
+from app.db import Base, Money, new_id
 
 
 class AdSpend(Base):
     __tablename__ = "ad_spend"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    # On Postgres the table is partitioned by month on date, with primary key (id, date)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     platform = Column(String, nullable=False)
 
     external_account_id = Column(String, nullable=True)
@@ -20,4 +19,13 @@ class AdSpend(Base):
     impressions = Column(Integer, nullable=True)
     clicks = Column(Integer, nullable=True)
     conversions = Column(Integer, nullable=True)
-    cost = Column(Numeric(18, 4), nullable=False)
+    cost = Column(Money, nullable=False)
+
+    __table_args__ = (
+        # Per-account date range queries; also covers account_id-only lookups
+        Index("ix_ad_spend_account_date", "account_id", "date"),
+        # The same ranges filtered to one platform (dashboard platform filter)
+        Index("ix_ad_spend_account_platform_date", "account_id", "platform", "date"),
+        # One row per campaign and day; the key the platform syncs upsert on
+        Index("ix_ad_spend_campaign_day", "account_id", "platform", "external_campaign_id", "date", unique=True),
+    )
@@ -2,14 +2,13 @@
 Client account model for agency multi-client management.
 Allows agencies to manage multiple client accounts from a single agency account.
 """
-import uuid
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Boolean, Enum as SQLEnum, Index, JSON
+from sqlalchemy import Column, DateTime, ForeignKey, String, Boolean, Enum as SQLEnum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class ClientStatus(str, Enum):
@@ -27,10 +26,10 @@ class ClientAccount(Base):
     """
     __tablename__ = "client_accounts"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     
     # The agency account that owns/manages this client
-    agency_account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    agency_account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     
     # Client workspace details
     name = Column(String, nullable=False)  # Client company name
@@ -40,10 +39,15 @@ class ClientAccount(Base):
     logo_url = Column(String, nullable=True)
     
     # Status
-    status = Column(SQLEnum(ClientStatus), nullable=False, default=ClientStatus.PENDING_SETUP)
+    # Stored by value ('active', ...), matching the clientstatus labels
+    status = Column(
+        SQLEnum(ClientStatus, values_callable=lambda enum_cls: [member.value for member in enum_cls]),
+        nullable=False,
+        default=ClientStatus.PENDING_SETUP,
+    )
     
     # Settings
-    settings = Column(JSON, nullable=False, default=lambda: {
+    settings = Column(JSONType, nullable=False, default=lambda: {
         "timezone": "UTC",
         "currency": "USD",
         "date_format": "YYYY-MM-DD",
@@ -51,7 +55,7 @@ class ClientAccount(Base):
     })
     
     # Branding for white-label reports
-    branding = Column(JSON, nullable=False, default=lambda: {
+    branding = Column(JSONType, nullable=False, default=lambda: {
         "primary_color": "#10B981",
         "logo_url": None,
         "company_name": None,
@@ -75,9 +79,8 @@ class ClientAccount(Base):
     
     # Indexes
     __table_args__ = (
-        Index("ix_client_accounts_agency_id", "agency_account_id"),
         Index("ix_client_accounts_slug", "agency_account_id", "slug", unique=True),
-        Index("ix_client_accounts_status", "status"),
+        Index("ix_client_accounts_agency_active", "agency_account_id", postgresql_where=text("status = 'active'")),
     )
 
 
@@ -88,10 +91,10 @@ class ClientUserAccess(Base):
     """
     __tablename__ = "client_user_access"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    client_account_id = Column(String, ForeignKey("client_accounts.id"), nullable=False)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    client_account_id = Column(String(36), ForeignKey("client_accounts.id"), nullable=False)
     
     # Permission level for this specific client
     can_view = Column(Boolean, nullable=False, default=True)
@@ -106,7 +109,6 @@ class ClientUserAccess(Base):
     
     # Indexes
     __table_args__ = (
-        Index("ix_client_user_access_user_id", "user_id"),
         Index("ix_client_user_access_client_id", "client_account_id"),
         Index("ix_client_user_access_unique", "user_id", "client_account_id", unique=True),
     )
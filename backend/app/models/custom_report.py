@@ -1,14 +1,13 @@
 """
 Custom reports model for user-created analytics reports.
 """
-import uuid
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, Enum as SQLEnum, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, String, Enum as SQLEnum, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class VisualizationType(str, Enum):
@@ -25,20 +24,26 @@ class CustomReport(Base):
     """User-created custom report configuration."""
     __tablename__ = "custom_reports"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     
     name = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     
     # Report configuration stored as JSON
     # Contains: metrics, dimensions, filters, date_range, visualization_type, etc.
-    config_json = Column(Text, nullable=False, default="{}")
+    config_json = Column(JSONType, nullable=False, default=dict)
     
     # Default visualization type
+    # Stored by value ('table', ...), matching ck_custom_reports_visualization_type
     visualization_type = Column(
-        SQLEnum(VisualizationType), 
+        SQLEnum(
+            VisualizationType,
+            native_enum=False,
+            length=32,
+            values_callable=lambda enum_cls: [member.value for member in enum_cls],
+        ),
         nullable=False, 
         default=VisualizationType.TABLE
     )
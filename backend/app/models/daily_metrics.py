@@ -4,12 +4,11 @@ DailyMetrics model for aggregated daily performance tracking.
 Stores pre-aggregated metrics per day for fast dashboard queries.
 Supports multi-tenancy, channel breakdown, and campaign-level metrics.
 """
-import uuid
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Date, Enum, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy import Column, Date, Enum, ForeignKey, Index, Integer, String
 
-from app.db import Base
+from app.db import Base, Money, new_id
 
 
 class Channel(str, PyEnum):
@@ -41,31 +40,31 @@ class DailyMetrics(Base):
     """
     __tablename__ = "daily_metrics"
 
-    # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Primary key (id, date) on Postgres, where the table is partitioned by month on date
+    id = Column(String(36), primary_key=True, default=new_id)
     
     # Multi-tenancy: workspace/account scope (required)
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     
     # Date dimension (required)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     
     # Channel dimension (optional - for channel-level breakdown)
     channel = Column(Enum(Channel), nullable=True)
     
     # Ad account reference (optional - for ad account level metrics)
-    ad_account_id = Column(String, ForeignKey("ad_accounts.id"), nullable=True)
+    ad_account_id = Column(String(36), ForeignKey("ad_accounts.id"), nullable=True)
     
     # Campaign dimension (optional - for campaign-level breakdown)
     campaign_id = Column(String, nullable=True)
     campaign_name = Column(String, nullable=True)
     
     # Revenue metrics
-    total_revenue = Column(Numeric(18, 4), nullable=False, default=0)
+    total_revenue = Column(Money, nullable=False, default=0)
     total_orders = Column(Integer, nullable=False, default=0)
     
     # Spend metrics
-    total_ad_spend = Column(Numeric(18, 4), nullable=False, default=0)
+    total_ad_spend = Column(Money, nullable=False, default=0)
     
     # Engagement metrics
     total_impressions = Column(Integer, nullable=False, default=0)
@@ -75,8 +74,8 @@ class DailyMetrics(Base):
     total_conversions = Column(Integer, nullable=False, default=0)
     
     # Computed metrics (can be recalculated from above)
-    roas = Column(Numeric(18, 4), nullable=False, default=0)
-    profit = Column(Numeric(18, 4), nullable=False, default=0)
+    roas = Column(Money, nullable=False, default=0)
+    profit = Column(Money, nullable=False, default=0)
     
     # Indexes for common query patterns
     __table_args__ = (
@@ -88,6 +87,13 @@ class DailyMetrics(Base):
         Index("ix_daily_metrics_account_channel_campaign", "account_id", "channel", "campaign_id"),
         # Ad account level queries
         Index("ix_daily_metrics_account_ad_account", "account_id", "ad_account_id"),
+        # Cross-account date range scans (BRIN on Postgres)
+        Index(
+            "ix_daily_metrics_date",
+            "date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
     
     def __repr__(self):
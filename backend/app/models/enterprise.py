@@ -2,15 +2,15 @@
 Enterprise models for SSO configuration and audit logging.
 These features are available on Enterprise plan accounts.
 """
-import uuid
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Boolean, Integer, Enum as SQLEnum, Index, JSON, Text
+from sqlalchemy import Column, DateTime, ForeignKey, String, Boolean, Integer, Enum as SQLEnum, Index, Text, text
+from sqlalchemy.dialects.postgresql import INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class SSOProvider(str, Enum):
@@ -38,8 +38,8 @@ class SSOConfig(Base):
     """
     __tablename__ = "sso_configs"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, unique=True)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False, unique=True)
     
     # Provider configuration
     provider = Column(SQLEnum(SSOProvider), nullable=False, default=SSOProvider.SAML)
@@ -68,7 +68,7 @@ class SSOConfig(Base):
     default_role = Column(String, nullable=False, default="member")  # Role for auto-provisioned users
     
     # Attribute mapping (IdP attribute -> OmniTrackIQ field)
-    attribute_mapping = Column(JSON, nullable=False, default=lambda: {
+    attribute_mapping = Column(JSONType, nullable=False, default=lambda: {
         "email": "email",
         "first_name": "firstName",
         "last_name": "lastName",
@@ -150,11 +150,12 @@ class AuditLog(Base):
     """
     __tablename__ = "audit_logs"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    # Primary key (id, created_at) on Postgres, where the table is partitioned by month on created_at
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     
     # Actor information
-    user_id = Column(String, ForeignKey("users.id"), nullable=True)  # Null for system events
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=True)  # Null for system events
     user_email = Column(String, nullable=True)  # Denormalized for historical record
     
     # Action details
@@ -167,31 +168,55 @@ class AuditLog(Base):
     resource_name = Column(String, nullable=True)  # Human-readable name
     
     # Context
-    description = Column(String, nullable=True)  # Human-readable description
-    extra_data = Column(JSON, nullable=True)  # Additional structured data (renamed from 'metadata')
+    description = Column(Text, nullable=True)  # Human-readable description
+    extra_data = Column(JSONType, nullable=True)  # Additional structured data (renamed from 'metadata')
     
     # Request information
-    ip_address = Column(String, nullable=True)
+    ip_address = Column(String().with_variant(INET(), "postgresql"), nullable=True)
     user_agent = Column(String, nullable=True)
     request_id = Column(String, nullable=True)  # Correlation ID
     
     # Status
     success = Column(Boolean, nullable=False, default=True)
-    error_message = Column(String, nullable=True)
+    error_message = Column(Text, nullable=True)
     
     # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     
     # Relationships
     account = relationship("Account", backref="audit_logs")
     user = relationship("User", backref="audit_logs")
     
     __table_args__ = (
-        Index("ix_audit_logs_account_id", "account_id"),
         Index("ix_audit_logs_user_id", "user_id"),
         Index("ix_audit_logs_action", "action"),
-        Index("ix_audit_logs_created_at", "created_at"),
-        Index("ix_audit_logs_account_created", "account_id", "created_at"),
+        Index(
+            "ix_audit_logs_created_at_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Covering index for the account listing, newest first
+        Index(
+            "ix_audit_logs_account_created_desc",
+            "account_id",
+            text("created_at DESC"),
+            postgresql_include=["action", "severity", "user_id", "resource_type", "resource_id", "success"],
+        ),
+        Index("ix_audit_logs_account_action_created", "account_id", "action", text("created_at DESC")),
+        Index(
+            "ix_audit_logs_account_user_created",
+            "account_id",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("user_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_audit_logs_extra_data_gin",
+            "extra_data",
+            postgresql_using="gin",
+            postgresql_ops={"extra_data": "jsonb_path_ops"},
+        ),
     )
 
 
@@ -202,8 +227,8 @@ class DataRetentionPolicy(Base):
     """
     __tablename__ = "data_retention_policies"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, unique=True)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False, unique=True)
     
     # Retention periods (in days, 0 = indefinite)
     metrics_retention_days = Column(Integer, nullable=False, default=730)  # 2 years
@@ -232,9 +257,9 @@ class APIKey(Base):
     """
     __tablename__ = "api_keys"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
-    created_by_user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
+    created_by_user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     
     # Key details
     name = Column(String, nullable=False)  # Human-readable name
@@ -242,10 +267,10 @@ class APIKey(Base):
     key_hash = Column(String, nullable=False)  # Hashed full key
     
     # Permissions
-    scopes = Column(JSON, nullable=False, default=lambda: ["read"])  # read, write, admin
+    scopes = Column(JSONType, nullable=False, default=lambda: ["read"])  # read, write, admin
     
     # Restrictions
-    allowed_ips = Column(JSON, nullable=True)  # IP whitelist
+    allowed_ips = Column(JSONType, nullable=True)  # IP whitelist
     rate_limit = Column(Integer, nullable=True)  # Requests per minute
     
     # Expiration
@@ -258,7 +283,7 @@ class APIKey(Base):
     # Status
     is_active = Column(Boolean, nullable=False, default=True)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
-    revoked_by_user_id = Column(String, ForeignKey("users.id"), nullable=True)
+    revoked_by_user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -270,5 +295,7 @@ class APIKey(Base):
     __table_args__ = (
         Index("ix_api_keys_account_id", "account_id"),
         Index("ix_api_keys_key_prefix", "key_prefix"),
-        Index("ix_api_keys_is_active", "is_active"),
+        Index("ix_api_keys_key_hash", "key_hash", postgresql_using="hash"),
+        Index("ix_api_keys_active", "account_id", "key_prefix", postgresql_where=text("is_active = true")),
+        Index("ix_api_keys_scopes_gin", "scopes", postgresql_using="gin", postgresql_ops={"scopes": "jsonb_path_ops"}),
     )
@@ -1,23 +1,21 @@
-import uuid
-
 from sqlalchemy import Column, DateTime, ForeignKey, String, Text
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class Integration(Base):
     __tablename__ = "integrations"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     platform = Column(String, nullable=False)  # facebook, google_ads, tiktok, shopify, ga4
     status = Column(String, nullable=False, default="connected")
 
     access_token = Column(Text, nullable=True)
     refresh_token = Column(Text, nullable=True)
     token_expires_at = Column(DateTime(timezone=True), nullable=True)
-    config_json = Column(Text, nullable=True)
+    config_json = Column(JSONType, nullable=True)
     extra_data = Column(Text, nullable=True)  # Store additional OAuth response data
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
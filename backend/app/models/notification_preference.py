@@ -1,14 +1,13 @@
 """
 Notification preference model for user notification settings.
 """
-import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Integer, SmallInteger, Text
 from sqlalchemy.orm import relationship
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class NotificationChannel(str, PyEnum):
@@ -33,7 +32,7 @@ class NotificationPreference(Base):
     """User notification preferences."""
     __tablename__ = "notification_preferences"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Global preferences
@@ -42,7 +41,7 @@ class NotificationPreference(Base):
     
     # Alert preferences
     anomaly_alerts_enabled = Column(Boolean, default=True)
-    anomaly_sensitivity = Column(String(20), default="medium")  # low, medium, high
+    anomaly_sensitivity = Column(Enum("low", "medium", "high", name="anomalysensitivity"), default="medium")
     
     spend_alerts_enabled = Column(Boolean, default=False)
     daily_spend_threshold = Column(Integer, nullable=True)  # Alert if daily spend exceeds this
@@ -51,18 +50,18 @@ class NotificationPreference(Base):
     roas_threshold = Column(Integer, nullable=True)  # Alert if ROAS drops below this (stored as percentage * 100)
     
     budget_alerts_enabled = Column(Boolean, default=True)
-    budget_alert_percentage = Column(Integer, default=80)  # Alert at 80% of budget
+    budget_alert_percentage = Column(SmallInteger, default=80)  # Alert at 80% of budget
     
     # Report preferences
     weekly_report_enabled = Column(Boolean, default=True)
-    weekly_report_day = Column(Integer, default=1)  # 0=Sunday, 1=Monday, etc.
+    weekly_report_day = Column(SmallInteger, default=1)  # 0=Sunday, 1=Monday, etc.
     
     monthly_report_enabled = Column(Boolean, default=False)
     
     # Quiet hours (don't send notifications during these hours)
     quiet_hours_enabled = Column(Boolean, default=False)
-    quiet_hours_start = Column(Integer, default=22)  # 10 PM
-    quiet_hours_end = Column(Integer, default=8)     # 8 AM
+    quiet_hours_start = Column(SmallInteger, default=22)  # 10 PM
+    quiet_hours_end = Column(SmallInteger, default=8)     # 8 AM
     timezone = Column(String(50), default="UTC")
     
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -79,14 +78,22 @@ class NotificationLog(Base):
     """Log of sent notifications for tracking and preventing duplicates."""
     __tablename__ = "notification_logs"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Primary key (id, user_id) on Postgres, where the table is hash-partitioned on user_id
+    id = Column(String(36), primary_key=True, default=new_id)
     user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
-    alert_type = Column(Enum(AlertType), nullable=False)
-    channel = Column(Enum(NotificationChannel), nullable=False)
+    # Stored by value ('anomaly_spike', ...), matching the alerttype/notificationchannel labels
+    alert_type = Column(
+        Enum(AlertType, values_callable=lambda enum_cls: [member.value for member in enum_cls]),
+        nullable=False,
+    )
+    channel = Column(
+        Enum(NotificationChannel, values_callable=lambda enum_cls: [member.value for member in enum_cls]),
+        nullable=False,
+    )
     
     title = Column(String(255), nullable=False)
-    message = Column(String(2000), nullable=True)
+    message = Column(Text, nullable=True)
     
     # For deduplication
     reference_id = Column(String(100), nullable=True)  # e.g., anomaly_id, campaign_id
@@ -100,3 +107,11 @@ class NotificationLog(Base):
 
     def __repr__(self):
         return f"<NotificationLog {self.alert_type} to user={self.user_id}>"
+
+
+class NotificationUnreadCount(Base):
+    """Unread notifications per user, maintained by a trigger on notification_logs (Postgres only)."""
+    __tablename__ = "notification_unread_counts"
+
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0, server_default="0")
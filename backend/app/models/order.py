@@ -1,24 +1,27 @@
-import uuid
-
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, Money, new_id
 
 
 class Order(Base):
     __tablename__ = "orders"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     source_platform = Column(String, nullable=False)
     external_order_id = Column(String, nullable=False)
 
     date_time = Column(DateTime(timezone=True), nullable=False)
-    total_amount = Column(Numeric(18, 4), nullable=False)
+    total_amount = Column(Money, nullable=False)
     currency = Column(String, nullable=False)
 
     utm_source = Column(String, nullable=True)
     utm_campaign = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # One row per platform order; the key the Shopify sync inserts on
+        Index("ix_orders_external_order", "account_id", "source_platform", "external_order_id", unique=True),
+    )
@@ -1,10 +1,9 @@
 """Order item model for per-product profitability analytics."""
-import uuid
 
 from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, Integer
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class OrderItem(Base):
@@ -14,7 +13,7 @@ class OrderItem(Base):
     """
     __tablename__ = "order_items"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=new_id)
     order_id = Column(String, ForeignKey("orders.id"), nullable=False, index=True)
     account_id = Column(String, ForeignKey("accounts.id"), nullable=False, index=True)
     
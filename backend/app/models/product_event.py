@@ -1,11 +1,10 @@
 """Product event model for analytics tracking."""
-import uuid
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, String, JSON, Index
+from sqlalchemy import Column, DateTime, String, Index
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class ProductEventName(str, Enum):
@@ -47,7 +46,7 @@ class ProductEvent(Base):
     """Track product usage events for analytics."""
     __tablename__ = "product_events"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=new_id)
     
     # Context - nullable for unauthenticated events
     workspace_id = Column(String, nullable=True, index=True)
@@ -55,13 +54,20 @@ class ProductEvent(Base):
     
     # Event data
     event_name = Column(String, nullable=False, index=True)
-    properties = Column(JSON, nullable=False, default=dict)
+    properties = Column(JSONType, nullable=False, default=dict)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
-    # Composite indexes for common queries
+    # Composite indexes for common queries; INCLUDE columns make them covering on Postgres
     __table_args__ = (
-        Index('ix_product_events_workspace_event', 'workspace_id', 'event_name'),
-        Index('ix_product_events_created_event', 'created_at', 'event_name'),
+        Index(
+            'ix_product_events_workspace_event', 'workspace_id', 'event_name',
+            postgresql_include=['created_at', 'user_id'],
+        ),
+        Index('ix_product_events_created_event', 'created_at', 'event_name', postgresql_include=['workspace_id']),
+        Index(
+            'ix_product_events_properties_gin', 'properties',
+            postgresql_using='gin', postgresql_ops={'properties': 'jsonb_path_ops'},
+        ),
     )
@@ -1,14 +1,13 @@
-import uuid
 from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Text, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 class ReportTemplate(Base):
     __tablename__ = "report_templates"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, index=True, default=new_id)
     account_id = Column(String, ForeignKey("accounts.id"), nullable=False, index=True)
     
     name = Column(String, nullable=False)
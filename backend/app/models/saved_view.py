@@ -1,14 +1,13 @@
 """
 Saved views for dashboard configurations.
 """
-import uuid
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, Enum as SQLEnum
+from sqlalchemy import Column, DateTime, ForeignKey, String, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class ViewType(str, Enum):
@@ -23,16 +22,16 @@ class SavedView(Base):
     """Saved dashboard view configuration."""
     __tablename__ = "saved_views"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     
     name = Column(String, nullable=False)
-    view_type = Column(SQLEnum(ViewType), nullable=False, default=ViewType.CUSTOM)
+    view_type = Column(SQLEnum(ViewType, native_enum=False, length=32), nullable=False, default=ViewType.CUSTOM)
     description = Column(String, nullable=True)
     
     # JSON configuration for filters, date range, metrics shown, etc.
-    config_json = Column(Text, nullable=False, default="{}")
+    config_json = Column(JSONType, nullable=False, default=dict)
     
     # Whether this view is shared with the team
     is_shared = Column(String, nullable=False, default="private")  # private | team
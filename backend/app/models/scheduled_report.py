@@ -1,13 +1,12 @@
 """
 Model for scheduled email reports.
 """
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum as SQLEnum
 from sqlalchemy.sql import func
 import enum
 
-from app.db import Base
+from app.db import Base, JSONType, new_id
 
 
 class ReportFrequency(str, enum.Enum):
@@ -28,22 +27,22 @@ class ScheduledReport(Base):
     """Scheduled report configuration for email delivery."""
     __tablename__ = "scheduled_reports"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False, index=True)
-    created_by = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False, index=True)
+    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
     
     # Report configuration
     name = Column(String(255), nullable=False)
-    report_type = Column(SQLEnum(ReportType), nullable=False, default=ReportType.OVERVIEW)
-    frequency = Column(SQLEnum(ReportFrequency), nullable=False, default=ReportFrequency.WEEKLY)
+    report_type = Column(SQLEnum(ReportType, native_enum=False, length=32), nullable=False, default=ReportType.OVERVIEW)
+    frequency = Column(SQLEnum(ReportFrequency, native_enum=False, length=32), nullable=False, default=ReportFrequency.WEEKLY)
     
     # Recipients (comma-separated emails or JSON array)
-    recipients = Column(JSON, nullable=False, default=list)
+    recipients = Column(JSONType, nullable=False, default=list)
     
     # Filters and settings
     date_range_days = Column(String(10), default="30")  # "7", "30", "90", or "custom"
-    platforms = Column(JSON, default=list)  # Empty = all platforms
-    metrics = Column(JSON, default=list)  # Specific metrics to include
+    platforms = Column(JSONType, default=list)  # Empty = all platforms
+    metrics = Column(JSONType, default=list)  # Specific metrics to include
     
     # Scheduling
     is_active = Column(Boolean, default=True)
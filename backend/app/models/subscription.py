@@ -1,10 +1,9 @@
-import uuid
 from enum import Enum
 
 from sqlalchemy import Column, DateTime, ForeignKey, String, Index
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class SubscriptionStatus(str, Enum):
@@ -20,8 +19,8 @@ class SubscriptionStatus(str, Enum):
 class Subscription(Base):
     __tablename__ = "subscriptions"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    id = Column(String(36), primary_key=True, default=new_id)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
 
     stripe_customer_id = Column(String, nullable=False)
     stripe_subscription_id = Column(String, nullable=False)
@@ -35,9 +34,9 @@ class Subscription(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Indexes for faster lookups
+    # Indexes for faster lookups; one subscription row per account (webhooks upsert on it)
     __table_args__ = (
-        Index("ix_subscriptions_account_id", "account_id"),
+        Index("ix_subscriptions_account_id", "account_id", unique=True),
         Index("ix_subscriptions_stripe_subscription_id", "stripe_subscription_id"),
         Index("ix_subscriptions_stripe_customer_id", "stripe_customer_id"),
     )
@@ -1,11 +1,10 @@
-import uuid
 from enum import Enum
 
 from sqlalchemy import Column, DateTime, ForeignKey, String, Enum as SQLEnum
 from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
-from app.db import Base
+from app.db import Base, new_id
 
 
 class UserRole(str, Enum):
@@ -19,10 +18,10 @@ class UserRole(str, Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=new_id)
     email = Column(String, unique=True, nullable=False, index=True)
     password_hash = Column(String, nullable=False)
-    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    account_id = Column(String(36), ForeignKey("accounts.id"), nullable=False)
     role = Column(String, nullable=False, default="owner")
     name = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
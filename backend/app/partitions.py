@@ -0,0 +1,11 @@
+"""Month arithmetic for the monthly range partitions of the time-series tables.
+
+Shared by the partitioning migrations and the scheduler job that adds months.
+"""
+from datetime import date
+
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month `count` months after (or, if negative, before) `month`."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
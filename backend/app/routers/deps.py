@@ -1,11 +1,12 @@
 from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from app.db import SessionLocal
+from app.db import ReadSessionLocal, SessionLocal
 from app.models.user import User
 from app.security.jwt import TokenData, decode_access_token
+from app.services.auth_service import CurrentUser, get_cached_user
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -16,11 +17,21 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_db_ro() -> Generator[Session, None, None]:
+    """Session on the read replica (the primary when none is configured). Never write through it."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_current_user(
     token_data: TokenData = Depends(decode_access_token),
     db: Session = Depends(get_db),
 ) -> User:
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    # The account is joined in: most routes read the plan or workspace next
+    user = db.get(User, token_data.sub, options=[joinedload(User.account)])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
@@ -56,7 +67,7 @@ def get_current_user_optional(
             return None
         
         # Get user
-        user = db.query(User).filter(User.id == payload["sub"]).first()
+        user = db.get(User, payload["sub"])
         return user
     except Exception:
         # Any error means no valid auth
@@ -70,8 +81,32 @@ def get_current_account_user(
     """
     Resolve the authenticated user and ensure they belong to an account.
     Use this when downstream queries require account scoping.
+    The account is joined in, so user.account costs no extra query.
+    """
+    user = db.get(User, token_data.sub, options=[joinedload(User.account)])
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="Your account was not found. Please sign up or contact support."
+        )
+    if not user.account_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="Your account setup is incomplete. Please contact support."
+        )
+    return user
+
+
+def get_current_user_lite(
+    token_data: TokenData = Depends(decode_access_token),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """
+    Same checks as get_current_account_user, but loads only id, email and account_id,
+    cached for a few seconds (see auth_service.get_cached_user).
+    Use this for account-scoped routes that don't need the rest of the User row.
     """
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    user = get_cached_user(db, token_data.sub)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
@@ -85,5 +120,5 @@ def get_current_account_user(
     return user
 
 
-def get_current_account_id(user: User = Depends(get_current_account_user)) -> str:
+def get_current_account_id(user: CurrentUser = Depends(get_current_user_lite)) -> str:
     return user.account_id
@@ -1,7 +1,6 @@
 """
 Routes for custom report management.
 """
-import json
 from datetime import datetime
 from typing import Optional
 
@@ -25,7 +24,7 @@ router = APIRouter()
 
 def _report_to_response(report: CustomReport) -> CustomReportResponse:
     """Convert a CustomReport model to a response schema."""
-    config_dict = json.loads(report.config_json) if report.config_json else {}
+    config_dict = report.config_json or {}
     return CustomReportResponse(
         id=report.id,
         name=report.name,
@@ -235,7 +234,7 @@ def run_custom_report(
             detail="Report not found",
         )
     
-    config_dict = json.loads(report.config_json) if report.config_json else {}
+    config_dict = report.config_json or {}
     config = ReportConfig(**config_dict)
     
     results = custom_report_service.execute_custom_report(
@@ -26,8 +26,11 @@ def readiness(db: Session = Depends(get_db)):
     Readiness check - verifies the service can handle requests.
     Checks database connectivity.
     """
+    from app.jobs.migrations import MIGRATION_STATUS
+    
     checks = {
         "database": "unknown",
+        "migrations": MIGRATION_STATUS["state"],
     }
     all_healthy = True
     
@@ -39,6 +42,14 @@ def readiness(db: Session = Depends(get_db)):
         checks["database"] = f"unhealthy: {str(e)}"
         all_healthy = False
     
+    # A failed startup migration leaves the schema behind the code
+    if MIGRATION_STATUS["state"] == "failed":
+        checks["migrations"] = f"failed: {MIGRATION_STATUS['error']}"
+        all_healthy = False
+    # Another instance holds the migration lock and may still be changing the schema
+    elif MIGRATION_STATUS["state"] == "waiting":
+        all_healthy = False
+    
     return {
         "status": "ready" if all_healthy else "not_ready",
         "checks": checks,
@@ -67,6 +78,7 @@ def status(db: Session = Depends(get_db)):
     Detailed status page with version, uptime, and integration status.
     Useful for debugging and monitoring dashboards.
     """
+    from app.jobs.migrations import MIGRATION_STATUS
     from app.services.cache_service import cache
     from app.services.websocket_service import manager as ws_manager
     
@@ -115,6 +127,7 @@ def status(db: Session = Depends(get_db)):
         "timestamp": now.isoformat(),
         "checks": {
             "database": db_status,
+            "migrations": MIGRATION_STATUS["state"],
             "cache": cache_status,
             "websocket": f"{ws_stats['total_connections']} connections",
             "integrations": f"{configured_integrations}/{len(integrations)} configured",
@@ -4,12 +4,14 @@ import json
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import RedirectResponse
+from sqlalchemy import bindparam, lambda_stmt, select
 from sqlalchemy.orm import Session
 
-from app.routers.deps import get_current_account_user, get_db
+from app.routers.deps import get_current_account_user, get_db, get_db_ro
 from app.models.integration import Integration
 from app.schemas.integrations import IntegrationItem
 from app.config import settings
+from app.services.cache_service import cache
 from app.services.integrations_service import (
     exchange_code_for_token,
     refresh_access_token,
@@ -17,6 +19,14 @@ from app.services.integrations_service import (
 
 router = APIRouter()
 
+# Compiled once and reused on every call
+_INTEGRATION_BY_PLATFORM_STMT = lambda_stmt(
+    lambda: select(Integration).where(
+        Integration.account_id == bindparam("account_id"),
+        Integration.platform == bindparam("platform"),
+    ).limit(1)
+)
+
 
 # OAuth configuration for each platform
 OAUTH_CONFIG = {
@@ -49,7 +59,7 @@ OAUTH_CONFIG = {
 
 
 @router.get("/", response_model=list[IntegrationItem])
-def list_integrations(db: Session = Depends(get_db), user=Depends(get_current_account_user)):
+def list_integrations(db: Session = Depends(get_db_ro), user=Depends(get_current_account_user)):
     rows = (
         db.query(Integration)
         .filter(Integration.account_id == user.account_id)
@@ -210,6 +220,7 @@ async def oauth_callback(
     integration.updated_at = datetime.utcnow()
     
     db.commit()
+    cache.invalidate_integrations()
     
     return RedirectResponse(
         url=f"{settings.FRONTEND_URL}/integrations?success=true&platform={platform}"
@@ -269,14 +280,13 @@ async def refresh_tokens(
 
 @router.delete("/{platform}")
 def disconnect(platform: str, db: Session = Depends(get_db), user=Depends(get_current_account_user)):
-    row = (
-        db.query(Integration)
-        .filter(Integration.account_id == user.account_id, Integration.platform == platform)
-        .first()
-    )
+    row = db.execute(
+        _INTEGRATION_BY_PLATFORM_STMT, {"account_id": user.account_id, "platform": platform}
+    ).scalar_one_or_none()
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Integration not found")
     row.status = "disconnected"
     row.updated_at = datetime.utcnow()
     db.commit()
+    cache.invalidate_integrations()
     return {"status": "disconnected", "platform": platform}
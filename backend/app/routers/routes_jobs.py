@@ -63,7 +63,8 @@ async def trigger_sync_platform(
             detail=f"No connected {platform} integration found"
         )
     
-    background_tasks.add_task(sync_integration, db, integration)
+    # The sync opens its own session rather than borrowing the request's
+    background_tasks.add_task(sync_integration, integration.id)
     return {"message": f"Sync job queued for {platform}"}
 
 
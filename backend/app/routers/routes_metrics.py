@@ -1,10 +1,13 @@
-from datetime import date, timedelta
-from typing import Optional, List
+import itertools
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Tuple
 
+import orjson
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.routers.deps import get_current_account_user, get_db
+from app.routers.deps import get_current_user_lite, get_db_ro
 from app.schemas.metrics import (
     MetricsSummary, 
     CampaignPerformance, 
@@ -22,7 +25,7 @@ from app.schemas.metrics import (
 )
 from app.services.metrics_service import (
     get_campaigns, 
-    get_orders, 
+    iter_orders,
     get_summary,
     get_platform_breakdown,
     get_daily_performance,
@@ -51,142 +54,140 @@ from app.services.cohort_service import (
 router = APIRouter()
 
 
+def _resolved_range(default_days: int):
+    """Build a dependency resolving ?from=&to=, defaulting to the last `default_days` days."""
+    def resolved_range(
+        from_date: Optional[date] = Query(None, alias="from"),
+        to_date: Optional[date] = Query(None, alias="to"),
+    ) -> Tuple[date, date]:
+        if not from_date:
+            to_date = date.today()
+            return to_date - timedelta(days=default_days), to_date
+        return from_date, to_date or date.today()
+
+    return resolved_range
+
+
+resolved_range_7d = _resolved_range(7)
+resolved_range_30d = _resolved_range(30)
+resolved_range_365d = _resolved_range(365)
+
+
 @router.get("/summary", response_model=MetricsSummary)
 def summary(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_7d),
     platform: Optional[str] = Query(None, description="Filter by platform"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get metrics summary for the dashboard.
     
     Returns aggregate KPIs including revenue, spend, ROAS, orders, and daily breakdown.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=7)
+    from_date, to_date = dates
     return get_summary(db, user.account_id, from_date, to_date, platform)
 
 
 @router.get("/timeseries", response_model=TimeseriesResponse)
 def timeseries(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     group_by_channel: bool = Query(False, description="Include breakdown by channel"),
     metrics: List[str] = Query(["spend", "revenue", "roas"], description="Metrics to include"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get timeseries data for charts.
     
     Returns daily data points with optional channel breakdown.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_timeseries(db, user.account_id, from_date, to_date, platform, group_by_channel, metrics)
 
 
 @router.get("/channels", response_model=ChannelBreakdownResponse)
 def channels(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get metrics breakdown by channel/platform.
     
     Returns spend, revenue, ROAS, and engagement metrics per channel.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_channel_breakdown(db, user.account_id, from_date, to_date)
 
 
 # Alias endpoint for /metrics/by-channel (per original spec)
 @router.get("/by-channel", response_model=ChannelBreakdownResponse)
 def by_channel(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get metrics breakdown by channel/platform (alias for /channels).
     
     Returns spend, revenue, ROAS, and engagement metrics per channel.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_channel_breakdown(db, user.account_id, from_date, to_date)
 
 
 @router.get("/campaigns", response_model=List[CampaignPerformance])
 def campaigns(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_7d),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     sort_by: Optional[str] = Query("spend", description="Sort by: spend, roas, clicks, conversions"),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get campaign performance data.
     
     Returns list of campaigns with metrics, filterable by platform.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=7)
+    from_date, to_date = dates
     return get_campaigns(db, user.account_id, from_date, to_date, platform, sort_by, limit)
 
 
 # Alias endpoint for /metrics/by-campaign (per original spec)
 @router.get("/by-campaign", response_model=List[CampaignPerformance])
 def by_campaign(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_7d),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     sort_by: Optional[str] = Query("spend", description="Sort by: spend, roas, clicks, conversions"),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get campaign performance data (alias for /campaigns).
     
     Returns list of campaigns with metrics, filterable by platform.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=7)
+    from_date, to_date = dates
     return get_campaigns(db, user.account_id, from_date, to_date, platform, sort_by, limit)
 
 
 @router.get("/campaigns/{campaign_id}", response_model=CampaignDetail)
 def campaign_detail(
     campaign_id: str,
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get detailed metrics for a single campaign.
     
     Returns summary stats and daily breakdown.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     result = get_campaign_detail(db, user.account_id, campaign_id, from_date, to_date)
     if not result:
@@ -200,19 +201,16 @@ def campaign_detail(
 @router.get("/campaigns/{campaign_id}/timeseries", response_model=CampaignTimeseriesResponse)
 def campaign_timeseries(
     campaign_id: str,
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get daily timeseries data for a specific campaign.
     
     Returns daily metrics for charts: spend, clicks, impressions, conversions.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     return get_campaign_timeseries(db, user.account_id, campaign_id, from_date, to_date)
 
@@ -220,19 +218,16 @@ def campaign_timeseries(
 @router.get("/campaigns/{campaign_id}/summary", response_model=CampaignSummaryResponse)
 def campaign_summary(
     campaign_id: str,
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get aggregated summary metrics for a single campaign.
     
     Returns KPIs like spend, ROAS, CPA for the selected date range.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     result = get_campaign_summary_single(db, user.account_id, campaign_id, from_date, to_date)
     if not result:
@@ -247,19 +242,16 @@ def campaign_summary(
 def campaign_timeseries_by_name(
     campaign_name: str = Query(..., description="Campaign name to filter by"),
     channel: Optional[str] = Query(None, description="Filter by channel/platform"),
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get daily timeseries data for a campaign by name.
     
     Alternative endpoint that accepts campaign_name instead of campaign_id.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     # Find campaign by name
     from app.models.ad_spend import AdSpend
@@ -282,67 +274,87 @@ def campaign_timeseries_by_name(
 
 @router.get("/orders")
 def orders(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_7d),
     utm_source: Optional[str] = Query(None, description="Filter by UTM source"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    after_date_time: Optional[datetime] = Query(None, description="Keyset cursor: date_time of the last order seen"),
+    after_id: Optional[str] = Query(None, description="Keyset cursor: id of the last order seen"),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get orders list with pagination and filtering.
     
-    Returns paginated orders with attribution details.
+    Returns paginated orders with attribution details. For deep pages pass
+    after_date_time/after_id from next_after_* instead of a large offset; keyset
+    pages skip the total count, so total is null.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=7)
-    total, items = get_orders(db, user.account_id, from_date, to_date, limit, offset, utm_source)
-    
-    # Calculate summary stats
-    total_revenue = sum(item.get("total_amount", 0) for item in items)
-    aov = total_revenue / len(items) if items else 0
-    
-    return {
-        "total": total, 
-        "items": items,
-        "page": (offset // limit) + 1,
-        "per_page": limit,
-        "total_revenue": round(total_revenue, 2),
-        "total_orders": total,
-        "aov": round(aov, 2),
-    }
+    if (after_date_time is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_date_time and after_id must be given together",
+        )
+    from_date, to_date = dates
+    batches = iter_orders(
+        db, user.account_id, from_date, to_date, limit, offset, utm_source, after_date_time, after_id
+    )
+    # Run the query before the 200 goes out, so a failing statement surfaces
+    # as an error response rather than a truncated body
+    first = next(batches, None)
+    batches = itertools.chain([] if first is None else [first], batches)
+
+    def body():
+        # Rows are encoded and sent batch by batch; the summary fields, which
+        # need every row, close the object
+        yield b'{"items":['
+        total, count, total_revenue, last = None, 0, 0.0, None
+        for total, items in batches:
+            for item in items:
+                yield (b"," if count else b"") + orjson.dumps(item)
+                count += 1
+                total_revenue += item["total_amount"]
+                last = item
+        aov = total_revenue / count if count else 0
+        summary = orjson.dumps({
+            "total": total,
+            "page": (offset // limit) + 1,
+            "per_page": limit,
+            "total_revenue": round(total_revenue, 2),
+            "total_orders": total,
+            "aov": round(aov, 2),
+            "next_after_date_time": last["date_time"] if count == limit else None,
+            "next_after_id": last["id"] if count == limit else None,
+        })
+        yield b"]," + summary[1:]
+
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.get("/orders/summary", response_model=OrdersSummary)
 def orders_summary_endpoint(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get orders summary with attribution breakdown.
     
     Returns aggregate stats and breakdown by source.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_orders_summary(db, user.account_id, from_date, to_date)
 
 
 @router.get("/orders/list", response_model=OrdersListResponse)
 def orders_list_endpoint(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     channel: Optional[str] = Query(None, description="Filter by channel/utm_source"),
     search: Optional[str] = Query(None, description="Search by order ID or customer"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get paginated orders list with filtering and search.
@@ -350,65 +362,54 @@ def orders_list_endpoint(
     Supports filtering by channel (utm_source) and search by order ID.
     Returns paginated list with total count for pagination controls.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_orders_list(db, user.account_id, from_date, to_date, channel, search, page, page_size)
 
 
 @router.get("/breakdown/platform")
 def platform_breakdown(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get spend and performance breakdown by platform.
     
     Legacy endpoint - prefer /channels for new integrations.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_platform_breakdown(db, user.account_id, from_date, to_date)
 
 
 @router.get("/daily")
 def daily_performance(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     platform: Optional[str] = Query(None),
     metrics: List[str] = Query(["spend", "revenue", "roas"], description="Metrics to include"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get daily performance data for charts.
     
     Legacy endpoint - prefer /timeseries for new integrations.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_daily_performance(db, user.account_id, from_date, to_date, platform, metrics)
 
 
 @router.get("/top-performers", response_model=List[TopPerformerItem])
 def top_performers(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     metric: str = Query("spend", description="Metric to rank by: spend, conversions, clicks"),
     limit: int = Query(5, ge=1, le=20),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get top performing campaigns by a specific metric.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     return get_top_performers(db, user.account_id, from_date, to_date, metric, limit)
 
 
@@ -416,12 +417,11 @@ def top_performers(
 
 @router.get("/attribution")
 def attribution_report(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     model: str = Query("linear", description="Attribution model: first_touch, last_touch, linear, time_decay, position_based"),
     lookback_days: int = Query(30, ge=1, le=90, description="Days to look back for touchpoints"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get multi-touch attribution report.
@@ -433,9 +433,7 @@ def attribution_report(
     - time_decay: More credit to recent touchpoints
     - position_based: 40% first, 40% last, 20% middle
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     try:
         attribution_model = AttributionModel(model)
@@ -450,39 +448,33 @@ def attribution_report(
 
 @router.get("/attribution/compare")
 def compare_models(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Compare attribution results across different models.
     
     Useful for understanding how different attribution models affect channel credit.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     return compare_attribution_models(db, user.account_id, from_date, to_date)
 
 
 @router.get("/attribution/paths")
 def conversion_paths(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_30d),
     limit: int = Query(20, ge=1, le=50, description="Number of top paths to return"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get most common conversion paths.
     
     Shows the sequence of touchpoints customers take before converting.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+    from_date, to_date = dates
     
     return get_conversion_paths(db, user.account_id, from_date, to_date, limit)
 
@@ -491,21 +483,18 @@ def conversion_paths(
 
 @router.get("/cohorts/retention")
 def retention_cohorts(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_365d),
     period: str = Query("monthly", description="Cohort period: daily, weekly, monthly"),
     max_periods: int = Query(12, ge=1, le=24, description="Maximum periods to track"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get retention cohort analysis.
     
     Groups customers by their first purchase date and tracks repeat purchase rates over time.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=365)
+    from_date, to_date = dates
     
     try:
         cohort_period = CohortPeriod(period)
@@ -520,21 +509,18 @@ def retention_cohorts(
 
 @router.get("/cohorts/revenue")
 def revenue_cohorts(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_365d),
     period: str = Query("monthly", description="Cohort period: daily, weekly, monthly"),
     max_periods: int = Query(12, ge=1, le=24, description="Maximum periods to track"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get revenue-focused cohort analysis.
     
     Shows cumulative revenue and LTV estimates for each cohort over time.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=365)
+    from_date, to_date = dates
     
     try:
         cohort_period = CohortPeriod(period)
@@ -549,20 +535,17 @@ def revenue_cohorts(
 
 @router.get("/cohorts/by-channel")
 def channel_cohorts(
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
+    dates: Tuple[date, date] = Depends(resolved_range_365d),
     period: str = Query("monthly", description="Cohort period: daily, weekly, monthly"),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_account_user),
+    db: Session = Depends(get_db_ro),
+    user=Depends(get_current_user_lite),
 ):
     """
     Get cohort analysis segmented by acquisition channel.
     
     Shows how retention and LTV vary by the channel that acquired the customer.
     """
-    if not from_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=365)
+    from_date, to_date = dates
     
     try:
         cohort_period = CohortPeriod(period)
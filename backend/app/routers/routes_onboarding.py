@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.models.user import User
-from app.models.account import Account, DEFAULT_ONBOARDING_STEPS
+from app.models.account import Account, DEFAULT_ONBOARDING_STEPS, ONBOARDING_STEP_COLUMNS
 from app.routers.deps import get_current_account_user, get_db
 from app.schemas.onboarding import (
     OnboardingStatusResponse,
@@ -21,8 +21,8 @@ router = APIRouter()
 
 
 def get_account_for_user(db: Session, user: User) -> Account:
-    """Get the account for the authenticated user."""
-    account = db.query(Account).filter(Account.id == user.account_id).first()
+    """Get the account for the authenticated user (joined in by the auth dependency)."""
+    account = user.account
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,12 +31,6 @@ def get_account_for_user(db: Session, user: User) -> Account:
     return account
 
 
-def check_all_steps_completed(steps: dict) -> bool:
-    """Check if all required onboarding steps are completed."""
-    required_steps = ["created_workspace", "connected_integration", "viewed_dashboard"]
-    return all(steps.get(step, False) for step in required_steps)
-
-
 @router.get("/status", response_model=OnboardingStatusResponse)
 def get_onboarding_status(
     db: Session = Depends(get_db),
@@ -48,17 +42,9 @@ def get_onboarding_status(
     """
     account = get_account_for_user(db, current_user)
     
-    # Ensure onboarding_steps has all required keys
-    steps = account.onboarding_steps or {}
-    normalized_steps = {
-        "created_workspace": steps.get("created_workspace", False),
-        "connected_integration": steps.get("connected_integration", False),
-        "viewed_dashboard": steps.get("viewed_dashboard", False),
-    }
-    
     return OnboardingStatusResponse(
         onboarding_completed=account.onboarding_completed,
-        steps=OnboardingSteps(**normalized_steps)
+        steps=OnboardingSteps(**account.onboarding_steps)
     )
 
 
@@ -70,42 +56,30 @@ def complete_onboarding_step(
 ):
     """
     Mark an onboarding step as completed for the current workspace.
-    If all critical steps are done, automatically sets onboarding_completed to True.
+    Once all steps are done, onboarding_completed becomes True.
     """
     account = get_account_for_user(db, current_user)
     
-    # Get current steps or initialize
-    steps = account.onboarding_steps or DEFAULT_ONBOARDING_STEPS.copy()
-    
     # Mark the step as completed
-    if body.step in steps:
-        steps[body.step] = True
-    else:
+    column = ONBOARDING_STEP_COLUMNS.get(body.step)
+    if column is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid onboarding step: {body.step}"
         )
+    was_completed = account.onboarding_completed
+    setattr(account, column, True)
     
-    # Update the account
-    account.onboarding_steps = steps
-    
-    # Check if all steps are completed
-    if check_all_steps_completed(steps):
-        account.onboarding_completed = True
-        logger.info(f"Onboarding completed for account {account.id}")
-    
+    # onboarding_completed is a generated column; the refresh picks up its new value
     db.commit()
     db.refresh(account)
     
-    normalized_steps = {
-        "created_workspace": steps.get("created_workspace", False),
-        "connected_integration": steps.get("connected_integration", False),
-        "viewed_dashboard": steps.get("viewed_dashboard", False),
-    }
+    if account.onboarding_completed and not was_completed:
+        logger.info(f"Onboarding completed for account {account.id}")
     
     return OnboardingStatusResponse(
         onboarding_completed=account.onboarding_completed,
-        steps=OnboardingSteps(**normalized_steps)
+        steps=OnboardingSteps(**account.onboarding_steps)
     )
 
 
@@ -120,9 +94,9 @@ def reset_onboarding(
     """
     account = get_account_for_user(db, current_user)
     
-    # Reset to defaults
-    account.onboarding_completed = False
-    account.onboarding_steps = DEFAULT_ONBOARDING_STEPS.copy()
+    # Reset to defaults; onboarding_completed follows the step flags
+    for column in ONBOARDING_STEP_COLUMNS.values():
+        setattr(account, column, False)
     
     db.commit()
     db.refresh(account)
@@ -32,7 +32,7 @@ def get_team(
     current_user: User = Depends(get_current_user)
 ):
     """Get team information including members and pending invites."""
-    account = db.query(Account).filter(Account.id == current_user.account_id).first()
+    account = current_user.account
     members = team_service.get_team_members(db, current_user.account_id)
     pending_invites = team_service.get_pending_invites(db, current_user.account_id)
     
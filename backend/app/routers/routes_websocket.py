@@ -26,7 +26,7 @@ async def get_user_from_token(token: str, db: Session) -> Optional[User]:
     try:
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET_KEY,
+            settings.JWT_SECRET_KEY.get_secret_value(),
             algorithms=[settings.JWT_ALGORITHM]
         )
         user_id = payload.get("sub")
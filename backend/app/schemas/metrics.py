@@ -1,5 +1,5 @@
 from typing import List, Optional
-from datetime import date as DateType
+from datetime import date as DateType, datetime
 
 from pydantic import BaseModel, Field
 
@@ -133,6 +133,21 @@ class OrderEntry(BaseModel):
     attribution: Optional[OrderAttribution] = None
 
 
+class OrderItem(BaseModel):
+    """Order row as returned by the /metrics/orders list."""
+    id: str
+    external_order_id: str
+    date_time: datetime
+    total_amount: float
+    currency: str
+    utm_source: Optional[str] = None
+    utm_campaign: Optional[str] = None
+    source_platform: str
+
+    class Config:
+        from_attributes = True
+
+
 class OrdersResponse(BaseModel):
     """Response for orders endpoint with pagination."""
     items: List[OrderEntry]
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -8,6 +11,7 @@ from fastapi.security import OAuth2PasswordBearer
 
 from app.config import settings
 
+JWT_SECRET_KEY = settings.JWT_SECRET_KEY.get_secret_value()
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
@@ -31,7 +35,7 @@ def create_access_token(subject: str, expires_minutes: Optional[int] = None) ->
     payload: dict[str, Any] = {"sub": subject, "exp": expire}
     token = jwt.encode(
         payload,
-        settings.JWT_SECRET_KEY,
+        JWT_SECRET_KEY,
         algorithm=JWT_ALGORITHM,
     )
     return token
@@ -42,6 +46,48 @@ class TokenData:
         self.sub = sub
 
 
+# Every authenticated request re-presents the same token, and a token's claims
+# never change, so successful decodes are memoized by the raw token string.
+# Entries live until the token's exp or the TTL, whichever comes first. The
+# cache is per worker, so each worker decodes a token once before caching it.
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_SIZE = 50_000
+
+_token_cache: "OrderedDict[str, tuple[float, TokenData]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _get_cached_token(token: str) -> Optional[TokenData]:
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            # Fall through to a full decode so expiry raises the usual error
+            del _token_cache[token]
+            return None
+        _token_cache.move_to_end(token)
+        return entry[1]
+
+
+def _cache_token(token: str, payload: dict, token_data: TokenData) -> None:
+    expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    with _token_cache_lock:
+        _token_cache[token] = (expires_at, token_data)
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def clear_token_cache() -> None:
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
 def decode_token(token: str) -> Optional[dict]:
     """
     Decode a JWT token without raising exceptions.
@@ -55,7 +101,7 @@ def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET_KEY,
+            JWT_SECRET_KEY,
             algorithms=[JWT_ALGORITHM],
         )
         return payload
@@ -77,11 +123,15 @@ def decode_access_token(token: str = Depends(oauth2_scheme)) -> TokenData:
             detail="Please log in to continue",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    cached = _get_cached_token(token)
+    if cached is not None:
+        return cached
     
     try:
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET_KEY,
+            JWT_SECRET_KEY,
             algorithms=[JWT_ALGORITHM],
         )
         sub: Optional[str] = payload.get("sub")
@@ -93,7 +143,9 @@ def decode_access_token(token: str = Depends(oauth2_scheme)) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return TokenData(sub=sub)
+        token_data = TokenData(sub=sub)
+        _cache_token(token, payload, token_data)
+        return token_data
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(
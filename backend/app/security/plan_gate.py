@@ -131,7 +131,7 @@ def require_feature(feature: str):
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db),
     ):
-        account = db.query(Account).filter(Account.id == current_user.account_id).first()
+        account = current_user.account
         if not account:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -161,7 +161,7 @@ def require_plan(*plans: AccountPlan):
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db),
     ):
-        account = db.query(Account).filter(Account.id == current_user.account_id).first()
+        account = current_user.account
         if not account:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
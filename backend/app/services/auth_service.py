@@ -1,8 +1,13 @@
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import bindparam, lambda_stmt, select
 from sqlalchemy.orm import Session
 
+from app.db import new_id
 from app.models.account import Account
 from app.models.user import User
 from app.security.jwt import create_access_token
@@ -10,88 +15,126 @@ from app.security.password import hash_password, verify_password
 from app.services import events_service
 
 
+class CurrentUser(NamedTuple):
+    """The columns most account-scoped routes need, without a full ORM User."""
+    id: str
+    email: str
+    account_id: Optional[str]
+
+
+# A page load fans out to several authenticated endpoints for the same user, so
+# id/email/account_id are cached per process for a few seconds. Each worker has
+# its own cache: invalidate_cached_user only clears the worker that made a change,
+# so others can serve the old user for up to USER_CACHE_TTL_SECONDS.
+USER_CACHE_TTL_SECONDS = 30
+USER_CACHE_MAX_SIZE = 10_000
+
+_user_cache: "OrderedDict[str, tuple[float, CurrentUser]]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+# Built once; lambda_stmt caches the compiled SQL under the lambda's code object
+_USER_COLUMNS_STMT = lambda_stmt(
+    lambda: select(User.id, User.email, User.account_id).where(User.id == bindparam("user_id"))
+)
+
+
+def get_cached_user(db: Session, user_id: str) -> Optional[CurrentUser]:
+    """Load a user's id, email and account_id, serving repeat lookups from the in-process cache."""
+    now = time.monotonic()
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is not None and entry[0] > now:
+            _user_cache.move_to_end(user_id)
+            return entry[1]
+
+    row = db.execute(_USER_COLUMNS_STMT, {"user_id": user_id}).first()
+    if row is None:
+        return None
+
+    user = CurrentUser(*row)
+    with _user_cache_lock:
+        _user_cache[user_id] = (now + USER_CACHE_TTL_SECONDS, user)
+        _user_cache.move_to_end(user_id)
+        while len(_user_cache) > USER_CACHE_MAX_SIZE:
+            _user_cache.popitem(last=False)
+    return user
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the cache after their email, account or credentials change."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def clear_user_cache() -> None:
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
 def signup(db: Session, email: str, password: str, account_name: str) -> str:
     from sqlalchemy import text
-    import uuid
     
     normalized_email = email.strip().lower()
     normalized_account_name = account_name.strip()
 
-    # Use raw SQL to avoid selecting columns that may not exist yet (password_reset_token, etc.)
-    result = db.execute(
-        text("SELECT id FROM users WHERE email = :email LIMIT 1"),
-        {"email": normalized_email}
-    )
-    if result.fetchone():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="An account with this email already exists. Please log in instead.",
-        )
+    account_id = new_id()
+    user_id = new_id()
+    params = {
+        "account_id": account_id,
+        "name": normalized_account_name,
+        "type": "business",
+        "plan": "FREE",
+        "max_users": 1,
+        "user_id": user_id,
+        "email": normalized_email,
+        "password_hash": hash_password(password),
+        "role": "owner",
+    }
 
-    # Create account with only the core fields that exist in the database
-    # Use raw SQL to avoid issues with columns that may not exist yet
-    from sqlalchemy import text
-    import uuid
-    
-    account_id = str(uuid.uuid4())
-    
-    # Check if onboarding columns exist
-    try:
-        result = db.execute(text("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'accounts' AND column_name = 'onboarding_completed'
-        """))
-        has_onboarding_columns = result.fetchone() is not None
-    except Exception:
-        has_onboarding_columns = False
-    
-    # Insert based on whether onboarding columns exist
-    if has_onboarding_columns:
-        db.execute(
+    # Account and owner are created together; the unique email index decides
+    # concurrent signups, so there is no separate existence check.
+    # Onboarding step flags default to false and onboarding_completed is generated from them
+    if db.get_bind().dialect.name == "postgresql":
+        created = db.execute(
             text("""
-                INSERT INTO accounts (id, name, type, plan, max_users, onboarding_completed, onboarding_steps)
-                VALUES (:id, :name, :type, :plan, :max_users, :onboarding_completed, :onboarding_steps)
+                WITH new_account AS (
+                    INSERT INTO accounts (id, name, type, plan, max_users)
+                    SELECT :account_id, :name, :type, :plan, :max_users
+                    WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = :email)
+                    RETURNING id
+                )
+                INSERT INTO users (id, email, password_hash, account_id, role)
+                SELECT :user_id, :email, :password_hash, id, :role FROM new_account
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
             """),
-            {
-                "id": account_id,
-                "name": normalized_account_name,
-                "type": "business",
-                "plan": "FREE",
-                "max_users": 1,
-                "onboarding_completed": False,
-                "onboarding_steps": '{"created_workspace": false, "connected_integration": false, "viewed_dashboard": false}'
-            }
-        )
+            params,
+        ).scalar()
     else:
         db.execute(
             text("""
                 INSERT INTO accounts (id, name, type, plan, max_users)
-                VALUES (:id, :name, :type, :plan, :max_users)
+                VALUES (:account_id, :name, :type, :plan, :max_users)
             """),
-            {
-                "id": account_id,
-                "name": normalized_account_name,
-                "type": "business",
-                "plan": "FREE",
-                "max_users": 1,
-            }
+            params,
         )
+        created = db.execute(
+            text("""
+                INSERT INTO users (id, email, password_hash, account_id, role)
+                VALUES (:user_id, :email, :password_hash, :account_id, :role)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
+            """),
+            params,
+        ).scalar()
 
-    # Create user with raw SQL to avoid issues with columns that may not exist
-    user_id = str(uuid.uuid4())
-    db.execute(
-        text("""
-            INSERT INTO users (id, email, password_hash, account_id, role)
-            VALUES (:id, :email, :password_hash, :account_id, :role)
-        """),
-        {
-            "id": user_id,
-            "email": normalized_email,
-            "password_hash": hash_password(password),
-            "account_id": account_id,
-            "role": "owner",
-        }
-    )
+    if created is None:
+        # Also discards an account inserted by a signup that lost the race
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An account with this email already exists. Please log in instead.",
+        )
     db.commit()
 
     # Track signup completed event
@@ -193,6 +236,7 @@ def reset_password(db: Session, token: str, new_password: str) -> bool:
     target_user.password_reset_token = None
     target_user.password_reset_expires = None
     db.commit()
+    invalidate_cached_user(target_user.id)
     
     return True
 
@@ -307,6 +351,7 @@ def update_email(db: Session, user: User, new_email: str) -> None:
         {"email": normalized_email, "user_id": user.id}
     )
     db.commit()
+    invalidate_cached_user(user.id)
 
 
 def update_password(db: Session, user: User, current_password: str, new_password: str) -> None:
@@ -338,6 +383,7 @@ def update_password(db: Session, user: User, current_password: str, new_password
         {"password_hash": hash_password(new_password), "user_id": user.id}
     )
     db.commit()
+    invalidate_cached_user(user.id)
 
 
 def get_account_name(db: Session, account_id: str) -> Optional[str]:
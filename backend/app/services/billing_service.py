@@ -3,16 +3,25 @@ Service layer for billing and subscription management.
 Wraps Stripe operations and handles subscription state.
 """
 
+import hashlib
+import hmac
+import time
 from datetime import datetime
 from typing import Optional
 
 import stripe
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.subscription import Subscription
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
+stripe.api_key = settings.STRIPE_SECRET_KEY.get_secret_value() if settings.STRIPE_SECRET_KEY else None
+
+# Same replay window the Stripe SDK uses for webhook timestamps
+WEBHOOK_TOLERANCE_SECONDS = 300
 
 
 def is_stripe_configured() -> bool:
@@ -151,6 +160,41 @@ def get_subscription_status(
     }
 
 
+def verify_webhook_signature(
+    payload: bytes,
+    signature_header: Optional[str],
+    secret: str,
+    tolerance: int = WEBHOOK_TOLERANCE_SECONDS,
+) -> bool:
+    """
+    Check a Stripe-Signature header ("t=<timestamp>,v1=<hex>,...") against the raw body.
+    Hashes the payload once, without the SDK building an Event object from it.
+    """
+    if not signature_header:
+        return False
+
+    timestamp = None
+    signatures = []
+    for item in signature_header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+    if not timestamp or not signatures:
+        return False
+
+    try:
+        signed_at = int(timestamp)
+    except ValueError:
+        return False
+    if tolerance and time.time() - signed_at > tolerance:
+        return False
+
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + payload, hashlib.sha256).hexdigest()
+    return any(hmac.compare_digest(expected, signature) for signature in signatures)
+
+
 def update_subscription_from_webhook(
     db: Session,
     account_id: str,
@@ -162,24 +206,26 @@ def update_subscription_from_webhook(
 ) -> Subscription:
     """
     Update or create subscription record from Stripe webhook data.
+    A single INSERT ... ON CONFLICT (account_id) DO UPDATE, so concurrent
+    events for the same account can't race; the caller commits.
     """
-    sub = db.query(Subscription).filter(Subscription.account_id == account_id).first()
-
-    if not sub:
-        sub = Subscription(account_id=account_id)
-        db.add(sub)
-
-    sub.stripe_customer_id = stripe_customer_id
-    sub.stripe_subscription_id = stripe_subscription_id
-    sub.plan = plan
-    sub.status = status
-    sub.current_period_end = current_period_end
-    sub.updated_at = datetime.utcnow()
+    values = {
+        "stripe_customer_id": stripe_customer_id,
+        "stripe_subscription_id": stripe_subscription_id,
+        "plan": plan,
+        "status": status,
+    }
+    if current_period_end is not None:
+        values["current_period_end"] = current_period_end
 
-    db.commit()
-    db.refresh(sub)
+    insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Subscription).values(account_id=account_id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Subscription.account_id],
+        set_={**values, "updated_at": func.now()},
+    ).returning(Subscription)
 
-    return sub
+    return db.scalars(stmt, execution_options={"populate_existing": True}).one()
 
 
 def cancel_subscription(
@@ -35,10 +35,16 @@ CACHE_TTL = {
     "cohorts": timedelta(hours=1),
     "custom_report": timedelta(minutes=10),
     "metadata": timedelta(hours=24),
+    "integrations": timedelta(minutes=1),
     "default": timedelta(minutes=5),
 }
 
 
+# Connected integrations as read by the hourly sync; every instance's scheduler
+# scans at about the same time, so one query serves them all
+ACTIVE_INTEGRATIONS_KEY = "omnitrackiq:integrations:active"
+
+
 class CacheService:
     """Redis-based caching service with graceful fallback."""
     
@@ -175,6 +181,10 @@ class CacheService:
             deleted += self.delete_pattern(f"{prefix}:{account_id}:*")
         return deleted
     
+    def invalidate_integrations(self) -> bool:
+        """Invalidate the connected integrations list after one is connected or disconnected."""
+        return self.delete(ACTIVE_INTEGRATIONS_KEY)
+    
     def get_stats(self) -> dict:
         """Get cache statistics."""
         if not self.enabled:
@@ -1,7 +1,6 @@
 """
 Service for custom report management and execution.
 """
-import json
 from datetime import date, datetime, timedelta
 from typing import List, Optional, Tuple, Dict, Any
 from collections import defaultdict
@@ -110,7 +109,7 @@ def create_custom_report(
         user_id=user_id,
         name=data.name,
         description=data.description,
-        config_json=json.dumps(data.config.model_dump()),
+        config_json=data.config.model_dump(),
         visualization_type=data.visualization_type,
         is_shared=data.is_shared,
         is_favorite=data.is_favorite,
@@ -139,7 +138,7 @@ def update_custom_report(
         report.description = data.description
     
     if data.config is not None:
-        report.config_json = json.dumps(data.config.model_dump())
+        report.config_json = data.config.model_dump()
     
     if data.visualization_type is not None:
         report.visualization_type = data.visualization_type
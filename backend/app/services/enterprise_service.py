@@ -2,6 +2,7 @@
 Enterprise service for SSO, audit logging, and enterprise features.
 """
 import hashlib
+import ipaddress
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -162,6 +163,14 @@ def log_audit_event(
     severity: AuditLogSeverity = AuditLogSeverity.INFO,
 ) -> AuditLog:
     """Create an audit log entry."""
+    # ip_address is an INET column on Postgres; drop anything that isn't an address
+    # (e.g. proxy placeholders or the test client's "testclient" host)
+    if ip_address is not None:
+        try:
+            ip_address = str(ipaddress.ip_address(ip_address))
+        except ValueError:
+            ip_address = None
+
     log = AuditLog(
         account_id=account_id,
         user_id=user_id,
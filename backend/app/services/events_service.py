@@ -1,13 +1,13 @@
 """Product events service for analytics tracking."""
 import json
 import logging
-import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.db import new_id
 from app.models.product_event import ProductEvent, ALLOWED_EVENT_NAMES
 
 logger = logging.getLogger("omnitrackiq.events")
@@ -127,7 +127,7 @@ def track_event(
     
     try:
         # Use raw SQL to avoid potential ORM issues with nullable columns
-        event_id = str(uuid.uuid4())
+        event_id = new_id()
         created_at = datetime.utcnow()
         
         db.execute(
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.integration import Integration
+from app.services.cache_service import cache
 
 
 # OAuth token endpoints for each platform
@@ -39,6 +40,7 @@ async def exchange_code_for_token(
     # Get client credentials from settings
     client_id = getattr(settings, f"{platform.upper()}_CLIENT_ID", None)
     client_secret = getattr(settings, f"{platform.upper()}_CLIENT_SECRET", None)
+    client_secret = client_secret.get_secret_value() if client_secret else None
     
     if not client_id or not client_secret:
         raise ValueError(f"OAuth credentials not configured for {platform}")
@@ -95,6 +97,7 @@ async def refresh_access_token(
 
     client_id = getattr(settings, f"{platform.upper()}_CLIENT_ID", None)
     client_secret = getattr(settings, f"{platform.upper()}_CLIENT_SECRET", None)
+    client_secret = client_secret.get_secret_value() if client_secret else None
 
     if platform in ["google_ads", "ga4"]:
         data = {
@@ -160,6 +163,7 @@ def save_integration(
     integration.updated_at = datetime.utcnow()
 
     db.commit()
+    cache.invalidate_integrations()
     db.refresh(integration)
 
     return integration
@@ -227,5 +231,6 @@ def disconnect_integration(
     integration.updated_at = datetime.utcnow()
 
     db.commit()
+    cache.invalidate_integrations()
 
     return True
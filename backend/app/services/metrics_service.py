@@ -1,12 +1,14 @@
-from datetime import date
-from typing import Tuple, Optional, List
+from datetime import date, datetime
+from typing import Iterator, Tuple, Optional, List
 from collections import defaultdict
 
-from sqlalchemy import func, desc
+from pydantic import TypeAdapter
+from sqlalchemy import func, desc, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.ad_spend import AdSpend
 from app.models.order import Order
+from app.schemas.metrics import OrderItem
 
 # Platform display names
 PLATFORM_LABELS = {
@@ -179,7 +181,15 @@ def get_campaigns(
     return results
 
 
-def get_orders(
+# Validates ORM rows and dumps them to dicts in pydantic-core, no per-row Python dict building
+_order_items_adapter = TypeAdapter(List[OrderItem])
+
+
+# Rows fetched per round from the cursor while streaming an orders page
+ORDERS_YIELD_PER = 100
+
+
+def iter_orders(
     db: Session,
     account_id: str,
     date_from: date,
@@ -187,33 +197,72 @@ def get_orders(
     limit: int = 50,
     offset: int = 0,
     utm_source: Optional[str] = None,
-) -> Tuple[int, list]:
-    """Get orders with pagination and filtering."""
-    query = db.query(Order).filter(
-        Order.account_id == account_id, 
-        Order.date_time.between(date_from, date_to)
-    )
-    
-    if utm_source:
-        query = query.filter(Order.utm_source == utm_source)
-    
-    total = query.count()
-    rows = query.order_by(Order.date_time.desc()).offset(offset).limit(limit).all()
-    
-    items = [
-        {
-            "id": o.id,
-            "external_order_id": o.external_order_id,
-            "date_time": o.date_time.isoformat(),
-            "total_amount": float(o.total_amount),
-            "currency": o.currency,
-            "utm_source": o.utm_source,
-            "utm_campaign": o.utm_campaign,
-            "source_platform": o.source_platform,
-        }
-        for o in rows
+    after_date_time: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+) -> Iterator[Tuple[Optional[int], list]]:
+    """
+    Stream a page of orders as (total, items) batches of up to ORDERS_YIELD_PER rows.
+
+    The total comes from COUNT(*) OVER() on the page query itself, so only one
+    statement runs. Passing after_date_time/after_id (the last row of the previous
+    page) switches to keyset pagination: offset is ignored and no total is
+    computed, so deep pages cost the same as the first one.
+    An empty page still yields one batch so callers get the total.
+    """
+    keyset = after_date_time is not None and after_id is not None
+    filters = [
+        Order.account_id == account_id,
+        Order.date_time.between(date_from, date_to),
     ]
-    
+    if utm_source:
+        filters.append(Order.utm_source == utm_source)
+
+    if keyset:
+        stmt = select(Order).where(
+            *filters, tuple_(Order.date_time, Order.id) < tuple_(after_date_time, after_id)
+        )
+    else:
+        stmt = select(Order, func.count().over().label("total_count")).where(*filters).offset(offset)
+    stmt = stmt.order_by(Order.date_time.desc(), Order.id.desc()).limit(limit)
+
+    # yield_per uses a server-side cursor, so only one batch of rows is held at a time
+    result = db.execute(stmt.execution_options(yield_per=ORDERS_YIELD_PER))
+    empty = True
+    for rows in result.partitions():
+        empty = False
+        total = None if keyset else rows[0].total_count
+        orders = [row.Order for row in rows]
+        # date_time stays a datetime; the route's orjson encoding handles it
+        yield total, _order_items_adapter.dump_python(
+            _order_items_adapter.validate_python(orders, from_attributes=True)
+        )
+
+    if empty:
+        if keyset:
+            total = None
+        else:
+            # Past the last page the window has no row to report the count on
+            total = db.execute(select(func.count(Order.id)).where(*filters)).scalar() if offset else 0
+        yield total, []
+
+
+def get_orders(
+    db: Session,
+    account_id: str,
+    date_from: date,
+    date_to: date,
+    limit: int = 50,
+    offset: int = 0,
+    utm_source: Optional[str] = None,
+    after_date_time: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+) -> Tuple[Optional[int], list]:
+    """Get orders with pagination and filtering (see iter_orders)."""
+    total, items = None, []
+    for total, batch in iter_orders(
+        db, account_id, date_from, date_to, limit, offset, utm_source, after_date_time, after_id
+    ):
+        items.extend(batch)
     return total, items
 
 
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.models.notification_preference import (
     NotificationPreference,
     NotificationLog,
+    NotificationUnreadCount,
     AlertType,
     NotificationChannel,
 )
@@ -78,16 +79,30 @@ def get_notifications(
         query = query.filter(NotificationLog.read_at.is_(None))
     
     total = query.count()
-    unread_count = db.query(NotificationLog).filter(
-        NotificationLog.user_id == user_id,
-        NotificationLog.read_at.is_(None)
-    ).count()
+    unread_count = get_unread_count(db, user_id)
     
     items = query.order_by(NotificationLog.sent_at.desc()).offset(offset).limit(limit).all()
     
     return items, total, unread_count
 
 
+def get_unread_count(db: Session, user_id: str) -> int:
+    """
+    Get the number of unread notifications for a user.
+    On Postgres this reads the trigger-maintained counter instead of counting rows.
+    """
+    if db.bind.dialect.name == "postgresql":
+        unread = db.query(NotificationUnreadCount.unread).filter(
+            NotificationUnreadCount.user_id == user_id
+        ).scalar()
+        return unread or 0
+    
+    return db.query(NotificationLog).filter(
+        NotificationLog.user_id == user_id,
+        NotificationLog.read_at.is_(None)
+    ).count()
+
+
 def mark_notifications_read(
     db: Session,
     user_id: str,
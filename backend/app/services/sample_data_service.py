@@ -7,6 +7,7 @@ from datetime import date, timedelta
 from typing import List
 from sqlalchemy.orm import Session
 
+from app.db import new_id
 from app.models.ad_spend import AdSpend
 from app.models.order import Order
 from app.models.order_item import OrderItem
@@ -132,7 +133,7 @@ def generate_sample_orders(
             utm_campaign = random.choice(UTM_CAMPAIGNS) if utm_source else None
             
             # Create order with placeholder amount (will update after items)
-            order_id = str(uuid.uuid4())
+            order_id = new_id()
             order = Order(
                 id=order_id,
                 account_id=account_id,
@@ -1,7 +1,6 @@
 """
 Service for saved view management.
 """
-import json
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
@@ -81,7 +80,7 @@ def create_saved_view(
         name=data.name,
         view_type=data.view_type,
         description=data.description,
-        config_json=json.dumps(data.config.model_dump()),
+        config_json=data.config.model_dump(),
         is_shared="true" if data.is_shared else "private",
         is_default="true" if data.is_default else "false",
     )
@@ -109,7 +108,7 @@ def update_saved_view(
         view.description = data.description
     
     if data.config is not None:
-        view.config_json = json.dumps(data.config.model_dump())
+        view.config_json = data.config.model_dump()
     
     if data.is_shared is not None:
         view.is_shared = "true" if data.is_shared else "private"
@@ -159,7 +158,7 @@ def get_default_view(
 
 def view_to_response(view: SavedView) -> dict:
     """Convert a SavedView model to response dict."""
-    config = json.loads(view.config_json) if view.config_json else {}
+    config = view.config_json or {}
     return {
         "id": view.id,
         "name": view.name,
@@ -2,7 +2,7 @@ import stripe
 
 from app.config import settings
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
+stripe.api_key = settings.STRIPE_SECRET_KEY.get_secret_value() if settings.STRIPE_SECRET_KEY else None
 
 PLANS = {
     "starter": "price_starter_placeholder",
@@ -15,6 +15,7 @@ from app.models.team_invite import TeamInvite, InviteStatus
 from app.security.password import hash_password
 from app.security.jwt import create_access_token
 from app.security.rbac import get_plan_limit
+from app.services.auth_service import invalidate_cached_user
 from app.services.notification_service import send_team_invite_notification
 
 logger = logging.getLogger(__name__)
@@ -105,6 +106,7 @@ def remove_team_member(
     
     db.delete(user)
     db.commit()
+    invalidate_cached_user(user.id)
     return True
 
 
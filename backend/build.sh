@@ -58,13 +58,14 @@ try:
             versions = [row[0] for row in result.fetchall()]
             print(f"Found versions: {versions}")
             
-            def get_num(v):
-                try:
-                    return int(v.split('_')[0])
-                except:
-                    return 0
-            
-            latest = sorted(versions, key=get_num, reverse=True)[0]
+            # Rank by position in the revision graph (ids like 789cabcc7b4b don't sort numerically)
+            from alembic.config import Config
+            from alembic.script import ScriptDirectory
+            position = {
+                script.revision: index
+                for index, script in enumerate(ScriptDirectory.from_config(Config("alembic.ini")).walk_revisions())
+            }
+            latest = min(versions, key=lambda v: position.get(v, len(position)))
             print(f"Keeping: {latest}")
             
             conn.execute(text("DELETE FROM alembic_version"))
@@ -28,18 +28,21 @@ from sqlalchemy.pool import StaticPool
 
 # Import all models to ensure they're registered with Base.metadata BEFORE app
 # This import must happen first to avoid shadowing the FastAPI app instance
-import app.models as _models  # noqa: F401
+import app.models as _models
+
+_models.load_all()
 
 from app.main import app
 from app.db import Base
-from app.routers.deps import get_db
+from app.routers.deps import get_db, get_db_ro
 from app.models.user import User
 from app.models.account import Account, AccountPlan
 from app.models.ad_spend import AdSpend
 from app.models.order import Order
 from app.models.product_event import ProductEvent  # Ensure table is created
-from app.security.jwt import create_access_token
+from app.security.jwt import clear_token_cache, create_access_token
 from app.security.password import hash_password
+from app.services.auth_service import clear_user_cache
 
 
 # Create test database engine
@@ -67,6 +70,9 @@ def override_get_db() -> Generator[Session, None, None]:
 def db() -> Generator[Session, None, None]:
     """Create a fresh database for each test."""
     Base.metadata.create_all(bind=engine)
+    # Users are recreated with the same ids in every test
+    clear_user_cache()
+    clear_token_cache()
     db = TestingSessionLocal()
     try:
         yield db
@@ -89,6 +95,7 @@ def override_get_db(db: Session):
 def client(db: Session) -> Generator[TestClient, None, None]:
     """Create a test client with database override."""
     app.dependency_overrides[get_db] = override_get_db(db)
+    app.dependency_overrides[get_db_ro] = override_get_db(db)
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
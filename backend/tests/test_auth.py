@@ -2,6 +2,9 @@
 # MUST import env_setup first
 import tests.env_setup  # noqa: F401
 
+import time
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -130,3 +133,61 @@ class TestAuthMe:
             headers={"Authorization": "Bearer invalid-token"},
         )
         assert response.status_code == 401
+
+
+class TestCachedUser:
+    """Tests for the short-lived user cache behind get_current_user_lite."""
+
+    def test_repeat_lookup_is_served_from_cache(self, db: Session, test_user: User):
+        """A second lookup returns the cached row without seeing direct DB changes."""
+        from app.services.auth_service import get_cached_user
+
+        first = get_cached_user(db, test_user.id)
+        assert first.email == test_user.email
+
+        test_user.email = "changed@example.com"
+        db.commit()
+
+        assert get_cached_user(db, test_user.id) == first
+
+    def test_email_update_invalidates_cache(self, db: Session, test_user: User):
+        """update_email drops the cached row so the new email is seen."""
+        from app.services.auth_service import get_cached_user, update_email
+
+        get_cached_user(db, test_user.id)
+        update_email(db, test_user, "new-address@example.com")
+
+        assert get_cached_user(db, test_user.id).email == "new-address@example.com"
+
+    def test_unknown_user_is_not_cached(self, db: Session):
+        """Missing users return None."""
+        from app.services.auth_service import get_cached_user
+
+        assert get_cached_user(db, "missing-user") is None
+
+
+class TestTokenCache:
+    """Tests for the decoded-token cache in decode_access_token."""
+
+    def test_repeat_decode_is_served_from_cache(self, test_user: User):
+        """The same token string decodes once."""
+        from app.security.jwt import create_access_token, decode_access_token
+
+        token = create_access_token(test_user.id)
+        first = decode_access_token(token)
+
+        with patch("app.security.jwt.jwt.decode") as decode:
+            assert decode_access_token(token) is first
+            decode.assert_not_called()
+
+    def test_expired_cache_entry_is_not_served(self, test_user: User):
+        """A cached token stops working once its exp passes."""
+        from fastapi import HTTPException
+        from app.security import jwt as jwt_module
+
+        token = jwt_module.create_access_token(test_user.id, expires_minutes=-1)
+        jwt_module._cache_token(token, {"exp": time.time() - 1}, jwt_module.TokenData(sub=test_user.id))
+
+        with pytest.raises(HTTPException) as exc:
+            jwt_module.decode_access_token(token)
+        assert exc.value.status_code == 401
@@ -231,6 +231,106 @@ class TestStripeWebhook:
         assert response.status_code == 200
 
 
+    def test_webhook_signed_payload_verified_locally(
+        self,
+        client: TestClient,
+        db: Session,
+        test_account: Account,
+    ):
+        """A correctly signed body is verified without going through the Stripe SDK."""
+        import hashlib
+        import hmac
+        import json
+        import time
+
+        from app.config import settings
+
+        payload = json.dumps({
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "subscription": "sub_signed123",
+                    "customer": "cus_signed123",
+                    "metadata": {"account_id": test_account.id, "plan": "pro"},
+                },
+            },
+        }).encode()
+        timestamp = str(int(time.time()))
+        signature = hmac.new(
+            settings.STRIPE_WEBHOOK_SECRET.encode(), timestamp.encode() + b"." + payload, hashlib.sha256
+        ).hexdigest()
+
+        with patch("stripe.Webhook.construct_event") as mock_construct:
+            response = client.post(
+                "/billing/webhook",
+                content=payload,
+                headers={"Stripe-Signature": f"t={timestamp},v1={signature}"},
+            )
+            mock_construct.assert_not_called()
+
+        assert response.status_code == 200
+        assert response.json()["processed"] is True
+        sub = db.query(Subscription).filter(Subscription.account_id == test_account.id).first()
+        assert sub.stripe_subscription_id == "sub_signed123"
+
+    @patch("stripe.Webhook.construct_event")
+    def test_webhook_checkout_completed_upserts_existing_subscription(
+        self,
+        mock_construct: MagicMock,
+        client: TestClient,
+        db: Session,
+        subscription: Subscription,
+    ):
+        """A second checkout for the same account updates its subscription row in place."""
+        mock_construct.return_value = {
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "subscription": "sub_upgraded123",
+                    "customer": "cus_test123",
+                    "metadata": {"account_id": subscription.account_id, "plan": "agency"},
+                },
+            },
+        }
+
+        response = client.post(
+            "/billing/webhook",
+            content=b'{}',
+            headers={"Stripe-Signature": "test_sig"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["processed"] is True
+        rows = db.query(Subscription).filter(Subscription.account_id == subscription.account_id).all()
+        assert len(rows) == 1
+        db.refresh(rows[0])
+        assert rows[0].id == subscription.id
+        assert rows[0].stripe_subscription_id == "sub_upgraded123"
+        assert rows[0].plan == "agency"
+
+    def test_verify_webhook_signature_rejects_bad_or_stale_signatures(self):
+        """Wrong secrets, stale timestamps and malformed headers fail verification."""
+        import hashlib
+        import hmac
+        import time
+
+        from app.services.billing_service import verify_webhook_signature
+
+        payload = b'{"type": "ping"}'
+        timestamp = str(int(time.time()))
+        signature = hmac.new(b"whsec_right", timestamp.encode() + b"." + payload, hashlib.sha256).hexdigest()
+
+        assert verify_webhook_signature(payload, f"t={timestamp},v1={signature}", "whsec_right")
+        assert not verify_webhook_signature(payload, f"t={timestamp},v1={signature}", "whsec_wrong")
+        assert not verify_webhook_signature(b"{}", f"t={timestamp},v1={signature}", "whsec_right")
+        assert not verify_webhook_signature(payload, "test_sig", "whsec_right")
+        assert not verify_webhook_signature(payload, None, "whsec_right")
+
+        stale = str(int(time.time()) - 3600)
+        stale_signature = hmac.new(b"whsec_right", stale.encode() + b"." + payload, hashlib.sha256).hexdigest()
+        assert not verify_webhook_signature(payload, f"t={stale},v1={stale_signature}", "whsec_right")
+
+
 class TestPortal:
     """Tests for POST /billing/portal endpoint."""
 
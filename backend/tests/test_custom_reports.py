@@ -13,19 +13,18 @@ from app.models.user import User
 @pytest.fixture
 def sample_report(db: Session, test_user: User) -> CustomReport:
     """Create a sample custom report."""
-    import json
     report = CustomReport(
         account_id=test_user.account_id,
         user_id=test_user.id,
         name="Test Report",
         description="A test report",
-        config_json=json.dumps({
+        config_json={
             "metrics": ["revenue", "spend"],
             "dimensions": ["platform"],
             "date_range": "30d",
             "filters": [],
             "compare_previous_period": False,
-        }),
+        },
         visualization_type="table",
         is_shared=False,
         is_favorite=False,
@@ -103,8 +102,7 @@ class TestCustomReportsCRUD:
         sample_report: CustomReport,
     ):
         """Test updating a report."""
-        import json
-        config = json.loads(sample_report.config_json)
+        config = dict(sample_report.config_json)
         response = client.put(
             f"/custom-reports/{sample_report.id}",
             headers=auth_headers,
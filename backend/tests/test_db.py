@@ -0,0 +1,29 @@
+"""Tests for shared database helpers."""
+# MUST import env_setup first
+import tests.env_setup  # noqa: F401
+
+import time
+import uuid
+
+from app.db import new_id
+
+
+class TestNewId:
+    """Tests for time-ordered primary key ids."""
+
+    def test_ids_are_uuid7_strings(self):
+        """Ids keep the 36-char UUID text form, with version 7 and the RFC variant."""
+        before_ms = time.time_ns() // 1_000_000
+        value = uuid.UUID(new_id())
+
+        assert len(str(value)) == 36
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 80 >= before_ms
+
+    def test_ids_increase_within_a_millisecond(self):
+        """Ids generated back to back sort in creation order and never repeat."""
+        ids = [new_id() for _ in range(10_000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
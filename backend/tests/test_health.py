@@ -22,3 +22,43 @@ def test_root_endpoint(client: TestClient):
     assert "name" in data
     assert data["name"] == "OmniTrackIQ API"
     assert "docs" in data
+
+
+def test_readiness_reports_failed_migrations(client: TestClient):
+    """Readiness fails while a startup migration has failed."""
+    from app.jobs.migrations import MIGRATION_STATUS
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["migrations"] == "skipped"
+
+    MIGRATION_STATUS.update(state="failed", error="boom")
+    try:
+        data = client.get("/health/ready").json()
+        assert data["status"] == "not_ready"
+        assert data["checks"]["migrations"] == "failed: boom"
+    finally:
+        MIGRATION_STATUS.update(state="skipped", error=None)
+
+
+def test_readiness_waits_for_another_migration_runner(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """While another runner holds the migration lock, readiness fails and the upgrade is retried."""
+    from app.jobs import migrations
+
+    states_seen = []
+
+    def fake_upgrade(config, revision):
+        # env.py sets this when the advisory lock is taken by someone else
+        states_seen.append(client.get("/health/ready").json())
+        config.attributes["migrations_skipped"] = len(states_seen) == 1
+
+    monkeypatch.setattr(migrations.command, "upgrade", fake_upgrade)
+    monkeypatch.setattr(migrations, "MIGRATION_LOCK_RETRY_SECONDS", 0)
+    try:
+        migrations.run_migrations()
+
+        assert [state["checks"]["migrations"] for state in states_seen] == ["running", "waiting"]
+        assert states_seen[1]["status"] == "not_ready"
+        assert migrations.MIGRATION_STATUS["state"] == "succeeded"
+    finally:
+        migrations.MIGRATION_STATUS.update(state="skipped", error=None)
@@ -395,6 +395,64 @@ class TestMetricsOrders:
         data = response.json()
         for order in data["items"]:
             assert order["utm_source"] == "facebook"
+
+
+    def test_orders_keyset_pagination(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        sample_orders: list[Order],
+    ):
+        """Following the keyset cursor walks the same orders as offset paging."""
+        params = {"from": str(date.today() - timedelta(days=60)), "to": str(date.today() + timedelta(days=1)), "limit": 15}
+        first = client.get("/metrics/orders", headers=auth_headers, params=params).json()
+        assert first["total"] == 50
+
+        seen = [item["id"] for item in first["items"]]
+        cursor = first
+        while cursor["next_after_id"]:
+            cursor = client.get(
+                "/metrics/orders",
+                headers=auth_headers,
+                params={**params, "after_date_time": cursor["next_after_date_time"], "after_id": cursor["next_after_id"]},
+            ).json()
+            assert cursor["total"] is None
+            seen.extend(item["id"] for item in cursor["items"])
+
+        offset_ids = [
+            item["id"]
+            for offset in range(0, 50, 15)
+            for item in client.get(
+                "/metrics/orders", headers=auth_headers, params={**params, "offset": offset}
+            ).json()["items"]
+        ]
+        assert seen == offset_ids
+        assert len(set(seen)) == 50
+
+    def test_orders_keyset_requires_both_params(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+    ):
+        """A half-specified cursor is rejected."""
+        response = client.get("/metrics/orders", headers=auth_headers, params={"after_id": "x"})
+        assert response.status_code == 400
+
+    def test_orders_query_failure_is_an_error_response(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """A failing query comes back as a 500, not a 200 with a truncated body."""
+        def failing_iter_orders(*args, **kwargs):
+            raise RuntimeError("canceling statement due to statement timeout")
+            yield
+
+        monkeypatch.setattr("app.routers.routes_metrics.iter_orders", failing_iter_orders)
+        with TestClient(client.app, raise_server_exceptions=False) as failing_client:
+            response = failing_client.get("/metrics/orders", headers=auth_headers)
+        assert response.status_code == 500
             
     def test_orders_summary(
         self,
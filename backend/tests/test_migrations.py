@@ -0,0 +1,106 @@
+"""Tests for data-rewriting migrations, run against a real Postgres.
+
+Set MIGRATION_TEST_DATABASE_URL to a scratch Postgres database to run them;
+its public schema is dropped and rebuilt by every test.
+"""
+# MUST import env_setup first
+import tests.env_setup  # noqa: F401
+
+import os
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.jobs.migrations import ALEMBIC_INI
+
+MIGRATION_TEST_DATABASE_URL = os.environ.get("MIGRATION_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not MIGRATION_TEST_DATABASE_URL, reason="MIGRATION_TEST_DATABASE_URL is not set"
+)
+
+
+@pytest.fixture
+def migrate(monkeypatch: pytest.MonkeyPatch):
+    """Run alembic commands against an emptied scratch database; yields (alembic, engine)."""
+    monkeypatch.setenv("DATABASE_URL", MIGRATION_TEST_DATABASE_URL)
+    engine = create_engine(MIGRATION_TEST_DATABASE_URL)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.attributes["configure_logger"] = False
+
+    def alembic(name: str, revision: str):
+        getattr(command, name)(config, revision)
+
+    yield alembic, engine
+    engine.dispose()
+
+
+def _add_ad_spend(connection, rows):
+    connection.execute(
+        text(
+            "INSERT INTO accounts (id, name, type, plan, max_users) "
+            "VALUES ('acct', 'Acme', 'business', 'FREE', 1) ON CONFLICT DO NOTHING"
+        )
+    )
+    connection.execute(
+        text(
+            "INSERT INTO ad_spend (id, account_id, platform, external_campaign_id, date, cost) "
+            "VALUES (:id, 'acct', 'facebook', 'c1', '2026-10-01', :cost)"
+        ),
+        rows,
+    )
+
+
+class TestAdSpendCampaignDay:
+    """Tests for 0045_ad_spend_campaign_day."""
+
+    def test_dedupe_keeps_the_last_row_written(self, migrate):
+        """Duplicates written by one statement share an xmin; the row stored last still wins."""
+        alembic, engine = migrate
+        alembic("upgrade", "0044_product_event_props_gin")
+        with engine.begin() as connection:
+            # One transaction, so equal xmin; "zzz" sorts first by id but was written first
+            _add_ad_spend(connection, [{"id": "zzz", "cost": 100}, {"id": "aaa", "cost": 200}])
+
+        alembic("upgrade", "0045_ad_spend_campaign_day")
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT id FROM ad_spend")).scalars().all() == ["aaa"]
+
+    def test_interrupted_partitioned_build_is_finished(self, migrate):
+        """A parent index left invalid with partitions unattached is completed on the next run."""
+        alembic, engine = migrate
+        alembic("upgrade", "0045_ad_spend_campaign_day")
+        with engine.begin() as connection:
+            # What a run stopped after its first partition leaves behind
+            connection.execute(text("DROP INDEX ix_ad_spend_campaign_day"))
+            connection.execute(text(
+                "CREATE UNIQUE INDEX ix_ad_spend_campaign_day "
+                "ON ONLY ad_spend (account_id, platform, external_campaign_id, date)"
+            ))
+            first_partition = connection.execute(text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = 'ad_spend'::regclass ORDER BY 1 LIMIT 1"
+            )).scalar()
+            connection.execute(text(
+                f"CREATE UNIQUE INDEX {first_partition}_campaign_day_key "
+                f"ON {first_partition} (account_id, platform, external_campaign_id, date)"
+            ))
+            connection.execute(text(
+                f"ALTER INDEX ix_ad_spend_campaign_day ATTACH PARTITION {first_partition}_campaign_day_key"
+            ))
+
+        alembic("stamp", "0044_product_event_props_gin")
+        alembic("upgrade", "0045_ad_spend_campaign_day")
+
+        with engine.connect() as connection:
+            assert connection.execute(text(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = 'ix_ad_spend_campaign_day'::regclass"
+            )).scalar() is True
@@ -0,0 +1,51 @@
+"""Tests for onboarding endpoints."""
+# MUST import env_setup first
+import tests.env_setup  # noqa: F401
+
+from fastapi.testclient import TestClient
+
+
+STEPS = ["created_workspace", "connected_integration", "viewed_dashboard"]
+
+
+def test_onboarding_status_defaults(client: TestClient, auth_headers: dict):
+    """New workspaces start with no steps completed."""
+    response = client.get("/onboarding/status", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["onboarding_completed"] is False
+    assert data["steps"] == {step: False for step in STEPS}
+
+
+def test_complete_all_steps_marks_onboarding_completed(client: TestClient, auth_headers: dict):
+    """onboarding_completed follows the step flags."""
+    for step in STEPS[:-1]:
+        response = client.post("/onboarding/complete-step", headers=auth_headers, json={"step": step})
+        assert response.status_code == 200
+        assert response.json()["onboarding_completed"] is False
+
+    response = client.post("/onboarding/complete-step", headers=auth_headers, json={"step": STEPS[-1]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["onboarding_completed"] is True
+    assert data["steps"] == {step: True for step in STEPS}
+
+
+def test_reset_onboarding(client: TestClient, auth_headers: dict):
+    """Reset clears every step and the completion flag."""
+    for step in STEPS:
+        client.post("/onboarding/complete-step", headers=auth_headers, json={"step": step})
+
+    response = client.post("/onboarding/reset", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["onboarding_completed"] is False
+
+    data = client.get("/onboarding/status", headers=auth_headers).json()
+    assert data["onboarding_completed"] is False
+    assert data["steps"] == {step: False for step in STEPS}
+
+
+def test_complete_invalid_step(client: TestClient, auth_headers: dict):
+    """Unknown steps are rejected."""
+    response = client.post("/onboarding/complete-step", headers=auth_headers, json={"step": "unknown"})
+    assert response.status_code == 422
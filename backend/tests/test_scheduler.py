@@ -0,0 +1,68 @@
+"""Tests for the scheduler's maintenance jobs."""
+# MUST import env_setup first
+import tests.env_setup  # noqa: F401
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.integration import Integration
+from app.services import integrations_service
+
+# app.jobs re-exports a `scheduler` attribute that shadows the module
+scheduler_module = importlib.import_module("app.jobs.scheduler")
+
+
+def _expiring_integration(db: Session, account: Account, platform: str, refresh_token: str) -> Integration:
+    integration = Integration(
+        account_id=account.id,
+        platform=platform,
+        status="connected",
+        access_token="old-access",
+        refresh_token=refresh_token,
+        token_expires_at=datetime.utcnow() + timedelta(hours=1),
+        created_at=datetime.utcnow(),
+    )
+    db.add(integration)
+    db.commit()
+    return integration
+
+
+class TestDailyCleanup:
+    """Tests for the daily token refresh."""
+
+    def test_expiring_tokens_are_refreshed(
+        self, db: Session, test_account: Account, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Expiring tokens are refreshed concurrently and saved; a failed refresh leaves its integration alone."""
+        from tests.conftest import TestingSessionLocal
+
+        facebook = _expiring_integration(db, test_account, "facebook", "fb-refresh")
+        google = _expiring_integration(db, test_account, "google_ads", "google-refresh")
+
+        running, peak = 0, 0
+
+        async def fake_refresh(platform: str, refresh_token: str) -> dict:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if platform == "google_ads":
+                raise RuntimeError("invalid_grant")
+            return {"access_token": "new-access", "refresh_token": "new-refresh", "expires_in": 7200}
+
+        monkeypatch.setattr("app.db.SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(integrations_service, "refresh_access_token", fake_refresh)
+
+        asyncio.run(scheduler_module._daily_cleanup())
+
+        assert peak == 2
+        db.expire_all()
+        assert (facebook.access_token, facebook.refresh_token) == ("new-access", "new-refresh")
+        assert facebook.token_expires_at.replace(tzinfo=None) > datetime.utcnow() + timedelta(hours=1)
+        assert (google.access_token, google.refresh_token) == ("old-access", "google-refresh")
@@ -0,0 +1,376 @@
+"""Tests for the platform sync jobs."""
+# MUST import env_setup first
+import tests.env_setup  # noqa: F401
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+from app.jobs import sync_tasks
+from app.models.account import Account
+from app.models.ad_spend import AdSpend
+from app.models.integration import Integration
+from app.models.order import Order
+
+
+@pytest.fixture
+def facebook_integration(db: Session, test_account: Account) -> Integration:
+    """Create a connected Facebook integration."""
+    integration = Integration(
+        account_id=test_account.id,
+        platform="facebook",
+        status="connected",
+        access_token="fb-token",
+        created_at=datetime.utcnow(),
+    )
+    db.add(integration)
+    db.commit()
+    return integration
+
+
+def _graph_client(insights_by_account: dict, report_requests: Optional[list] = None) -> httpx.AsyncClient:
+    """
+    AsyncClient standing in for the Graph API: lists the given ad accounts and
+    serves each one's insights through a report run, one insight per page.
+    Accounts mapped to None fail with a connection error. Report-run requests
+    are appended to report_requests when given.
+    """
+    polls = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if report_requests is not None and request.method == "POST":
+            report_requests.append(request)
+        path = request.url.path.removeprefix("/v18.0/")
+        if path == "me/adaccounts":
+            return httpx.Response(200, json={"data": [{"id": account} for account in insights_by_account]})
+        if request.method == "POST":
+            account = path.removesuffix("/insights")
+            if insights_by_account[account] is None:
+                raise httpx.ConnectError("connection reset", request=request)
+            return httpx.Response(200, json={"report_run_id": f"run-{account}"})
+        account = path.removesuffix("/insights").removeprefix("run-")
+        if not path.endswith("/insights"):
+            # Still running on the first poll
+            polls[account] = polls.get(account, 0) + 1
+            return httpx.Response(200, json={"async_status": "Job Completed" if polls[account] > 1 else "Job Running"})
+        insights = insights_by_account[account]
+        position = int(request.url.params.get("after", 0))
+        page = {"data": insights[position:position + 1]}
+        if position + 1 < len(insights):
+            page["paging"] = {"next": f"{request.url.copy_with(params={'after': position + 1})}"}
+        return httpx.Response(200, json=page)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _insight(campaign_id: str, day: str, spend: str) -> dict:
+    return {
+        "campaign_id": campaign_id,
+        "campaign_name": f"Campaign {campaign_id}",
+        "spend": spend,
+        "impressions": "1000",
+        "clicks": "50",
+        "actions": [{"action_type": "purchase", "value": "3"}],
+        "date_start": day,
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_report_polling_delay(monkeypatch: pytest.MonkeyPatch):
+    """Poll report runs without waiting between polls."""
+    monkeypatch.setattr(sync_tasks, "FACEBOOK_REPORT_POLL_SECONDS", 0)
+
+
+class TestFacebookSync:
+    """Tests for the Facebook insights sync."""
+
+    def test_insights_are_upserted_per_campaign_day(
+        self, db: Session, facebook_integration: Integration, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Every page of the report is stored; re-syncing a day updates its row instead of adding another."""
+        from tests.conftest import TestingSessionLocal
+
+        monkeypatch.setattr(sync_tasks, "SessionLocal", TestingSessionLocal)
+
+        async def run(insights):
+            async with _graph_client({"act_1": insights}) as client:
+                await sync_tasks._sync_facebook_ad_account(
+                    client, facebook_integration.account_id, {"id": "act_1"}, "fb-token"
+                )
+
+        asyncio.run(run([_insight("c1", "2026-10-01", "10.50"), _insight("c2", "2026-10-01", "4.00")]))
+        asyncio.run(run([_insight("c1", "2026-10-01", "12.25"), _insight("c1", "2026-10-02", "1.00")]))
+
+        rows = db.query(AdSpend).order_by(AdSpend.external_campaign_id, AdSpend.date).all()
+        assert [(r.external_campaign_id, r.date, float(r.cost)) for r in rows] == [
+            ("c1", date(2026, 10, 1), 12.25),
+            ("c1", date(2026, 10, 2), 1.0),
+            ("c2", date(2026, 10, 1), 4.0),
+        ]
+        assert rows[0].conversions == 3
+        assert rows[0].external_account_id == "act_1"
+
+    def test_ad_accounts_sync_independently(
+        self, db: Session, facebook_integration: Integration, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Every ad account is synced in its own session; one failing doesn't stop the others."""
+        from tests.conftest import TestingSessionLocal
+
+        monkeypatch.setattr(sync_tasks, "SessionLocal", TestingSessionLocal)
+
+        async def run():
+            async with _graph_client({
+                "act_1": [_insight("act_1-c1", "2026-10-01", "5.00")],
+                "act_2": None,
+                "act_3": [_insight("act_3-c1", "2026-10-01", "5.00")],
+            }) as client:
+                await sync_tasks.sync_facebook_ads(db, facebook_integration, client)
+
+        asyncio.run(run())
+
+        rows = db.query(AdSpend).order_by(AdSpend.external_account_id).all()
+        assert [(r.external_account_id, r.external_campaign_id) for r in rows] == [
+            ("act_1", "act_1-c1"),
+            ("act_3", "act_3-c1"),
+        ]
+        # The failed account isn't marked synced, so it's backfilled next time
+        assert set(facebook_integration.config_json["insights_synced_through"]) == {"act_1", "act_3"}
+
+    def test_no_transaction_is_held_while_reports_run(
+        self, db: Session, facebook_integration: Integration, monkeypatch: pytest.MonkeyPatch
+    ):
+        """The integration's session ends its transaction before report runs are polled."""
+        from tests.conftest import TestingSessionLocal
+
+        monkeypatch.setattr(sync_tasks, "SessionLocal", TestingSessionLocal)
+        fetch_insights = sync_tasks._fetch_facebook_insights
+        in_transaction = []
+
+        async def tracking_fetch(*args):
+            in_transaction.append(db.in_transaction())
+            return await fetch_insights(*args)
+
+        monkeypatch.setattr(sync_tasks, "_fetch_facebook_insights", tracking_fetch)
+
+        async def run():
+            async with _graph_client({"act_1": [_insight("c1", "2026-10-01", "5.00")]}) as client:
+                await sync_tasks.sync_facebook_ads(db, facebook_integration, client)
+
+        asyncio.run(run())
+
+        assert in_transaction == [False]
+        assert db.query(AdSpend).count() == 1
+        assert "act_1" in facebook_integration.config_json["insights_synced_through"]
+
+    def test_later_syncs_only_reread_recent_days(
+        self, db: Session, facebook_integration: Integration, monkeypatch: pytest.MonkeyPatch
+    ):
+        """The first sync backfills 30 days; after that only the last couple of days are requested."""
+        from tests.conftest import TestingSessionLocal
+
+        monkeypatch.setattr(sync_tasks, "SessionLocal", TestingSessionLocal)
+        report_requests = []
+
+        async def run():
+            insights = {"act_1": [_insight("c1", "2026-10-01", "5.00")]}
+            async with _graph_client(insights, report_requests) as client:
+                await sync_tasks.sync_facebook_ads(db, facebook_integration, client)
+                await sync_tasks.sync_facebook_ads(db, facebook_integration, client)
+
+        asyncio.run(run())
+
+        today = datetime.utcnow().date()
+        since = [json.loads(request.url.params["time_range"])["since"] for request in report_requests]
+        assert since == [
+            (today - timedelta(days=30)).isoformat(),
+            (today - timedelta(days=2)).isoformat(),
+        ]
+        assert facebook_integration.config_json["insights_synced_through"] == {"act_1": today.isoformat()}
+
+
+@pytest.fixture
+def shopify_integration(db: Session, test_account: Account) -> Integration:
+    """Create a connected Shopify integration."""
+    integration = Integration(
+        account_id=test_account.id,
+        platform="shopify",
+        status="connected",
+        access_token="shop-token",
+        config_json={"shop_domain": "test-shop.myshopify.com"},
+        created_at=datetime.utcnow(),
+    )
+    db.add(integration)
+    db.commit()
+    return integration
+
+
+def _shopify_order(order_id: int, total: str, updated_at: str = "2026-10-01T12:00:00Z") -> dict:
+    return {
+        "id": order_id,
+        "created_at": "2026-10-01T12:00:00Z",
+        "updated_at": updated_at,
+        "total_price": total,
+        "currency": "USD",
+        "note_attributes": [{"name": "utm_source", "value": "facebook"}],
+    }
+
+
+class TestShopifySync:
+    """Tests for the Shopify orders sync."""
+
+    def test_each_order_is_stored_once(self, db: Session, shopify_integration: Integration):
+        """Orders already stored, or repeated within a page, don't add rows."""
+        pages = [
+            [_shopify_order(1, "10.00"), _shopify_order(2, "20.00")],
+            [_shopify_order(2, "20.00"), _shopify_order(3, "30.00"), _shopify_order(3, "30.00")],
+        ]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"orders": pages.pop(0)}))
+        )
+
+        async def run():
+            async with client:
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+
+        asyncio.run(run())
+
+        orders = db.query(Order).order_by(Order.external_order_id).all()
+        assert [(o.external_order_id, float(o.total_amount)) for o in orders] == [("1", 10.0), ("2", 20.0), ("3", 30.0)]
+        assert all(o.source_platform == "shopify" and o.utm_source == "facebook" for o in orders)
+
+    def test_changed_orders_update_their_row(self, db: Session, shopify_integration: Integration):
+        """An order returned again by a later sync, e.g. after a refund, overwrites the stored total."""
+        refunded = {**_shopify_order(1, "50.00", "2026-10-03T09:00:00Z"), "current_total_price": "35.00"}
+        pages = [[_shopify_order(1, "50.00"), _shopify_order(2, "20.00")], [refunded]]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"orders": pages.pop(0)}))
+        )
+
+        async def run():
+            async with client:
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+
+        asyncio.run(run())
+
+        db.expire_all()
+        orders = db.query(Order).order_by(Order.external_order_id).all()
+        assert [(o.external_order_id, float(o.total_amount)) for o in orders] == [("1", 35.0), ("2", 20.0)]
+
+    def test_pages_are_followed_and_next_sync_resumes(self, db: Session, shopify_integration: Integration):
+        """Link-header pages are all ingested, and the next sync asks only for orders updated since."""
+        requests = []
+        next_page = "https://test-shop.myshopify.com/admin/api/2024-01/orders.json?limit=250&page_info=abc"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url)
+            if len(requests) == 1:
+                return httpx.Response(
+                    200,
+                    json={"orders": [_shopify_order(1, "10.00", "2026-10-02T08:00:00-04:00")]},
+                    headers={"Link": f'<{next_page}>; rel="next"'},
+                )
+            if len(requests) == 2:
+                return httpx.Response(200, json={"orders": [_shopify_order(2, "20.00", "2026-10-02T11:00:00Z")]})
+            return httpx.Response(200, json={"orders": []})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+                await sync_tasks.sync_shopify_orders(db, shopify_integration, client)
+
+        asyncio.run(run())
+
+        assert db.query(Order).count() == 2
+        assert "created_at_min" in requests[0].params
+        assert str(requests[1]) == next_page
+        # 08:00-04:00 is 12:00 UTC, later than 11:00Z
+        assert requests[2].params["updated_at_min"] == "2026-10-02T08:00:00-04:00"
+        assert shopify_integration.config_json == {
+            "shop_domain": "test-shop.myshopify.com",
+            "orders_updated_at_min": "2026-10-02T08:00:00-04:00",
+        }
+
+
+class TestHttpClient:
+    """Tests for the client shared by the platform syncs."""
+
+    def test_client_is_shared_until_closed(self):
+        """Syncs reuse one pooled client; shutdown closes it and the next sync gets a fresh one."""
+        pytest.importorskip("h2")  # http2=True needs httpx[http2]
+
+        async def run():
+            client = sync_tasks.get_http_client()
+            assert sync_tasks.get_http_client() is client
+            await sync_tasks.close_http_client()
+            assert client.is_closed
+            return client
+
+        closed = asyncio.run(run())
+        assert sync_tasks.get_http_client() is not closed
+        asyncio.run(sync_tasks.close_http_client())
+
+
+class TestSyncAllIntegrations:
+    """Tests for the fan-out over all connected integrations."""
+
+    def test_integrations_sync_concurrently(
+        self,
+        db: Session,
+        facebook_integration: Integration,
+        shopify_integration: Integration,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Each integration gets its own session, and a failure doesn't stop the others."""
+        from tests.conftest import TestingSessionLocal
+
+        running, peak, synced = 0, 0, []
+
+        async def fake_sync(session, integration):
+            nonlocal running, peak
+            assert session is not db
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            synced.append(integration.platform)
+            if integration.platform == "facebook":
+                raise RuntimeError("API down")
+
+        monkeypatch.setattr(sync_tasks, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setitem(sync_tasks._SYNC_DISPATCH, "facebook", fake_sync)
+        monkeypatch.setitem(sync_tasks._SYNC_DISPATCH, "shopify", fake_sync)
+
+        asyncio.run(sync_tasks.sync_all_integrations())
+
+        assert sorted(synced) == ["facebook", "shopify"]
+        assert peak == 2
+
+    def test_cached_integration_list_is_used(self, monkeypatch: pytest.MonkeyPatch):
+        """With the list cached (e.g. by another instance), the database isn't scanned."""
+        synced = []
+
+        class FakeCache:
+            def get(self, key):
+                assert key == sync_tasks.ACTIVE_INTEGRATIONS_KEY
+                return [{"id": "int-1", "platform": "shopify", "account_id": "acc-1"}]
+
+        def no_session():
+            raise AssertionError("integrations should come from the cache")
+
+        async def fake_sync_integration(integration_id):
+            synced.append(integration_id)
+
+        monkeypatch.setattr(sync_tasks, "cache", FakeCache())
+        monkeypatch.setattr(sync_tasks, "SessionLocal", no_session)
+        monkeypatch.setattr(sync_tasks, "sync_integration", fake_sync_integration)
+
+        asyncio.run(sync_tasks.sync_all_integrations())
+
+        assert synced == ["int-1"]